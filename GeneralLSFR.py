@@ -11,13 +11,65 @@ Creates Graphical User Interface Which Allows User to:
     -Press a Button to Perform a Fit and Plot a Graph (With Residuals)
 _______________________________________________________________________________
 """
-import tkinter as tk
-from tkinter.filedialog import askopenfilename
-from sympy import symbols, sympify, solve, lambdify
 import numpy as np
-import matplotlib.pyplot as plt
 import re
-from scipy.optimize import curve_fit
+import os
+import sys
+import csv
+import glob
+import io
+import hashlib
+import zipfile
+import warnings
+import argparse
+import queue
+import threading
+import json
+import importlib
+import time
+import tracemalloc
+import contextlib
+import copy
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import (ProcessPoolExecutor, as_completed, wait,
+                                FIRST_COMPLETED)
+
+class LazyModule():
+    """
+    Stands in for a Module Until One of its Attributes is First Used, Then
+        Imports it, so Starting the Program (or Importing it Without the
+        GUI) Does Not Wait for SymPy, SciPy, Matplotlib or Tk
+    """
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def load(self):
+        """
+        Imports the Module if Not Yet Imported, and Returns it
+        """
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return self.module
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+#Heavy Modules, Each Imported When First Used
+tk = LazyModule("tkinter")
+filedialog = LazyModule("tkinter.filedialog")
+plt = LazyModule("matplotlib.pyplot")
+sympy = LazyModule("sympy")
+numpyPrinting = LazyModule("sympy.printing.numpy")
+pycodePrinting = LazyModule("sympy.printing.pycode")
+lambdaPrinting = LazyModule("sympy.printing.lambdarepr")
+optimize = LazyModule("scipy.optimize")
+sparse = LazyModule("scipy.sparse")
+
+#Modules the GUI Only Needs Once Something is Fit or Plotted, Imported on a
+#Background Thread While its Window Opens (See preloadModules)
+guiPreload = [sympy, optimize, plt]
 
 class Gui():
     """
@@ -52,10 +104,41 @@ class Gui():
                                   validatecommand=(negFloatVal, '%P'))
         self.tolEntry.grid()
         self.tolEntry.insert(0,"0.00000001")
+
+        #Option to Estimate Uncertainties by Refitting Resampled Data
+        self.resampleVar = tk.IntVar()
+        tk.Checkbutton(self.tolFrame, text="Estimate Uncertainties by"
+                       +" Resampling (Bootstrap)",
+                       variable=self.resampleVar).grid(sticky="W")
+
+        #Option to Record Where the Fit's Time and Memory Went
+        self.profileVar = tk.IntVar()
+        tk.Checkbutton(self.tolFrame, text="Record Fit Timings and Memory",
+                       variable=self.profileVar).grid(sticky="W")
+
+        #Option to Keep Refitting as Rows are Appended to the Data File,
+        #Every So Many Seconds, to Every Row or Only the Latest Rows
+        self.watchVar = tk.IntVar()
+        tk.Checkbutton(self.tolFrame, text="Watch the Data File and Refit as"
+                       +" Rows are Added", variable=self.watchVar
+                       ).grid(sticky="W")
+        watchFrame = tk.Frame(self.tolFrame)
+        watchFrame.grid(sticky="W")
+        tk.Label(watchFrame, text="Refit Every (s):").grid(row=0, column=0)
+        self.cadenceEntry = tk.Entry(watchFrame, width=8, validate="all",
+                                     validatecommand=(negFloatVal, '%P'))
+        self.cadenceEntry.grid(row=0, column=1)
+        self.cadenceEntry.insert(0,str(watchSeconds))
+        tk.Label(watchFrame, text="Latest Rows Only (Blank for All):"
+                 ).grid(row=0, column=2)
+        self.windowEntry = tk.Entry(watchFrame, width=10, validate="all",
+                                    validatecommand=(negFloatVal, '%P'))
+        self.windowEntry.grid(row=0, column=3)
         
         #Fit-Parameters Frame
         self.fitParamFrame = tk.LabelFrame(tFrame,text="Input Initial Guesses"
-                                 +" for Fit Parameters:",width=650,height=300)
+                                 +" (or Search Ranges, e.g. 0:10) for Fit"
+                                 +" Parameters:",width=650,height=300)
         self.fitParamFrame.grid()
         
         #Constant-Parameters Frame
@@ -85,8 +168,14 @@ class Gui():
         self.yAxEntry.place(x=200,y=200)
         self.yAxEntry.insert(0,"y-Axis Label")
         
-        #Searches Text for Parameters. Updates/Destroys Entry Boxes
-        eqnCheck = self.window.register(self.findParams)
+        #Once the User Pauses Typing, Searches Text for Parameters
+        #(Updates/Destroys Entry Boxes) and Compiles the Equation in the
+        #Background, Into the Model Cache
+        self.equationTimer = None
+        self.analysedText = None
+        self.equationJobs = set()
+        self.equationQueue = queue.Queue()
+        eqnCheck = self.window.register(self.equationChanged)
         
         #Equation Entry Label and Text
         tk.Label(frame, text="Enter Equation:"
@@ -109,6 +198,44 @@ class Gui():
                                  command=self.dataFromFile).place(x=20, y=710)
         self.plotDataButton = tk.Button(frame,text="Plot Data",
                                  command=self.fitData).place(x=600, y=710)
+
+        #Cancel Button, Only Enabled While a Fit is Running
+        self.cancelButton = tk.Button(frame,text="Cancel Fit",
+                                      command=self.cancelFit,
+                                      state=tk.DISABLED)
+        self.cancelButton.place(x=690, y=710)
+
+        #Compare Models Button, Opens a Window to Fit and Rank Candidates
+        self.compareButton = tk.Button(frame,text="Compare Models",
+                                 command=self.openComparison).place(x=460,
+                                                                    y=710)
+
+        #Session Buttons, to Save Everything Entered and the Last Fit, and to
+        #Restore it Later
+        self.saveSessionButton = tk.Button(frame,text="Save Session",
+                                 command=self.saveSessionAs).place(x=120,
+                                                                   y=710)
+        self.openSessionButton = tk.Button(frame,text="Open Session",
+                                 command=self.openSession).place(x=240,
+                                                                 y=710)
+
+        #The Last Fit's Inputs and Result, Kept for the Session, and a Saved
+        #Fit Waiting to Stand in for the Fit if its Inputs are Unchanged
+        self.lastFit = None
+        self.restoredFit = None
+        self.dataSource = None      #Data File, Delimiter, Dataset, Reference
+
+        #Fits Run on a Background Thread, Reporting Back Through a Queue
+        self.fitThread = None
+        self.fitMonitor = None
+        self.fitQueue = queue.Queue()
+
+        #While Watching the Data File, the LiveFit is Refit on a Timer, Each
+        #Refit Reporting Back Through its Own Queue
+        self.liveFit = None
+        self.liveMonitor = None
+        self.liveQueue = queue.Queue()
+        self.watchTimer = None
         
         #Create Label to Show the User any StatusProblems
         self.errorText = tk.Label(frame, text="Status:")
@@ -168,6 +295,10 @@ Followed By a positive Integer. e.g. "f1","f45"...etc.After
 Typing These Into Your Equation, Make Sure Their Initial Values
 are Inputted on the Right Hand Side of The Screen
 
+If Good Initial Values are Not Known, a Range Such as "0:10"
+Can be Entered Instead. Many Values Within the Ranges are Then
+Tried and the Fit is Started From the Best Few.
+
 Constants Can Also Be Defined Using 'k' Followed by a Positive
 Integer. E.g. "k1", "k2"...etc. After Typing These Into Your
 Equation, Make Sure They are Defined on the Right Hand Side Of
@@ -177,18 +308,32 @@ Make Sure That Both x and y Appear in Your Equation
 e.g. The Default Linear Equation:
 	"0 = f1*x + f2 - y"
 
+Solved and Compiled Equations are Cached (in ~/.cache/GeneralLSFR,
+or the Directory Set by GENERALLSFR_CACHE), so Equations Used
+Before, Even in an Earlier Session, are Ready Almost Instantly.
+If numexpr or Numba are Installed, Fits of Long Equations to
+Many Points Use Them Automatically to Evaluate the Equation.
+
 ######################################################
 SELECTING DATA:
 ######################################################
 Data Can be Selected Using The "Read Data" Button.
 
-Data Should be a .csv File or .txt File (Separated by Tabs)
+Data Should be a .csv File or .txt File (Separated by Tabs),
+or a NumPy .npy/.npz File Holding a 2D Array. Lines Starting
+With % are Treated as Comments. Text Files are Cached in a
+Binary Form, so Loading the Same File Again is Much Faster.
+Only the Latest Copy of Each File is Kept, and the Least
+Recently Used Copies are Deleted Once the Cache Passes 1 GB.
 
 The File Should Have Three Columns of Data:
 1. The Left Column Should Contain the x-Data
 2. The Central Column Should Contain the y-Data
 3. The Right Column Should Contain the y-Errors
 
+Rows With a Missing or Non-Numeric Value, or a y-Error of
+Zero, are Ignored, and the Status Line Says How Many Were.
+
 The Data Should Have Enough Points Depending On The Number Of
 Fitting Parameters
 
@@ -203,6 +348,134 @@ Before Pressing the "Plot Data" Button, Make Sure:
 
 When Pressing the Button, If No Problems Occur, a Graph Will Be
 Plotted and the Fitting Parameter Values Will Be Shown
+
+The Fitting Parameters Window Also Shows the Rank and Condition
+Number of the Fit's Jacobian: a Rank Below the Number of Fitting
+Parameters, or a Very Large Condition Number, Means the Data
+Cannot Tell Some Parameters Apart. The Residuals are Plotted
+From the Model Values the Fit Ended With, so the Model is Not
+Evaluated Over the Data Again.
+
+Data With More Than 5000 Points is Plotted as the Range of the
+Points (Black Lines) and of Their Error Bars (Grey Band) in
+Each Pixel Column, so Even Millions of Points Plot Quickly.
+
+While the Fit Runs, the Status Line Shows its Iteration and
+Chi-Squared, and the "Cancel Fit" Button Stops it.
+
+Ticking "Estimate Uncertainties by Resampling" Refits Thousands
+of Bootstrap Resamples of the Data After the Fit, in Parallel on
+Every Core, and Shows the 68% Interval of Each Fitting Parameter
+and Their Correlations.
+
+Ticking "Record Fit Timings and Memory" Shows, With the Fitting
+Parameters, How Long Each Stage Took (Looking up, Solving and
+Compiling the Equation, Fitting, Resampling and Plotting) and
+the Peak Memory Used. If the GENERALLSFR_PROFILE Environment
+Variable Names a File, Each Profile is Also Added to it as a
+Line of JSON.
+
+Ticking "Watch the Data File and Refit as Rows are Added" Before
+Pressing "Plot Data" Keeps Fitting a .csv or .txt File That is
+Still Being Written: Every Few Seconds (Set by "Refit Every")
+Only the Rows Added Since are Read, and the Fit is Redone
+Starting From the Last Best Fit Parameters. The Graph and the
+Fitting Parameters Window are Updated Where They Are. Entering a
+Number of Rows in "Latest Rows Only" Fits Only That Many of the
+Most Recent Rows. Pressing "Cancel Fit", Unticking the Box or
+Reading Other Data Stops Watching the File.
+
+######################################################
+SESSIONS:
+######################################################
+The Equation, the Fitting Parameters' Initial Values, the
+Constants, the Fit Tolerence, the Graph's Labels, the Data File
+and the Last Fit are Saved When the Program is Closed (and After
+Every Fit), and Restored the Next Time it Starts. The "Save
+Session" Button Saves Them to a File of Your Choice, and "Open
+Session" Restores Such a File. A Session Can Also be Opened on
+Starting the Program From the Command Line, e.g.:
+	python GeneralLSFR.py --session mySession.json
+
+Restoring a Session Reads the Data From its Binary Cached Copy
+and the Equation From the Equation Cache, and Shows the Saved
+Fit Straight Away. The Data is Only Read From the File Again if
+the File Has Changed, and the Fit is Only Redone if the Data's
+Contents, the Equation, the Initial Values or the Tolerence
+Differ From Those it Was Saved With. If the Data File Has Been
+Deleted, the Cached Copy is Used.
+
+######################################################
+BATCH FITTING:
+######################################################
+Many Data Files Can be Fit Without the Graphical Interface
+by Running the Program From the Command Line, e.g.:
+	python GeneralLSFR.py --batch "data/*.csv"
+		--equation "f1*exp(-x/f2)+k1-y"
+		--guess f1=1.0 --guess f2=2.0 --const k1=0.5
+		--output results.csv
+
+Every File Matching the Pattern is Fit in Parallel and One
+Results Table is Written, Containing Each File's Fitting
+Parameters, Their Uncertainties, the Reduced Chi-Squared and
+the Rank and Condition Number of the Fit's Jacobian.
+A File Which Cannot be Fit is Marked as an Error in the Table
+and Does Not Stop the Others.
+
+Files Too Large to Fit in Memory Can be Fit in Chunks of Rows
+by Adding e.g. "--chunk-size 1000000". Data Files With More
+Than 5000000 Rows are Always Fit This Way.
+
+A Guess Such as "--guess f1=0:10" Searches That Range, as in
+the Graphical Interface.
+
+Adding "--resample bootstrap" (or "--resample montecarlo", Which
+Adds Noise of Size y_err to y) Adds Each Parameter's Resampled
+68% Interval to the Table. When Only One File Matches, its
+Resamples are Refit in Parallel Instead.
+
+Adding "--backend numpy", "--backend numexpr" or "--backend numba"
+Chooses How the Equation is Evaluated, Instead of Automatically.
+
+Adding "--profile profiles.jsonl" Adds a Line of JSON per File
+to profiles.jsonl, With the Time Each Stage Took, the Number of
+Model Evaluations and Iterations, Why the Fit Stopped and the
+Peak Memory Used.
+
+Adding "--float32" Keeps Each File's Data in Single Precision,
+Halving its Memory. The Table's "masked" Column Counts the Rows
+Ignored in Each File.
+
+Running "python GeneralLSFR.py --help" Lists These Options and
+Every Way of Running the Program: the Graphical Interface, a
+Saved Session (See SESSIONS), Batch Fitting and Comparing Models.
+
+######################################################
+COMPARING MODELS:
+######################################################
+The "Compare Models" Button Opens a Window Where Candidate
+Equations Can be Listed, One per Line. Pressing "Fit and Rank"
+Fits Every Candidate to the Loaded Data in Parallel, Using the
+Constants and Initial Guesses From the Main Window (0.0 for any
+Other Fitting Parameter), and Shows a Table Ranked by AIC With
+Each Candidate's Reduced Chi-Squared, AIC, BIC, Fitting
+Parameters and Fit Time. Lower AIC and BIC are Better: Each
+Adds a Penalty for Every Fitting Parameter to the Chi-Squared.
+
+Candidates Which Differ Only in the Names of Their Fitting
+Parameters (e.g. f1*x+f2-y and f3*x+f4-y) are Solved and
+Compiled Once.
+
+Models Can Also be Compared From the Command Line, e.g.:
+	python GeneralLSFR.py --data data.csv
+		--compare "f1*x+f2-y" --compare "f1*exp(-x/f2)+f3-y"
+		--guess f2=2.0 --output comparison.csv
+
+Adding "--rank bic" or "--rank redChiSqrd" Ranks by That
+Instead of AIC.
+
+Running "python GeneralLSFR.py --help --compare" Lists Every
+Option for Comparing Models.
 """
             #Creates Data Text
             infoGui.infoText = tk.Text(infoGui.window)
@@ -215,8 +488,8 @@ Plotted and the Fitting Parameter Values Will Be Shown
         """
         Creates New Window Displaying The Reduced Chi-Squared, and the Values
             of Any Fitting Parameters Used
-        Results is an Array containing the Reduced Chi-Squared,
-            The Fitting Parameters and their Uncertainties
+        Results is a FitResult containing the Reduced Chi-Squared,
+            The Fitting Parameters and their Covariance Matrix
         """
         try:
             self.fitParamsWindow         #check if window already open
@@ -236,20 +509,178 @@ Plotted and the Fitting Parameter Values Will Be Shown
         fitParamsGui.fitParamText = tk.Text(fitParamsGui.window)
         fitParamsGui.fitParamText.grid(row=0, column=0)
         
-        #Creates String to Show Fit Results To The User            
-        guiString = "Reduced Chi-Squared: "+str(results[1])+"\n"
-        
-        #For Each Parameter Add Data to String
-        for i in range(len(self.fitParams)):
-            key = list(self.fitParams.keys())[i]
-            strUncert = str(np.sqrt(results[2][i][i]))
-            guiString = guiString+key+": "+str(results[0][i])+"±"+strUncert+"\n"
+        #Creates String to Show Fit Results To The User
+        guiString = self.fitParamsString(results)
         
         fitParamsGui.fitParamText.insert(tk.INSERT,guiString)   #Show guiString
         fitParamsGui.fitParamText.configure(state=tk.DISABLED)#No Text Editting
+        self.fitParamText = fitParamsGui.fitParamText   #Kept for Updates
         fitParamsGui.window.mainloop()       #runs GUI's main loop
 
+    def fitParamsString(self, results):
+        """
+        Returns the Text Shown in the Fitting Parameters Window for a
+            FitResult
+        """
+        guiString = "Reduced Chi-Squared: "+str(results.redChiSqrd)+"\n"
+        
+        #For Each Parameter Add Data to String
+        for i in range(len(self.fitParams)):
+            key = list(self.fitParams.keys())[i]
+            strUncert = str(np.sqrt(results.cov[i][i]))
+            guiString = guiString+key+": "+str(results.params[i])+"±"+strUncert+"\n"
+
+        #Show How Much Work the Optimiser Did, and Why it Stopped
+        guiString = (guiString+"\nModel Evaluations (nfev): "+str(results.nfev)
+                     +"\nJacobian Evaluations (njev): "+str(results.njev)
+                     +"\nIterations: "+str(results.iterations)
+                     +"\nStopped: "+results.message+"\n")
+
+        #Show How Well the Data Constrain the Parameters
+        if results.rank is not None:
+            guiString = (guiString+"Jacobian Rank: "+str(results.rank)+" of "
+                         +str(len(results.params))+", Condition Number: "
+                         +("%.3g" % results.condition)+"\n")
+
+        #Show Where the Fit's Time Went if it Was Profiled
+        if results.profile is not None:
+            guiString = guiString+"\n"+results.profile.describe()
+
+        #Show Resampled Intervals and Correlations if Estimated
+        if results.resampling is not None:
+            resampling = results.resampling
+            guiString = (guiString+"\n"+str(round(100*resampling.level,2))
+                         +"% Intervals From "+str(len(resampling.params))+" "
+                         +resampling.method+" Resamples:\n")
+            for i, key in enumerate(self.fitParams.keys()):
+                low, high = resampling.intervals[i]
+                guiString = guiString+key+": "+str(low)+" to "+str(high)+"\n"
+            guiString = guiString+"\nCorrelation Matrix:\n"
+            for row in resampling.correlation:
+                guiString = guiString+" ".join("%6.3f" % c for c in row)+"\n"
+        return guiString
+
+    def updateFitParams(self, results):
+        """
+        Replaces the Text in the Open Fitting Parameters Window With a New
+            FitResult's, Opening the Window if it is Not Open
+        """
+        try:
+            self.fitParamText.configure(state=tk.NORMAL)
+            self.fitParamText.delete("1.0", tk.END)
+            self.fitParamText.insert(tk.INSERT,self.fitParamsString(results))
+            self.fitParamText.configure(state=tk.DISABLED)
+        except:
+            self.showFitParams(results)
+
         
+    def equationChanged(self,string):
+        """
+        Called by the Equation Entry on Every Keystroke and Focus Change
+        Restarts a Short Timer, so the Equation is Only Analysed Once the
+            User Pauses Typing
+        string is a String Passed in by Equation Entry to Be Validated
+        """
+        if self.equationTimer is not None:
+            self.window.after_cancel(self.equationTimer)
+        self.equationTimer = self.window.after(equationDelay,
+                                               self.analyseEquation)
+
+        return True     #Allow Text To be Editted
+
+    def analyseEquation(self):
+        """
+        Updates the Parameter Entry Boxes for the Equation Entry's Text and
+            Starts Compiling the Equation on a Background Thread, so Pressing
+            "Plot Data" Finds the Compiled Model Ready
+        """
+        self.equationTimer = None
+        string = self.eqEntry.get()
+        if string == self.analysedText:
+            return      #Nothing Changed, e.g. Only a Focus Change
+        self.analysedText = string
+
+        self.findParams(string)
+
+        #Compile the Model for the Current Parameters and Constants (Only
+        #Their Names are Needed, so SymPy is Not Imported Here)
+        fkeys = list(self.fitParams.keys())
+        constants = self.currentConstants()
+        key = modelKey(string,fkeys,constants)
+        if fkeys == [] or key in self.equationJobs:
+            return
+
+        self.equationJobs.add(key)
+        threading.Thread(target=self.compileSpeculatively,
+                         args=(key,string,fkeys,constants),
+                         daemon=True).start()
+        self.window.after(100, self.pollEquation)
+
+    def compileSpeculatively(self, key, string, fkeys, constants):
+        """
+        Runs on a Background Thread: Solves and Compiles the Equation Into
+            the Model Cache, Then Tells pollEquation Whether it Was Valid
+        Never Touches the Widgets Itself
+        """
+        try:
+            compileEquation(string,fkeys,constants)
+            self.equationQueue.put((key,string,True))
+        except:
+            self.equationQueue.put((key,string,False))
+
+    def pollEquation(self):
+        """
+        Called by the Main Loop While Equations are Being Compiled
+        Flags an Invalid Equation in the Status Line as Soon as it is Found
+        """
+        while True:
+            try:
+                key, string, valid = self.equationQueue.get_nowait()
+            except queue.Empty:
+                break
+            self.equationJobs.discard(key)
+
+            #Only Report on the Equation Currently Entered
+            if string == self.eqEntry.get():
+                if valid:
+                    self.errorText.config(text="Status: Equation Ready ("
+                                          +modelCache.report()+")")
+                else:
+                    self.errorText.config(text="Status: Equation Invalid."+
+                                          " Check equation contains only x,y,"
+                                          +"Known Functions,Fitting Parameters"
+                                          +" and Defined Constants")
+
+        if self.equationJobs:
+            self.window.after(100, self.pollEquation)
+
+    def currentConstants(self):
+        """
+        Returns a Dict of Each Constant's Name and the Value in its Entry Box,
+            or its Last Known Value if the Entry Cannot be Read
+        """
+        constants = {}
+        for kkey in self.constParams.keys():
+            try:
+                constants[kkey] = float(self.constParams[kkey][1].get())
+            except:
+                constants[kkey] = float(self.constParams[kkey][0])
+        return constants
+
+    def currentGuesses(self):
+        """
+        Returns a Dict of Each Fit Parameter's Name and the Initial Guess (or
+            Search Range) in its Entry Box, or its Last Known Guess if the
+            Entry Cannot be Read
+        """
+        guesses = {}
+        for fkey in self.fitParams.keys():
+            try:
+                guesses[fkey] = parseGuess(self.fitParams[fkey][1].get())
+            except:
+                guesses[fkey] = self.fitParams[fkey][0]
+        return guesses
+
     def findParams(self,string):
         """
         Searches Equation for Fitting Parameters(f#) & Constant Parameters (k#)
@@ -295,20 +726,24 @@ Plotted and the Fitting Parameter Values Will Be Shown
             self.constParams=dict.fromkeys(kArray)
         
         #Make Entry Boxes From Dictionaries
-        self.makeParamEntries(self.fitParams,self.fitParamFrame)
+        self.makeParamEntries(self.fitParams,self.fitParamFrame,True)
         self.makeParamEntries(self.constParams,self.constParamFrame)
         
         return True     #Allow Text To be Editted
     
-    def makeParamEntries(self,params,frame):
+    def makeParamEntries(self,params,frame,allowRange=False):
         """
         Create Entry Boxes in a Given Frame for Each Member of the Params Dict
             With a Key But No Item Inside
         Params is a Dict
         Frame is a TKinter Frame
+        allowRange Also Allows Search Ranges (e.g. "0:10") to be Entered
         """
-        #only allow negative floats to be entered
-        negFloatVal = self.window.register(self.checkNegFloat)
+        #only allow negative floats (or Ranges of Them) to be entered
+        if allowRange:
+            negFloatVal = self.window.register(self.checkGuess)
+        else:
+            negFloatVal = self.window.register(self.checkNegFloat)
         
         #Search for Empty Members of params
         for key in params.keys():
@@ -339,58 +774,73 @@ Plotted and the Fitting Parameter Values Will Be Shown
             return True
         except:     #Raised If String Cannot Be Converted to a Float
             return False    #Do Not Allow Non-Floats   
+
+    def checkGuess(self, string):
+        """
+        Returns True if String Can Be Cast as a Float, or is a Search Range
+            of Two Floats Separated by a Colon (e.g. "0:10")
+        string is a String Passed in by an Entry Widget to Be Validated
+        """
+        parts = string.split(":")
+        return len(parts) <= 2 and all(self.checkNegFloat(p) for p in parts)
         
     def fitData(self):
         """
         Function Called When "Plot Data" Button is Pressed
         Retrieves Equation, Parameter Symbols and Initial Values, the Tolerence
-            And Performs a Fit Using these Values
-        Scales the Reduced Chi-Squared and the Covariance Matrix
-        Plots the Data With the Best Fit Line
-        Shows User The Best Fit Parameters and Reduced Chi-Squared
+            And Starts a Fit Using these Values on a Background Thread, so the
+            Window Stays Responsive While it Runs
+        pollFit Then Plots the Data With the Best Fit Line and Shows User The
+            Best Fit Parameters and Reduced Chi-Squared
         """
+        #Only Allow One Fit at a Time
+        if self.fitThread is not None and self.fitThread.is_alive():
+            self.errorText.config(text="Status: A Fit is Already Running."
+                                  +" Wait For it or Cancel it")
+            return
+
+        #Analyse the Equation Now if the User Has Not Paused Typing Yet
+        if self.equationTimer is not None:
+            self.window.after_cancel(self.equationTimer)
+            self.analyseEquation()
+
         #Check That There are Fit Params
         if self.fitParams == {}:
             self.errorText.config(text="Status: No Fitting Parameters")
         else:
-            #Attempt to Retreive Equation from Equation Entry
-            try:
-                equation = getEquation(self.eqEntry.get())[0]   #Get Equation
-            except:
-                self.errorText.config(text="Status: Equation Invalid."+
-                                      " Check equation contains only x,y,Known"
-                                      +" Functions,Fitting Parameters and"
-                                      +"Defined Constants")
-                return  #Do Not Attempt Fit
+            #Retreive Equation from Equation Entry
+            string = self.eqEntry.get()
             
-            #Get Keys and Symbols From Param Dictionaries
-            fkeys,fSymbols = self.symbolsFromParams(self.fitParams)
-            kkeys,kSymbols = self.symbolsFromParams(self.constParams)
+            #Get Keys From Param Dictionaries (the Model Cache Makes the
+            #Symbols, so SymPy is Only Imported if the Equation is Solved)
+            fkeys = list(self.fitParams.keys())
+            kkeys = list(self.constParams.keys())
             
             #For Each Fit Parameter, Update Dictionary If Entry not Empty 
             for fkey in fkeys:
                 if self.fitParams[fkey][1].get() != "":
-                    self.fitParams[fkey][0]=float(self.fitParams[fkey][1].get())
+                    self.fitParams[fkey][0]=parseGuess(self.fitParams[fkey][1].get())
                 else:
                     #Otherwise Update Entry With Last Known Value
                     self.fitParams[fkey][1].insert(tk.END,
-                                                   str(self.fitParams[fkey][0]))
+                                                   formatGuess(self.fitParams[fkey][0]))
             
             #For Each Const Parameter, Update Dictionary If Entry not Empty,
-            #Substitute That Value Into the Equation
-            for kkey,kSymbol in zip(kkeys,kSymbols):
+            #Keeping its Value to be Substituted Into the Equation
+            constants = {}
+            for kkey in kkeys:
                 if self.constParams[kkey][1].get() != "":
                     self.constParams[kkey][0]=float(self.constParams[kkey][1].get())
                 else:
                     #Otherwise Update Entry With Last Known Value
                     self.constParams[kkey][1].insert(tk.END,
                                                      str(self.constParams[kkey][0]))
-                
-                #Sub Constant Into Equation
-                equation = equation.subs(kSymbol,self.constParams[kkey][0])
+                constants[kkey] = self.constParams[kkey][0]
             
-            #Get Initial Guesses For Fitting Parameters
-            initialGuesses = [self.fitParams[i][0] for i in fkeys]
+            #Get Initial Guesses For Fitting Parameters, and the Bounds to
+            #Search Within if Any are Ranges
+            initialGuesses, bounds = searchBounds([self.fitParams[i][0]
+                                                   for i in fkeys])
             
             #Check Data File Exists
             try:
@@ -400,290 +850,4587 @@ Plotted and the Fitting Parameter Values Will Be Shown
                 self.errorText.config(text="Status: No Data Loaded")
                 
                 return  #Do Not Attempt Fit
+
+            #Get Tolerence
+            if self.tolEntry.get() != "":
+                ftol=abs(float(self.tolEntry.get()))
+            else:
+                ftol=0.00000001
+                self.tolEntry.insert(tk.END,str(ftol))
+
+            #Watch the Data File if Asked, Fitting it as it Grows
+            if self.watchVar.get() == 1:
+                self.startWatch(string,constants,fkeys,initialGuesses,bounds,
+                                ftol)
+                return
+
+            #Start the Fit on a Background Thread and Poll it for Progress
+            self.fitMonitor = FitMonitor()
+            self.fitThread = threading.Thread(target=self.runFit,
+                                              args=(string,constants,
+                                                    fkeys,initialGuesses,
+                                                    bounds,
+                                                    self.resampleVar.get()==1,
+                                                    self.profileVar.get()==1,
+                                                    self.dataFile,ftol,
+                                                    self.fitMonitor),
+                                              daemon=True)
+            self.fitThread.start()
+            self.cancelButton.config(state=tk.NORMAL)
+            self.errorText.config(text="Status: Fitting...")
+            self.window.after(100, self.pollFit)
+
+    def runFit(self, string, constants, fkeys, initialGuesses, bounds,
+               resample, profiled, data, ftol, monitor):
+        """
+        Runs on the Background Fit Thread: Fits the Model (See fitOutcome),
+            Profiling it if profiled is True
+        Puts the Outcome on the Fit Queue for pollFit, and Never Touches the
+            Widgets Itself
+        """
+        if not profiled:
+            self.fitQueue.put(self.fitOutcome(string,constants,fkeys,
+                                              initialGuesses,bounds,resample,
+                                              data,ftol,monitor))
+            return
+
+        profile = FitProfile()
+        with profile.activate():
+            outcome = self.fitOutcome(string,constants,fkeys,initialGuesses,
+                                      bounds,resample,data,ftol,monitor)
+        if outcome[0] == "done":
+            result = outcome[1][1]
+            profile.record(result)
+            result.profile = profile
+        self.fitQueue.put(outcome)
+
+    def fitOutcome(self, string, constants, fkeys, initialGuesses, bounds,
+                   resample, data, ftol, monitor):
+        """
+        Takes the Compiled Model From the Model Cache (or Solves the
+            Equation, Substitutes in the Constants and Compiles it) and
+            Performs the Fit, Searching Within bounds First if Given, Then
+            Resamples the Data if resample is True
+        A Fit Restored From a Session is Used Instead of Fitting if its
+            Inputs' Hash Matches
+        Returns the Outcome for pollFit
+        """
+        #Attempt to Retreive the Model, Reused by the Fit, Chi-Squared & Plot
+        try:
+            model = compileEquation(string,fkeys,constants)
+        except:
+            return ("equation",None)    #Do Not Attempt Fit
+
+        #Hash the Fit's Inputs, to Save With it in the Session
+        key = modelKey(string,fkeys,constants)
+        fitInputs = {"modelKey":key,
+                     "inputs":sessionHash(key,data,initialGuesses,bounds,ftol)}
+        restored = self.restoredFit
+
+        #Define Nested Function
+        def fit():
+            if restored is not None and restored[0] == fitInputs["inputs"]:
+                return restored[1]
+            if bounds is None:
+                return performFit(model,data,initialGuesses,ftol,
+                                  monitor=monitor)
+            return multiStartFit(model,data,bounds,initialGuesses,ftol,
+                                 monitor=monitor)
+
+        try:
+            #Perform the Fit, Unless This Data and Model Were Already Fit
+            #From the Same Guesses
+            searched = None if bounds is None else tuple(map(tuple,bounds))
+            with profileStage("fit"):
+                result = data.memoize(model,("fit",tuple(initialGuesses),
+                                             searched,ftol),fit)
+
+            #Copy the Memoised Result, so This Run's Resampling and Profile
+            #are Not Attached to the Result Every Later Run Shares
+            result = copy.copy(result)
+            result.resampling = None
+            result.profile = None
+            if resample:
+                with profileStage("resample"):
+                    result.resampling = data.memoize(
+                        model,("resample",tuple(result.params),ftol),
+                        lambda: resampleFit(model,data,result,
+                                            processes=resampleProcesses,
+                                            ftol=ftol,monitor=monitor))
+        except FitCancelled:
+            return ("cancelled",None)
+        except:
+            return ("fit",None)
+        return ("done",(model,result,fitInputs))
+
+    def pollFit(self):
+        """
+        Called by the Main Loop Every 100ms While a Fit is Running
+        Shows the Fit's Progress, and Once it Has Finished Shows the Outcome
+        """
+        try:
+            outcome, value = self.fitQueue.get_nowait()
+        except queue.Empty:
+            #Still Running, Show Progress and Check Again Later
+            self.errorText.config(text="Status: Fitting... "
+                                  +self.fitMonitor.describe())
+            self.window.after(100, self.pollFit)
+            return
+
+        self.cancelButton.config(state=tk.DISABLED)
+
+        if outcome == "equation":
+            self.errorText.config(text="Status: Equation Invalid."+
+                                  " Check equation contains only x,y,Known"
+                                  +" Functions,Fitting Parameters and"
+                                  +"Defined Constants")
+        elif outcome == "cancelled":
+            self.errorText.config(text="Status: Fit Cancelled")
+        elif outcome == "fit":
+            #Tell User that Fit Failed
+            self.errorText.config(text="Status: Could Not Perform Fit."+
+                                  " Check Fit Parameters and Make sure "+
+                                  "Equation Contains Only Valid Symbols")
+        else:
+            model, result, fitInputs = value
+
+            #Keep the Fit in the Session, Saved Now in Case the Program Does
+            #Not Close Cleanly
+            self.lastFit = (fitInputs, result)
+            self.writeSession(lastSessionName())
+
+            #Tell User that Fit Occured
+            self.errorText.config(text="Status: Fit Done (Model Evaluations:"
+                                  +" "+str(result.nfev)+", Jacobian"
+                                  +" Evaluations: "+str(result.njev)+")")
+            self.plotFit(model, result)
+
+    def openComparison(self):
+        """
+        Function Called When "Compare Models" Button is Pressed
+        Opens a Window Where the User Lists Candidate Equations, One per
+            Line (Starting With the Current Equation), to be Fit to the
+            Loaded Data and Ranked
+        """
+        try:
+            self.compareWindow.deiconify()      #If Hidden, Reopen it
+            self.compareWindow.attributes("-topmost", True)  #bring to front
+        except:
+            #Create New Window to Place Widgets Onto
+            self.compareWindow = tk.Toplevel(self.window)
+            self.compareWindow.title("Compare Models")
+            self.compareWindow.minsize(width=1000, height=750)
+
+            #Candidate Equations Text, One per Line
+            tk.Label(self.compareWindow, text="Candidate Equations, One per"
+                     +" Line (0 = Equation). Guesses and Constants are Taken"
+                     +" From the Main Window:").grid(row=0, column=0,
+                                                     sticky="W")
+            self.candidateText = tk.Text(self.compareWindow, width=120,
+                                         height=10)
+            self.candidateText.grid(row=1, column=0)
+            self.candidateText.insert(tk.INSERT, self.eqEntry.get())
+
+            tk.Button(self.compareWindow, text="Fit and Rank",
+                      command=self.compareData).grid(row=2, column=0,
+                                                     sticky="W")
+
+            #Text Widget to Show the Ranked Table
+            self.comparisonText = tk.Text(self.compareWindow, width=120,
+                                          height=30)
+            self.comparisonText.grid(row=3, column=0)
+            self.comparisonText.configure(state=tk.DISABLED)
+
+    def compareData(self):
+        """
+        Function Called When "Fit and Rank" Button is Pressed
+        Fits Every Candidate Equation to the Loaded Data on a Background
+            Thread (See compareModels), Then pollComparison Shows Them
+            Ranked by AIC
+        """
+        #Only Allow One Fit at a Time
+        if self.fitThread is not None and self.fitThread.is_alive():
+            self.errorText.config(text="Status: A Fit is Already Running."
+                                  +" Wait For it or Cancel it")
+            return
+
+        strings = [line.strip() for line in
+                   self.candidateText.get("1.0", tk.END).split("\n")
+                   if line.strip() != ""]
+        if strings == []:
+            self.errorText.config(text="Status: No Candidate Equations")
+            return
+
+        #Check Data File Exists
+        try:
+            self.dataFile
+        except:
+            #Tell User That No Data Was Loaded
+            self.errorText.config(text="Status: No Data Loaded")
+
+            return  #Do Not Attempt Fit
+
+        #Get Tolerence
+        if self.tolEntry.get() != "":
+            ftol=abs(float(self.tolEntry.get()))
+        else:
+            ftol=0.00000001
+            self.tolEntry.insert(tk.END,str(ftol))
+
+        #Start the Fits on a Background Thread and Poll Them for Progress
+        self.fitMonitor = FitMonitor()
+        self.comparisonProgress = (0, len(strings))
+        self.fitThread = threading.Thread(target=self.runComparison,
+                                          args=(strings,
+                                                self.currentConstants(),
+                                                self.currentGuesses(),
+                                                self.dataFile,ftol,
+                                                self.fitMonitor),
+                                          daemon=True)
+        self.fitThread.start()
+        self.cancelButton.config(state=tk.NORMAL)
+        self.errorText.config(text="Status: Comparing Models...")
+        self.window.after(100, self.pollComparison)
+
+    def runComparison(self, strings, constants, guesses, data, ftol,
+                      monitor):
+        """
+        Runs on the Background Fit Thread: Fits and Ranks the Candidates
+        Puts the Outcome on the Fit Queue for pollComparison, and Never
+            Touches the Widgets Itself
+        """
+        #Define Nested Function
+        def progress(row, done, total):
+            self.comparisonProgress = (done, total)
+
+        try:
+            rows = compareModels(strings,data,constants,guesses,ftol=ftol,
+                                 progress=progress,monitor=monitor)
+        except FitCancelled:
+            self.fitQueue.put(("cancelled",None))
+            return
+        except:
+            self.fitQueue.put(("fit",None))
+            return
+        self.fitQueue.put(("compared",rows))
+
+    def pollComparison(self):
+        """
+        Called by the Main Loop Every 100ms While a Comparison is Running
+        Shows How Many Candidates Have Been Fit, and Once They All Have
+            Shows the Ranked Table
+        """
+        try:
+            outcome, rows = self.fitQueue.get_nowait()
+        except queue.Empty:
+            #Still Running, Show Progress and Check Again Later
+            done, total = self.comparisonProgress
+            self.errorText.config(text="Status: Comparing Models... Fit "
+                                  +str(done)+" of "+str(total))
+            self.window.after(100, self.pollComparison)
+            return
+
+        self.cancelButton.config(state=tk.DISABLED)
+
+        if outcome == "cancelled":
+            self.errorText.config(text="Status: Comparison Cancelled")
+        elif outcome == "fit":
+            self.errorText.config(text="Status: Could Not Compare Models")
+        else:
+            fitted = [row for row in rows if row["status"] == "ok"]
             try:
-                #Get Tolerence
-                if self.tolEntry.get() != "":
-                    ftol=abs(float(self.tolEntry.get()))
-                else:
-                    ftol=0.00000001
-                    self.fitParams[fkey][1].insert(tk.END,str(self.fitParams[fkey][0]))
-                    
-                #Perform the Fit
-                fitResults, cov = curve_fit(returnFunction1(fSymbols,equation),
-                                            self.dataFile[:,0],self.dataFile[:,1]
-                                            ,p0=initialGuesses,absolute_sigma=True
-                                            ,ftol=ftol,sigma =self.dataFile[:,2])
-                
-                #Define a Scaling Factor to Scale the Cov Matrix & Chi-Squared
-                scalingFactor = (len(self.dataFile)-len(self.fitParams))
-                
-                #Get Chi-Squared and Reduced Chi-Squared
-                chiSqrd   = chiSquared(fitResults,self.dataFile,equation,fSymbols)                     
-                redChiSqrd = chiSqrd/scalingFactor
-                
-                #Scale Cov Matrix to Extract Uncertainties
-                cov = cov*scalingFactor/(scalingFactor+2)
-                
-                #Tell User that Fit Occured
-                self.errorText.config(text="Status: Fit Done")
+                self.comparisonText.configure(state=tk.NORMAL)
+                self.comparisonText.delete("1.0", tk.END)
+                self.comparisonText.insert(tk.INSERT, formatComparison(rows))
+                self.comparisonText.configure(state=tk.DISABLED)
             except:
-                #Tell User that Fit Failed
-                self.errorText.config(text="Status: Could Not Perform Fit."+
-                                      " Check Fit Parameters and Make sure "+
-                                      "Equation Contains Only Valid Symbols")
-                
-                return  #Do Not Attempt Plot
+                self.errorText.config(text="Status: Comparison Window Was"
+                                      +" Closed")
+                return
+            if fitted == []:
+                self.errorText.config(text="Status: No Candidate Could be"
+                                      +" Fit")
+            else:
+                self.errorText.config(text="Status: Compared "+str(len(rows))
+                                      +" Models, Best by AIC: 0 = "
+                                      +fitted[0]["equation"])
+
+    def startWatch(self, string, constants, fkeys, initialGuesses, bounds,
+                   ftol):
+        """
+        Starts Watching the Loaded Data File: Fits it Now on the Background
+            Thread, Then Every Few Seconds Reads Any Rows Appended to it and
+            Refits From the Last Best Fit (See LiveFit), Keeping Every Row or
+            Only the Latest Rows
+        """
+        try:
+            window = None
+            if self.windowEntry.get() != "":
+                window = max(2, int(float(self.windowEntry.get())))
+            tail = DataTail(self.dataFileName, self.dataDelim, window)
+        except:
+            self.errorText.config(text="Status: Only .csv and .txt Files Can"
+                                  +" be Watched")
+            return
+
+        self.stopWatch()
+        self.liveFit = LiveFit(None, tail, initialGuesses, ftol, bounds)
+        self.liveMonitor = FitMonitor()
+        self.fitThread = threading.Thread(target=self.runLiveFit,
+                                          args=(self.liveFit,string,
+                                                constants,fkeys,
+                                                self.liveMonitor),
+                                          daemon=True)
+        self.fitThread.start()
+        self.cancelButton.config(state=tk.NORMAL)
+        self.errorText.config(text="Status: Watching the Data File,"
+                              +" Fitting...")
+        self.window.after(100, self.pollLiveFit, self.liveFit)
+
+    def runLiveFit(self, liveFit, string, constants, fkeys, monitor):
+        """
+        Runs on the Background Fit Thread: Compiles the Watched Model the
+            First Time, Then Reads Any New Rows and Refits
+        Puts the Outcome on the Live Queue for pollLiveFit, and Never Touches
+            the Widgets Itself
+        """
+        if liveFit.model is None:
             try:
-                #Substitute in the Fit Parameters
-                for i in range(len(fSymbols)):
-                    equation = equation.subs(fSymbols[i],fitResults[i])
-                    
-                #Choose Graph's Line Colour Based on Reduced Chi-Squared
-                if 0.5<=redChiSqrd<=2.0:
-                    col = "b"   #Blue Line
-                else:
-                    col = "r"   #Red Line
-                
-                #Convert Equation into Function
-                x = symbols("x")
-                f = lambdify(x, equation)
-                
-                #Plot Equation and Show Fit Params
-                plotEquation(f,self,col)
-                self.showFitParams([fitResults,redChiSqrd,cov])
-                
+                liveFit.model = compileEquation(string,fkeys,constants)
             except:
-                #Tell User that Plot Failed 
-                self.errorText.config(text="Status: Plot Failed")
-                
-                return      #Go back to Previous Function
-    
-    def symbolsFromParams(self,params):
+                self.liveQueue.put(("equation",(liveFit,None)))
+                return
+
+        try:
+            result = liveFit.update(monitor)
+        except FitCancelled:
+            self.liveQueue.put(("cancelled",(liveFit,None)))
+            return
+        except:
+            self.liveQueue.put(("fit",(liveFit,None)))
+            return
+        self.liveQueue.put(("live",(liveFit,result)))
+
+    def pollLiveFit(self, liveFit):
         """
-        Extracts the Keys From the params Dictionary
-        Creates Sympy Symbols from those Keys
-        Returns the Keys and the Symbols
+        Called by the Main Loop Every 100ms While the Watched File is Being
+            Refit
+        Once Refit, Schedules the Next Refit, Then Redraws the Graph and
+            Fitting Parameters in Place if Rows Were Added
+        """
+        try:
+            outcome, (liveFit, result) = self.liveQueue.get_nowait()
+        except queue.Empty:
+            #Still Running, Show Progress and Check Again Later
+            if liveFit is self.liveFit:
+                self.errorText.config(text="Status: Watching the Data File,"
+                                      +" Fitting... "
+                                      +self.liveMonitor.describe())
+            self.window.after(100, self.pollLiveFit, liveFit)
+            return
+
+        if liveFit is not self.liveFit:
+            return      #Watching Stopped While This Refit Ran
+
+        if outcome != "live":
+            self.stopWatch()
+            if outcome == "equation":
+                self.errorText.config(text="Status: Equation Invalid."+
+                                      " Check equation contains only x,y,"
+                                      +"Known Functions,Fitting Parameters"
+                                      +" and Defined Constants")
+            elif outcome == "cancelled":
+                self.errorText.config(text="Status: Stopped Watching the"
+                                      +" Data File")
+            else:
+                self.errorText.config(text="Status: Could Not Fit the"
+                                      +" Watched File. Stopped Watching it")
+            return
+
+        #Schedule the Next Refit First, as Opening the Graph Waits Until it
+        #is Closed
+        try:
+            delay = max(0.1, abs(float(self.cadenceEntry.get())))
+        except:
+            delay = watchSeconds
+        self.watchTimer = self.window.after(int(1000*delay), self.refitLive)
+
+        self.errorText.config(text="Status: Watching "
+                              +self.dataFileName.split("/")[-1]+": "
+                              +str(len(liveFit.tail))+" Rows, Last Refit"
+                              +" Took "+("%.3f" % liveFit.seconds)+"s ("
+                              +str(liveFit.result.iterations)+" Iterations)")
+        if result is not None:
+            self.dataFile = liveFit.tail.dataset()
+            self.plotFit(liveFit.model, result, inPlace=True)
+
+    def refitLive(self):
+        """
+        Called by the Main Loop Every Few Seconds While Watching the Data
+            File, Starts a Refit on the Background Thread Unless Another Fit
+            is Running
+        """
+        self.watchTimer = None
+        if self.liveFit is None:
+            return
+        if self.watchVar.get() != 1:
+            self.stopWatch()
+            self.errorText.config(text="Status: Stopped Watching the Data"
+                                  +" File")
+            return
+        if self.fitThread is not None and self.fitThread.is_alive():
+            self.watchTimer = self.window.after(100, self.refitLive)
+            return
+
+        self.liveMonitor = FitMonitor()
+        self.fitThread = threading.Thread(target=self.runLiveFit,
+                                          args=(self.liveFit,None,None,None,
+                                                self.liveMonitor),
+                                          daemon=True)
+        self.fitThread.start()
+        self.window.after(100, self.pollLiveFit, self.liveFit)
+
+    def stopWatch(self):
+        """
+        Stops Watching the Data File, Cancelling Any Refit Running
+        """
+        if self.watchTimer is not None:
+            self.window.after_cancel(self.watchTimer)
+            self.watchTimer = None
+        if self.liveFit is not None:
+            self.liveFit = None
+            self.liveMonitor.cancel()
+            self.cancelButton.config(state=tk.DISABLED)
+
+    def cancelFit(self):
+        """
+        Function Called When "Cancel Fit" Button is Pressed
+        Stops the Running Fit at its Next Model Evaluation
+        """
+        if self.liveFit is not None:
+            self.stopWatch()
+            self.errorText.config(text="Status: Stopped Watching the Data"
+                                  +" File")
+        elif self.fitMonitor is not None:
+            self.fitMonitor.cancel()
+            self.errorText.config(text="Status: Cancelling Fit...")
+
+    def plotFit(self, model, result, inPlace=False):
+        """
+        Plots the Data With the Best Fit Line of a Finished Fit and Shows User
+            The Best Fit Parameters and Reduced Chi-Squared
+        inPlace Redraws the Open Graph and Fitting Parameters Window (if
+            Open) Rather Than Opening New Ones
         """
-        
-        keys = list(params.keys())      #Get Keys From params Dict
         try:
-            symb = symbols(" ".join(keys))       #Try to Extract Symbols
+            #Choose Graph's Line Colour Based on Reduced Chi-Squared
+            if 0.5<=result.redChiSqrd<=2.0:
+                col = "b"   #Blue Line
+            else:
+                col = "r"   #Red Line
+
+            #Plot Equation and Show Fit Params, Timing the Plot if Profiled
+            if result.profile is None:
+                plotEquation(model,result.params,self,col,inPlace,
+                             result.values)
+            else:
+                with result.profile.activate(), profileStage("plot"):
+                    plotEquation(model,result.params,self,col,inPlace,
+                                 result.values)
+                if profileLog is not None:
+                    result.profile.write(profileLog,
+                                         equation=self.eqEntry.get())
+            if inPlace:
+                self.updateFitParams(result)
+            else:
+                self.showFitParams(result)
             
-            if not isinstance(symb,tuple):     #If single Symbol, make tuple
-                symb = (symb,)
-                
-            return keys, symb   #Return Keys and Symbols
-        
         except:
-            symb = ()   #If 'try:' Failed Return Empty Tuple
-            self.errorText.config(text="Status: No Fitting Parameters")
+            #Tell User that Plot Failed 
+            self.errorText.config(text="Status: Plot Failed")
             
-            return keys, symb   #Return Keys and Symbols
-        
+            return      #Go back to Previous Function
+    
     def dataFromFile(self):
         """
             Opens File Select Window to Select a File
-            Loads File if it is a .CSV or .TXT and Has More Than 1 Data Point
+            Loads File if it is a .CSV, .TXT, .NPY or .NPZ and Has More Than 1
+            Data Point
         """    
         filename, delim = getFileName()     #Get Filename and Delimiter
         
         if filename != "":
+            self.useDataFile(filename, delim)
+        else:
+            self.errorText.config(text="Status: Invalid Input, Please Select"+
+                                  " a .csv, .txt, .npy or .npz File")
+
+    def useDataFile(self, filename, delim, data=None, reference=None):
+        """
+        Shows a Data File's Data and Keeps it as the Data to Fit
+        data is the File's Dataset if Already Loaded (e.g. From a Session),
+            Otherwise the File is Loaded Here
+        reference is the Session's Reference to the File (See
+            dataReference), Made When the Session is Next Saved if None
+        """
+        self.stopWatch()        #Stop Watching Any Previous File
+        self.dataFileName = filename
+        self.dataDelim = delim
+        
+        #reads in data file
+        try:
+            if data is None:
+                data = Dataset(loadData(filename, delim))
+            self.dataFile = data
+            self.dataSource = [filename, delim, data, reference]
+            useable = True
+        except ValueError:
+            useable = False
+        
+        self.dataText.configure(state=tk.NORMAL)    #Make Editable
+        
+        if not useable:    #Not Enough Useable Data 
             
-            #reads in data file
-            self.dataFile = np.genfromtxt(filename, comments='%',
-                                          delimiter = delim)   
+            #Edit text
+            self.dataText.delete('1.0', tk.END)
+            self.dataText.insert(tk.END,"File contained no useable data")
+        else:       #Enough Data to load (Not Necessarily Enough to Fit)
             
-            self.dataText.configure(state=tk.NORMAL)    #Make Editable
+            #Edit text
+            self.dataText.delete('1.0', tk.END)
+            self.dataText.insert(tk.END,self.dataFile)
             
-            if len(self.dataFile) <= 1:    #Not Enough Useable Data 
-                
-                #Edit text
-                self.dataText.delete('1.0', tk.END)
-                self.dataText.insert(tk.END,"File contained no useable data")
-            else:       #Enough Data to load (Not Necessarily Enough to Fit)
-                
-                #Edit text
-                self.dataText.delete('1.0', tk.END)
-                self.dataText.insert(tk.END,self.dataFile)
-                
-            self.dataText.configure(state=tk.DISABLED)  #Make Uneditable
-            self.errorText.config(text="Status: Selected "+filename.split("/")[-1])
-        else:
-            self.errorText.config(text="Status: Invalid Input, Please Select"+
-                                  " a .csv or .txt File")
+        self.dataText.configure(state=tk.DISABLED)  #Make Uneditable
+        status = "Status: Selected "+filename.split("/")[-1]
+        if useable and self.dataFile.nMasked:
+            status = (status+" ("+str(self.dataFile.nMasked)+" Rows With"
+                      +" Missing Values or Zero Error Ignored)")
+        self.errorText.config(text=status)
 
-def chiSquared(guesses, data, equation, fitParams):
-    """
-    Calculates and Returns the Chi-Squared
-    Requires the Data File (Array), the Equation Being Fit (Sympy Expression),
-        The Fit Params (Sympy Symbols) and their Guess Values (array)
-    """
-    #Define x Symbol
-    x = symbols("x")
-    
-    #Extract x,y and y_err Data from inputted Data Array
-    x_data = data[:,0]
-    y_data = data[:,1]
-    y_err = data[:,2]
-
-    #y-value given by inputted equation
-    expr = equation
-    for param,guess in zip(fitParams,guesses):
-        #Substitute in Guesses
-        expr = expr.subs(param, guess)
-        
-    try:   
-        #Try to Create Function from Sympy Expression
-        f = lambdify([x], expr)   
-        
-        #Get y-values Predicted by Expression
-        yEquationValues = f(x_data)
-    except:
-        print("Error")
-        raise SystemExit
-    
-    #Calculate  and Return the Chi-Squared       
-    chiSquared = np.sum(((y_data-yEquationValues)/y_err)**2)
-    return chiSquared      
- 
-def plotEquation(func,gui,col):
-    """
-    Plots the Data Stored in gui (Member of Gui() Class)
-    Plots func(x) (The Fitted Data Function)
+    def sessionState(self):
+        """
+        Returns the Session to Save (See saveSession): the Equation, Each
+            Parameter's Guess or Value, the Tolerance, the Graph's Labels,
+            a Reference to the Data File and the Inputs of the Last Fit
+        """
+        session = {"equation":self.eqEntry.get(),
+                   "fitParams":dict((fkey, formatGuess(guess)) for fkey, guess
+                                    in self.currentGuesses().items()),
+                   "constParams":self.currentConstants(),
+                   "tolerance":self.tolEntry.get(),
+                   "title":self.graphTitleEntry.get(),
+                   "xLabel":self.xAxEntry.get(),
+                   "yLabel":self.yAxEntry.get(),
+                   "data":None, "fit":None}
+        try:
+            filename, delim, data, reference = self.dataSource
+            if reference is None:
+                reference = dataReference(filename, delim, data)
+                self.dataSource[3] = reference
+            session["data"] = reference
+        except:
+            pass    #No Data Loaded, or the File Has Since Gone
+        if self.lastFit is not None:
+            session["fit"] = self.lastFit[0]
+        return session
+
+    def writeSession(self, fileName):
+        """
+        Saves the Session, With the Last Fit's Result, to fileName
+        Returns True if it Was Saved
+        """
+        try:
+            saveSession(fileName, self.sessionState(),
+                        None if self.lastFit is None else self.lastFit[1])
+            return True
+        except:
+            return False
+
+    def restoreSession(self, fileName):
+        """
+        Restores a Session Saved by writeSession: Fills in the Equation,
+            Parameters, Tolerance and Labels (Without Importing SymPy), Then
+            Loads the Data Through its Binary Cache on the Fit Thread and
+            Shows the Saved Fit (See pollSessionData)
+        The Fit is Started as if "Plot Data" Were Pressed, but is Only
+            Redone if its Inputs' Hash No Longer Matches the Saved Fit's
+            (See sessionHash), and the Model Comes From the Model Cache
+        Returns True if the Session Was Restored
+        """
+        try:
+            session, result = loadSession(fileName)
+        except:
+            return False
+
+        #Enter the Equation, Making its Parameters' Entry Boxes Straight Away
+        self.replaceEntry(self.eqEntry, session["equation"])
+        if self.equationTimer is not None:
+            self.window.after_cancel(self.equationTimer)
+            self.equationTimer = None
+        self.findParams(session["equation"])
+
+        #Fill in the Parameters, Then Compile the Model for Them
+        for fkey, guess in session["fitParams"].items():
+            if fkey in self.fitParams:
+                self.replaceEntry(self.fitParams[fkey][1], guess)
+                self.fitParams[fkey][0] = parseGuess(guess)
+        for kkey, value in session["constParams"].items():
+            if kkey in self.constParams:
+                self.replaceEntry(self.constParams[kkey][1], str(value))
+                self.constParams[kkey][0] = value
+        self.analysedText = None
+        self.analyseEquation()
+
+        self.replaceEntry(self.tolEntry, session["tolerance"])
+        self.replaceEntry(self.graphTitleEntry, session["title"])
+        self.replaceEntry(self.xAxEntry, session["xLabel"])
+        self.replaceEntry(self.yAxEntry, session["yLabel"])
+
+        #Load the Data on the Fit Thread, Without Parsing the File Again
+        #Unless it Changed, Then Show the Saved Fit (See pollSessionData)
+        self.lastFit = None
+        self.restoredFit = None
+        reference = session["data"]
+        if reference is not None:
+            self.fitThread = threading.Thread(target=self.loadSessionData,
+                                              args=(reference,result,
+                                                    session["fit"]),
+                                              daemon=True)
+            self.fitThread.start()
+            self.errorText.config(text="Status: Loading the Session's Data...")
+            self.window.after(100, self.pollSessionData)
+        return True
+
+    def loadSessionData(self, reference, result, fit):
+        """
+        Runs on the Background Fit Thread: Loads the Dataset a Restored
+            Session Refers To (See sessionDataset)
+        Puts it, With the Session's Fit, on the Fit Queue for
+            pollSessionData, and Never Touches the Widgets Itself
+        """
+        try:
+            data = sessionDataset(reference)
+        except:
+            data = None
+        self.fitQueue.put(("session",(reference,data,result,fit)))
+
+    def pollSessionData(self):
+        """
+        Called by the Main Loop Every 100ms While a Session's Data Loads
+        Shows the Data, Then Starts the Fit as if "Plot Data" Were Pressed,
+            Which Shows the Saved Fit Instead of Fitting if Nothing Changed
+        """
+        try:
+            outcome, value = self.fitQueue.get_nowait()
+        except queue.Empty:
+            self.window.after(100, self.pollSessionData)
+            return
+        reference, data, result, fit = value
+        self.fitThread.join()       #Has Finished, so a Fit Can be Started
+
+        if data is None:
+            self.errorText.config(text="Status: Could Not Read the Session's"
+                                  +" Data File "
+                                  +reference["file"].split("/")[-1])
+            return
+        self.useDataFile(reference["file"], reference["delim"], data,
+                         reference if data.hashKey is not None else None)
+
+        #Show the Saved Fit, Which Stands in for the Fit if Nothing Changed
+        if result is not None:
+            self.restoredFit = (fit["inputs"], result)
+            self.fitData()
+
+    def replaceEntry(self, entry, text):
+        """
+        Replaces the Text in an Entry Box
+        """
+        entry.delete(0, tk.END)
+        entry.insert(0, text)
+
+    def saveSessionAs(self):
+        """
+        Function Called When "Save Session" Button is Pressed
+        Saves the Session to a File Chosen by the User
+        """
+        fileName = filedialog.asksaveasfilename(defaultextension=".json",
+                                                filetypes=[("Session",
+                                                            "*.json")])
+        if fileName == "":
+            return      #Cancel Pressed
+        if self.writeSession(fileName):
+            self.errorText.config(text="Status: Saved the Session to "
+                                  +fileName.split("/")[-1])
+        else:
+            self.errorText.config(text="Status: Could Not Save the Session")
+
+    def openSession(self):
+        """
+        Function Called When "Open Session" Button is Pressed
+        Restores a Session Saved by "Save Session" (See restoreSession)
+        """
+        fileName = filedialog.askopenfilename(filetypes=[("Session",
+                                                          "*.json")])
+        if fileName == "":
+            return      #Cancel Pressed
+        if self.fitThread is not None and self.fitThread.is_alive():
+            self.errorText.config(text="Status: A Fit is Already Running."
+                                  +" Wait For it or Cancel it")
+        elif not self.restoreSession(fileName):
+            self.errorText.config(text="Status: Could Not Open the Session "
+                                  +fileName.split("/")[-1])
+
+    def closeWindow(self):
+        """
+        Called When the Main Window is Closed: Saves the Session so it is
+            Restored Next Time, Then Closes the Window
+        """
+        self.stopWatch()
+        self.writeSession(lastSessionName())
+        self.window.destroy()
+
+def chiSquared(guesses, data, equation, fitParams=None):
+    """
+    Calculates and Returns the Chi-Squared
+    Requires the Dataset (or Data Array), the Equation Being Fit
+        (CompiledModel, or Sympy Expression Together With the Fit Params as
+        Sympy Symbols) and the Fit Parameters' Guess Values (array)
+    """
+    try:
+        #Compile the Expression Unless Already Given a Compiled Model
+        if isinstance(equation, CompiledModel):
+            model = equation
+        else:
+            model = CompiledModel(equation, fitParams)
+
+        #Calculate the Chi-Squared a Chunk at a Time, so Large Data Never
+        #Needs Full Size Temporary Arrays
+        chiSquared = streamingChiSquared(model, data, guesses)
+    except:
+        print("Error")
+        raise SystemExit
+
+    #Return the Chi-Squared
+    return chiSquared
+
+def plotEquation(model,params,gui,col,inPlace=False,values=None):
+    """
+    Plots the Data Stored in gui (Member of Gui() Class)
+    Plots model(x,*params) (The Fitted Data Function)
     Plots Residuals
     col is a String Determining the Colour of the Fit Line
+    inPlace Redraws Figure 1 if it is Open, Rather Than Closing it and
+        Opening a New One
+    values are the Model at Each Data Point, if Already Known (See drawFit)
     """
-    #Define Data
-    data = gui.dataFile
-    
-    #Extract x,y and y_err Data from inputted Data Array
-    x_data = data[:,0]
-    y_data = data[:,1]
-    y_err = data[:,2]
-    
+    if inPlace and plt.fignum_exists(1):
+        fig = plt.figure(1)
+        fig.clf()
+        drawFit(fig,gui.dataFile,model,params,col,gui.graphTitleEntry.get(),
+                gui.xAxEntry.get(),gui.yAxEntry.get(),values)
+        fig.canvas.draw_idle()      #Redraw Once Control Returns to Tk
+        return
+
     plt.close(1)    #Close Figure 1 if One is Already Open
     fig = plt.figure(1)     #Open New Figure 1
+
+    drawFit(fig,gui.dataFile,model,params,col,gui.graphTitleEntry.get(),
+            gui.xAxEntry.get(),gui.yAxEntry.get(),values)
     
+    plt.show()  #Show Plot
+
+#Data With More Than plotPoints Points is Plotted Decimated, Binned Into One
+#Bin per Pixel Column Showing the Range of its Points and of Their Error Bars
+#Fit Lines are Drawn Through plotGridPoints Evenly Spaced x Values
+plotPoints = 5000
+plotGridPoints = 2000
+
+def drawFit(fig,data,model,params,col,title="",xLabel="",yLabel="",
+            values=None):
+    """
+    Draws a Dataset With the Fit model(x,*params) and its Residuals on Two
+        Axes of fig
+    The Model is Evaluated Once at the Data (for the Residuals) and Once on
+        a Dense Grid (for the Fit Line), Both Memoised per Dataset, Model and
+        params, so Redrawing Costs Depend on the Pixels, Not the Data Size
+    values are the Model at Each Data Point if Already Known (a FitResult's
+        values), in Which Case the Model is Only Evaluated on the Grid
+    """
+    data = data.inMemory()
+    params = tuple(params)
+
+    #Sort the Data by x, so Each Pixel Column's Points are Together
+    order = data.order()
+    x_data = data.x[order]
+    y_data = data.y[order]
+    y_err = data.err[order]
+    if values is None or len(values) != len(data):
+        values = data.memoize(model,("values",params),
+                              lambda: np.broadcast_to(model(data.x,*params),
+                                                      data.x.shape))
+    residuals = y_data-values[order]
+
+    #Evaluate the Fit Line on a Dense Grid Across the Data
+    grid = np.linspace(x_data[0],x_data[-1],plotGridPoints)
+    curve = data.memoize(model,("curve",params),
+                         lambda: np.broadcast_to(model(grid,*params),
+                                                 grid.shape))
+
     #Define two Axes
     ax1 = fig.add_subplot(211)
     ax2 = fig.add_subplot(212)
     
     #Set Grid to On
-    ax1.grid(b=True)
-    ax2.grid(b=True)
+    ax1.grid(True)
+    ax2.grid(True)
     
     #Set Labels For Each of the Axes
-    ax1.set_title(gui.graphTitleEntry.get())
-    ax1.set_ylabel(gui.yAxEntry.get())
+    ax1.set_title(title)
+    ax1.set_ylabel(yLabel)
     ax2.set_ylabel("Residuals")
-    ax2.set_xlabel(gui.xAxEntry.get())
+    ax2.set_xlabel(xLabel)
 
     #Plot Main Axes
-    ax1.errorbar(x_data,y_data,y_err, linestyle='none', color='k')  #plot data
-    ax1.plot(x_data,func(x_data), color=col)    #plot fit
+    nBins = int(fig.get_figwidth()*fig.dpi)
+    drawData(ax1,x_data,y_data,y_err,nBins)     #plot data
+    ax1.plot(grid,curve, color=col)    #plot fit
     
     #Plot Residual Axes
-    ax2.errorbar(x_data,y_data-func(x_data),y_err,linestyle='none', color='k')
-    ax2.plot(x_data,np.zeros(len(x_data)), color=col)    #plot fit
-    
-    plt.show()  #Show Plot
-    
-def getEquation(string):
+    drawData(ax2,x_data,residuals,y_err,nBins)
+    ax2.axhline(0.0, color=col)    #plot fit
+
+def drawData(ax,x,y,y_err,nBins):
     """
-    Given a String Value, Convert Into a SymPy Expression and Solve for y
-    Returns the SymPy Expression
-    """ 
-    #Define y Symbol
-    y = symbols("y")
-    
-    #Convert to SymPy Expression
-    expression = sympify(string)
-    
-    #Solve for y
-    expression = solve(expression,y)
-    return expression
+    Draws Data Sorted by x as Error Bars, or if There are More Than
+        plotPoints Points, as nBins Vertical Lines Spanning Each Bin's y
+        Values Over a Band Spanning its Error Bars
+    """
+    if len(x) <= plotPoints:
+        ax.errorbar(x,y,y_err, linestyle='none', color='k')
+        return
 
-def returnFunction1(*args):
+    xBins, lows, highs = binRanges(x,y-y_err,y+y_err,nBins)
+    ax.fill_between(xBins,lows,highs, color='k', alpha=0.25, linewidth=0)
+    xBins, lows, highs = binRanges(x,y,y,nBins)
+    ax.vlines(xBins,lows,highs, color='k')
+
+def binRanges(x,lows,highs,nBins):
     """
-    Nested Function so That Extra Variables Can be Passed Into Curve_Fit
-    Extra Variables are fitSymbols (Array of SymPy Symbols) and equation
-        (SymPy Expression)
-    Returns the Equation Inputted With the Curve_Fit Trial Guesses Substituted
-        Into the Equation
+    Splits Sorted x Into nBins Equal Width Bins and Returns Each Non-Empty
+        Bin's Mean x, Smallest Value of lows and Largest Value of highs
     """
-    #Define fitSymbols and Equation
-    fitSymbols,equation = args
-    
-    #Define Nested Function
-    def returnFunction2(x,*param):
-        
-        #Define fitSymbols and Equation
-        fitSymbols,equation = args
-        
-        #Define x Symbol
-        xSymb = symbols("x")
-        
-        #For Each Fit Symbol, Substitute its Respective Trial Value into
-        #the Equation
-        for i in range(len(fitSymbols)):
-            equation = equation.subs(fitSymbols[i],param[i])    #Sub in Symbol
-            
-        #Convert SymPy Expression to Function of x
-        f = lambdify(xSymb, equation)
-        
-        #Returns the Value of the Function Applied to the x Values
-        return f(x)
+    edges = np.linspace(x[0],x[-1],nBins+1)
+    starts = np.unique(np.searchsorted(x,edges[:-1]))
+    counts = np.diff(np.append(starts,len(x)))
+    return (np.add.reduceat(x,starts)/counts,
+            np.minimum.reduceat(lows,starts),
+            np.maximum.reduceat(highs,starts))
     
-    #Call Nested Function
-    return returnFunction2
+class FitCancelled(Exception):
+    """
+    Raised Inside a Running Fit Once its FitMonitor Has Been Cancelled
+    """
 
-def getFileName():
+class FitMonitor():
     """
-    Opens File Selection Window and if Selected File is a .csv or .txt
-    Returns the Filename and the Delimeter
+    Shared Between a Fit Running on a Background Thread and Whoever Started
+        it: the Fit Reports its Iteration and Chi-Squared Here, and Stops by
+        Raising FitCancelled Once cancel() Has Been Called
     """
-    #Opens File Selector and Brings it to Front
-    fileName = askopenfilename()
-    
-    #If Cancel Pressed, Exit Program
-    if fileName == "":
-        print("No File Selected")
-        
-    #Check  ends in ".csv" or ".txt"
-    split = fileName.split(".")
-    
-    if split[1] != "csv" and split[1] != "txt":     #Neither .csv or .txt
-        #Return Empty Strings
-        return "",""
-    
-    elif split[1] == "csv":     #File is a .csv
-        #Return File Name and "," as the Delimeter
-        return fileName, ","
-    
-    elif split[1] == "txt":     #File is a .txt
-        #Return File Name and a Tab as the Delimeter
-        return fileName, "\t"
-    
-def main():
+    def __init__(self):
+        self.iteration = 0
+        self.chiSqrd = None
+        self.cancelEvent = threading.Event()
+
+    def cancel(self):
+        """
+        Asks the Fit to Stop at its Next Update
+        """
+        self.cancelEvent.set()
+
+    def update(self, iteration=None, chiSqrd=None):
+        """
+        Records the Fit's Progress, Raising FitCancelled if it Was Cancelled
+        """
+        if self.cancelEvent.is_set():
+            raise FitCancelled()
+        if iteration is not None:
+            self.iteration = iteration
+        if chiSqrd is not None:
+            self.chiSqrd = chiSqrd
+
+    def describe(self):
+        """
+        Returns the Fit's Progress as a String
+        """
+        description = "Iteration: "+str(self.iteration)
+        if self.chiSqrd is not None:
+            description = description+", Chi-Squared: "+("%.6g" % self.chiSqrd)
+        return description
+
+    def watch(self, model, jac, nParams, y_data, y_err):
+        """
+        Wraps a Model Function and its Jacobian (or None) so Each Evaluation
+            Made by curve_fit Reports Progress and Checks for Cancellation
+        """
+        #Define Nested Functions
+        def watchedModel(x, *params):
+            values = model(x, *params)
+            watchedModel.nfev += 1
+            chiSqrd = np.sum(((y_data-values)/y_err)**2)
+            if jac is None:
+                #Each Finite Difference Iteration Costs nParams+1 Evaluations
+                self.update(watchedModel.nfev//(nParams+1), chiSqrd)
+            else:
+                self.update(chiSqrd=chiSqrd)
+            return values
+        watchedModel.nfev = 0
+
+        def watchedJacobian(x, *params):
+            self.update(self.iteration+1)
+            return jac(x, *params)
+
+        return watchedModel, (None if jac is None else watchedJacobian)
+
+#Fits Can be Profiled (See FitProfile), From the GUI or by Batch Fits'
+#--profile Option. GUI Profiles are Also Appended as JSON Lines to profileLog
+#if Set, Which Starts as the GENERALLSFR_PROFILE Environment Variable
+profileLog = os.environ.get("GENERALLSFR_PROFILE")
+
+#Profile of the Fit Running on Each Thread, Set by FitProfile.activate
+activeProfile = threading.local()
+
+class FitProfile():
     """
-    Main Function, Opens Gui, Sets it Up and Runs It's Main Loop
+    Records Where One Fit's Time Went: the Wall Time of Each Stage (Model
+        Cache Lookup, Solving, Compiling, Fitting, Searching, Resampling,
+        Plotting...), the Optimiser's Evaluations and Iterations, Why it
+        Stopped and the Peak Memory Allocated While it Ran
+    A Stage Run Inside Another is Named "outer.inner", its Time Being Part
+        of the Outer Stage's
+    Stages are Only Timed While a Profile is Active (See profileStage), so
+        Fits Which are Not Profiled Do No Extra Work
     """
-    try:
-        #Create New Window to Place Widgets Onto
-        window = tk.Tk()    
-        
-        #Initialise  and Set-Up Graphical User Interface
-        gui = Gui(window)   
-        gui.window.title("General LSFR")
-        gui.window.minsize(width=1500, height=850)
-        gui.setup()         #adds widgets to window
-        
-        #window bring to front
-        window.attributes("-topmost", True)  
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.stack = []
+        self.wallTime = 0.0
+        self.peakMB = 0.0
+        self.fit = {}
+
+    @contextlib.contextmanager
+    def activate(self):
+        """
+        Profiles Everything Run on This Thread Inside the with Block, and
+            Tracks its Peak Memory With tracemalloc
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        activeProfile.profile = self
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.wallTime += time.perf_counter()-start
+            activeProfile.profile = None
+            self.peakMB = max(self.peakMB,
+                              tracemalloc.get_traced_memory()[1]/1e6)
+            if started:
+                tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Adds the Time Spent Inside the with Block to Stage name
+        """
+        self.stack.append(name)
+        key = ".".join(self.stack)
+        self.stages.setdefault(key, 0.0)    #Stages are Listed as They Start
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[key] += time.perf_counter()-start
+            self.stack.pop()
+
+    def record(self, result):
+        """
+        Keeps a FitResult's Method, Evaluation and Iteration Counts and Why
+            it Stopped
+        """
+        self.fit = {"method":result.method, "nfev":result.nfev,
+                    "njev":result.njev, "iterations":result.iterations,
+                    "converged":bool(result.converged),
+                    "message":result.message,
+                    "redChiSqrd":float(result.redChiSqrd)}
+
+    def toDict(self):
+        """
+        Returns the Profile as a Dict of Plain Values, Ready for JSON
+        """
+        profile = {"wallTime":self.wallTime, "peakMB":self.peakMB,
+                   "stages":dict(self.stages)}
+        profile.update(self.fit)
+        return profile
+
+    def write(self, fileName, **fields):
+        """
+        Appends the Profile, and Any Extra fields, as One JSON Line
+        """
+        profile = dict(fields)
+        profile.update(self.toDict())
+        with open(fileName, "a") as profileFile:
+            profileFile.write(json.dumps(profile)+"\n")
+
+    def describe(self):
+        """
+        Returns the Profile as Lines of Text
+        """
+        description = ("Profile: "+("%.3f" % self.wallTime)+"s in Total, "
+                       +("%.1f" % self.peakMB)+" MB Peak Memory\n")
+        for name, seconds in self.stages.items():
+            description = (description+"  "*name.count(".")
+                           +name.split(".")[-1]+": "+("%.4f" % seconds)+"s\n")
+        return description
+
+def profileStage(name):
+    """
+    Returns a Context Manager Timing Stage name of the Profile Active on This
+        Thread, or One Which Does Nothing if None is Active
+    """
+    profile = getattr(activeProfile, "profile", None)
+    if profile is None:
+        return noProfileStage
+    return profile.stage(name)
+
+#Shared Context Manager Returned by profileStage When Not Profiling
+noProfileStage = contextlib.nullcontext()
+
+class FitResult():
+    """
+    Stores the Outcome of a Fit Performed by performFit
+    params are the Best Fit Parameters, cov the Scaled Covariance Matrix
+    nfev and njev Count the Model and Jacobian Evaluations Made by the
+        Optimiser and iterations its Steps, converged is False if it Stopped
+        Before Converging and message Says Why it Stopped
+    rank and condition are the Numerical Rank and Condition Number of the
+        Weighted Jacobian the Covariance Came From
+    residuals are the Weighted Residuals (y-model)/y_err at the Best Fit,
+        values the Model at Each Data Point and jacobian the Weighted Model
+        Jacobian, All Kept From the Optimiser's Own Evaluations so Plots and
+        Reports Need Not Evaluate the Model Again (None Where the Fitting
+        Method Never Holds Them, e.g. streamingFit)
+    """
+    def __init__(self, params, cov, chiSqrd, redChiSqrd, nfev=0, njev=0,
+                 method="curve_fit", converged=True, iterations=0,
+                 message="", rank=None, condition=None, residuals=None,
+                 values=None, jacobian=None):
+        self.resampling = None      #A ResampleResult, Set by Whoever Resamples
+        self.profile = None         #A FitProfile, Set by Whoever Profiles
+        self.params = params
+        self.cov = cov
+        self.chiSqrd = chiSqrd
+        self.redChiSqrd = redChiSqrd
+        self.nfev = nfev
+        self.njev = njev
+        self.method = method
+        self.converged = converged
+        self.iterations = iterations
+        self.message = message
+        self.rank = rank
+        self.condition = condition
+        self.residuals = residuals
+        self.values = values
+        self.jacobian = jacobian
+
+    def uncertainties(self):
+        """
+        Returns the Uncertainty on Each Fit Parameter From the Covariance
+        """
+        return np.sqrt(np.diag(self.cov))
+
+def makeFitResult(params, cov, chiSqrd, nPoints, nfev=0, njev=0,
+                  method="curve_fit", converged=True, iterations=None,
+                  message="", rank=None, condition=None, residuals=None,
+                  jacobian=None, data=None):
+    """
+    Scales the Reduced Chi-Squared and the Covariance Matrix the Same Way
+        for Every Fitting Method and Returns a FitResult
+    nPoints is the Number of Data Points the Model Was Fit To
+    iterations Defaults to njev, as Most Methods Find the Jacobian Once per
+        Iteration
+    The Model's Values at the Data are Recovered From the Weighted
+        residuals if the Dataset They Came From is Given
+    """
+    if iterations is None:
+        iterations = njev
+    message = " ".join(str(message).split())    #Optimisers Wrap Messages
+
+    #Define a Scaling Factor to Scale the Cov Matrix & Chi-Squared
+    scalingFactor = (nPoints-len(params))
+
+    #Get Reduced Chi-Squared
+    redChiSqrd = chiSqrd/scalingFactor
+
+    #Scale Cov Matrix to Extract Uncertainties
+    cov = cov*scalingFactor/(scalingFactor+2)
+
+    #The Weighted Residuals are (y-model)/y_err, so Give the Model Directly
+    values = None
+    if residuals is not None and data is not None:
+        values = data.y-residuals/data.weights
+
+    if rank is not None:
+        rank = int(rank)
+        condition = float(condition)
+    return FitResult(params, cov, chiSqrd, redChiSqrd, int(nfev), int(njev),
+                     method, converged, int(iterations), message, rank,
+                     condition, residuals, values, jacobian)
+
+def singularCovariance(s, vt, nRows):
+    """
+    Returns the Covariance (J^T J)^-1 From the Singular Values s and Right
+        Singular Vectors vt of a Weighted Jacobian J With nRows Rows,
+        Together With J's Numerical Rank and Condition Number
+    Singular Values Which are Zero to Machine Precision are Ignored, so a
+        Rank Deficient Fit Still Gets a Finite Covariance
+    Stacks of Singular Values and Vectors Give Stacks of Each
+    """
+    cutoff = np.finfo(float).eps*max(nRows, s.shape[-1])*s[...,:1]
+    kept = s > cutoff
+    inverseS = np.where(kept, 1.0/np.where(kept, s, 1.0), 0.0)
+    cov = (np.swapaxes(vt, -1, -2)*inverseS[...,None,:]**2) @ vt
+    with np.errstate(divide="ignore", invalid="ignore"):
+        condition = s[...,0]/s[...,-1]
+    return cov, np.sum(kept, axis=-1), condition
+
+def jacobianCovariance(jac):
+    """
+    Returns the Covariance, Rank and Condition Number (See
+        singularCovariance) of a Weighted Jacobian, or a Stack of Them
+    A Dense Jacobian is First Reduced to its R Factor, so Only a Parameters
+        x Parameters Matrix is Decomposed, Without Squaring its Condition
+        Number as J^T J Would
+    A Sparse Jacobian Has Too Many Parameters to Factorise Densely, so is
+        Decomposed Through J^T J (See normalCovariance)
+    """
+    if sparse.issparse(jac):
+        return normalCovariance((jac.T @ jac).toarray(), jac.shape[0])
+    s, vt = np.linalg.svd(np.linalg.qr(jac, mode="r"))[1:]
+    return singularCovariance(s, vt, jac.shape[-2])
+
+def normalCovariance(normal, nRows):
+    """
+    Returns the Covariance, Rank and Condition Number (See
+        singularCovariance) From Only J^T J, Whose Eigenvalues are the
+        Squares of J's Singular Values
+    Eigenvalues Which are Zero to Machine Precision are Ignored
+    """
+    eigenvalues, vectors = np.linalg.eigh(normal)
+    eigenvalues = eigenvalues[::-1]
+    cutoff = np.finfo(float).eps*len(normal)*eigenvalues[0]
+    s = np.sqrt(np.where(eigenvalues > cutoff, eigenvalues, 0.0))
+    return singularCovariance(s, vectors[:,::-1].T, nRows)
+
+def linearFit(model, data):
+    """
+    Fits a CompiledModel Which is Linear in its Fit Parameters in One Step
+    Builds the Weighted Design Matrix and Solves it With an SVD, so no
+        Initial Guesses or Tolerance are Needed and the Covariance is Exact
+    Returns a FitResult
+    """
+    data = asDataset(data)
+
+    #Weight the Design Matrix and the Offset-Subtracted y Data by 1/y_err
+    design, offset = model.designMatrix(data.x)
+    weightedDesign = design*data.weights[:,None]
+    weightedY = (data.y-offset)*data.weights
+
+    #Solve the Least Squares Problem Using the SVD of the Design Matrix,
+    #Ignoring Singular Values Which are Zero to Machine Precision
+    u, s, vt = np.linalg.svd(weightedDesign, full_matrices=False)
+    cutoff = np.finfo(float).eps*max(weightedDesign.shape)*s[0]
+    inverseS = np.where(s > cutoff, 1.0/np.where(s > cutoff, s, 1.0), 0.0)
+    fitResults = vt.T @ (inverseS*(u.T @ weightedY))
+    cov, rank, condition = singularCovariance(s, vt, len(data))
+
+    #Chi-Squared is the Sum of the Squared Weighted Residuals
+    residuals = weightedY-weightedDesign @ fitResults
+    chiSqrd = residuals @ residuals
+
+    return makeFitResult(fitResults, cov, chiSqrd, len(data), 1, 1, "linear",
+                         message="Solved Directly (Linear in the Fit"
+                         " Parameters)", rank=rank, condition=condition,
+                         residuals=residuals, jacobian=weightedDesign,
+                         data=data)
+
+class SeparableProblem():
+    """
+    Variable Projection Form of a Separable Model's Least Squares Problem
+    For Given Nonlinear Parameters the Linear Parameters are Solved Exactly,
+        so the Optimiser Only Searches Over the Nonlinear Parameters
+    The Last Solve is Cached so the Jacobian Call Which Follows a Residual
+        Call at the Same Point Does Not Solve Again
+    """
+    def __init__(self, model, data, monitor=None):
+        data = asDataset(data)
+        self.model = model
+        self.monitor = monitor
+        self.x_data = data.x
+        self.y_data = data.y
+        self.weights = data.weights
+        self.lastNonlinear = None
+        self.nfev = 0
+        self.njev = 0
+
+    def solve(self, nonlinearParams):
+        """
+        Solves for the Linear Parameters at the Given Nonlinear Parameters
+        Returns the Full Parameter Array, the Weighted Residuals and the
+            Orthonormal Basis of the Weighted Basis Matrix's Column Space
+        """
+        nonlinearParams = np.array(nonlinearParams, dtype=float)
+        if (self.lastNonlinear is not None and
+                np.array_equal(nonlinearParams, self.lastNonlinear)):
+            return self.lastSolve
+
+        #Weight the Basis and the Offset-Subtracted y Data by 1/y_err
+        with np.errstate(all="ignore"):
+            basis, offset = self.model.separableBasis(self.x_data,
+                                                      nonlinearParams)
+            weightedBasis = basis*self.weights[:,None]
+            weightedY = (self.y_data-offset)*self.weights
+
+        if np.all(np.isfinite(weightedBasis)) and np.all(np.isfinite(weightedY)):
+            #Solve for the Linear Parameters
+            linearParams = np.linalg.lstsq(weightedBasis, weightedY,
+                                           rcond=None)[0]
+            residuals = weightedY-weightedBasis @ linearParams
+            q = np.linalg.qr(weightedBasis)[0]
+        else:
+            #The Model Overflowed Here, so Return Huge Residuals Which Make
+            #the Optimiser Reject the Step
+            linearParams = np.zeros(len(self.model.linearIndices))
+            residuals = np.full(len(weightedY), 1e100)
+            q = np.zeros(weightedBasis.shape)
+
+        #Merge Both Parameter Sets Back Into the Model's Parameter Order
+        params = np.empty(len(self.model.fitSymbols))
+        params[self.model.nonlinearIndices] = nonlinearParams
+        params[self.model.linearIndices] = linearParams
+
+        self.lastNonlinear = nonlinearParams
+        self.lastSolve = (params, residuals, q)
+        return self.lastSolve
+
+    def residuals(self, nonlinearParams):
+        """
+        Returns the Weighted Residuals With the Linear Parameters Projected Out
+        """
+        self.nfev += 1
+        residuals = self.solve(nonlinearParams)[1]
+        if self.monitor is not None:
+            self.monitor.update(chiSqrd=residuals @ residuals)
+        return residuals
+
+    def jacobian(self, nonlinearParams):
+        """
+        Returns Kaufman's Approximation to the Jacobian of the Projected
+            Residuals: the Model's Nonlinear Jacobian Columns With the Part
+            Lying in the Basis' Column Space Removed
+        """
+        self.njev += 1
+        if self.monitor is not None:
+            self.monitor.update(self.njev)
+        params, residuals, q = self.solve(nonlinearParams)
+        jac = self.model.jacobian(self.x_data, *params)
+        jac = jac[:,self.model.nonlinearIndices]*self.weights[:,None]
+        return -(jac-q @ (q.T @ jac))
+
+def separableFit(model, data, initialGuesses, ftol=0.00000001, monitor=None):
+    """
+    Fits a Separable CompiledModel by Variable Projection
+    Only the Initial Guesses for the Nonlinear Parameters are Used, the
+        Linear Parameters are Solved Exactly at Every Step
+    An Optional FitMonitor is Kept Updated and Can Cancel the Fit
+    The Covariance Covers Every Fit Parameter, From the Full Jacobian at the
+        Best Fit
+    Returns a FitResult
+    """
+    data = asDataset(data)
+    problem = SeparableProblem(model, data, monitor)
+    nonlinearGuesses = np.array(initialGuesses, dtype=float)[
+                                model.nonlinearIndices]
+
+    #Perform the Fit Over the Nonlinear Parameters Only
+    nonlinearResults, cov, info, mesg, ier = optimize.leastsq(
+        problem.residuals, nonlinearGuesses, Dfun=problem.jacobian, ftol=ftol,
+        full_output=True)
+    if ier not in [1, 2, 3, 4]:
+        raise RuntimeError("Optimal parameters not found: "+mesg)
+    fitResults, residuals, q = problem.solve(nonlinearResults)
+
+    #Covariance of All Parameters From the Weighted Full Jacobian
+    jac = model.jacobian(problem.x_data, *fitResults)*problem.weights[:,None]
+    cov, rank, condition = jacobianCovariance(jac)
+
+    #Chi-Squared is the Sum of the Squared Weighted Residuals
+    chiSqrd = residuals @ residuals
+
+    return makeFitResult(fitResults, cov, chiSqrd, len(problem.x_data),
+                         problem.nfev, problem.njev, "separable", message=mesg,
+                         rank=rank, condition=condition, residuals=residuals,
+                         jacobian=jac, data=data)
+
+class FusedProblem():
+    """
+    Least Squares Problem of a Model With an Analytic Jacobian, Evaluated by
+        its Fused Kernel Which Returns the Weighted Residuals and Jacobian
+        Together (See fusedSource)
+    The Last Evaluation is Cached so the Jacobian Call Which Follows a
+        Residual Call at the Same Point Does Not Evaluate Again
+    """
+    def __init__(self, model, data, monitor=None):
+        data = asDataset(data)
+        self.model = model
+        self.monitor = monitor
+        self.x_data = data.x
+        self.y_data = data.y
+        self.weights = data.weights
+        self.lastParams = None
+        self.nfev = 0
+        self.njev = 0
+
+    def evaluate(self, params):
+        """
+        Returns the Weighted Residuals and Weighted Jacobian at params
+        """
+        params = np.array(params, dtype=float)
+        if (self.lastParams is not None and
+                np.array_equal(params, self.lastParams)):
+            return self.lastEvaluation
+
+        self.lastEvaluation = self.model.residualsAndJacobian(
+                                  self.x_data, self.y_data, self.weights,
+                                  params)
+        self.lastParams = params
+        return self.lastEvaluation
+
+    def residuals(self, params):
+        """
+        Returns the Weighted Residuals
+        """
+        self.nfev += 1
+        residuals = self.evaluate(params)[0]
+        if self.monitor is not None:
+            self.monitor.update(chiSqrd=residuals @ residuals)
+        return residuals
+
+    def jacobian(self, params):
+        """
+        Returns the Jacobian of the Weighted Residuals (Minus the Weighted
+            Model Jacobian)
+        """
+        self.njev += 1
+        if self.monitor is not None:
+            self.monitor.update(self.njev)
+        return -self.evaluate(params)[1]
+
+def fusedFit(model, data, initialGuesses, ftol=0.00000001, monitor=None):
+    """
+    Fits a CompiledModel With an Analytic Jacobian, Evaluating the Residuals
+        and Jacobian Together With its Fused Kernel at Each Step
+    An Optional FitMonitor is Kept Updated and Can Cancel the Fit
+    Returns a FitResult
+    """
+    data = asDataset(data)
+    problem = FusedProblem(model, data, monitor)
+
+    #Perform the Fit
+    fitResults, cov, info, mesg, ier = optimize.leastsq(
+        problem.residuals, np.array(initialGuesses, dtype=float),
+        Dfun=problem.jacobian, ftol=ftol, full_output=True)
+    if ier not in [1, 2, 3, 4]:
+        raise RuntimeError("Optimal parameters not found: "+mesg)
+
+    #Covariance From the Weighted Jacobian at the Best Fit, Which is Usually
+    #the Last Point Evaluated so Needs no Further Evaluation
+    residuals, jac = problem.evaluate(fitResults)
+    cov, rank, condition = jacobianCovariance(jac)
+
+    #Chi-Squared is the Sum of the Squared Weighted Residuals
+    chiSqrd = residuals @ residuals
+
+    return makeFitResult(fitResults, cov, chiSqrd, len(problem.x_data),
+                         problem.nfev, problem.njev, "fused", message=mesg,
+                         rank=rank, condition=condition, residuals=residuals,
+                         jacobian=jac, data=data)
+
+#Models With at Least sparseParameters Fit Parameters are Fit by sparseFit
+#When at Most sparseDensity of Their Jacobian is Non-Zero (See
+#CompiledModel.jacobianSparsity for sparseThreshold and sparseMargin)
+sparseParameters = 50
+sparseDensity = 0.2
+sparseThreshold = 1e-10
+sparseMargin = 0.5
+
+def sparseFit(model, data, initialGuesses, ftol=0.00000001, monitor=None,
+              sparsity=None):
+    """
+    Fits a CompiledModel With Many Parameters, Each Affecting Only Part of
+        the Data, Using a Sparse Jacobian Built Term by Term (See
+        CompiledModel.sparseJacobian) and least_squares' Trust Region
+        Reflective Method With the LSMR Solver
+    sparsity is From jacobianSparsity, Found at the Initial Guesses if None
+    An Optional FitMonitor is Kept Updated and Can Cancel the Fit
+    Returns a FitResult
+    """
+    data = asDataset(data)
+    x_data = data.x
+    y_data = data.y
+    weights = data.weights
+    initialGuesses = np.array(initialGuesses, dtype=float)
+    if sparsity is None:
+        sparsity = model.jacobianSparsity(x_data, initialGuesses)
+
+    #Define Nested Functions
+    def residuals(params):
+        residuals.nfev += 1
+        values = (y_data-model(x_data, *params))*weights
+        if monitor is not None:
+            monitor.update(chiSqrd=values @ values)
+        return values
+    residuals.nfev = 0
+
+    def jacobian(params):
+        jacobian.njev += 1
+        if monitor is not None:
+            monitor.update(jacobian.njev)
+        return -model.sparseJacobian(x_data, params, sparsity, weights)
+    jacobian.njev = 0
+
+    #Perform the Fit
+    fit = optimize.least_squares(residuals, initialGuesses, jac=jacobian,
+                                 method="trf", tr_solver="lsmr",
+                                 x_scale="jac", ftol=ftol)
+    if fit.status <= 0:
+        raise RuntimeError("Optimal parameters not found: "+fit.message)
+
+    #Covariance From the Weighted Jacobian least_squares Evaluated at the
+    #Best Fit, J^T J Being Only Parameters x Parameters
+    jac = -fit.jac
+    cov, rank, condition = jacobianCovariance(jac)
+
+    #Chi-Squared is the Sum of the Squared Weighted Residuals
+    chiSqrd = fit.fun @ fit.fun
+
+    return makeFitResult(fit.x, cov, chiSqrd, len(data), residuals.nfev,
+                         jacobian.njev, "sparse", message=fit.message,
+                         rank=rank, condition=condition, residuals=fit.fun,
+                         jacobian=jac, data=data)
+
+def performFit(model, data, initialGuesses, ftol=0.00000001, chunkSize=None,
+               monitor=None):
+    """
+    Fits a CompiledModel to a Dataset (or Data Array With x, y, y_err
+        Columns) Starting From the Initial Guesses
+    Models Which are Linear in Their Fit Parameters are Solved Directly by
+        linearFit, Ignoring the Initial Guesses and Tolerance
+    Models With Many Parameters and a Mostly Zero Jacobian are Fit by
+        sparseFit
+    Partially Linear Models are Fit by Variable Projection in separableFit
+    Data With More Than chunkSize Rows (Default: More Than streamingPoints)
+        is Fit in Chunks by streamingFit
+    Otherwise Models With an Analytic Jacobian are Fit by fusedFit, and
+        Any Other Model by curve_fit Using Finite Differences
+    An Optional FitMonitor is Kept Updated With the Fit's Progress, and
+        Cancels the Fit (Raising FitCancelled) When Asked To
+    Returns a FitResult
+    """
+    data = asDataset(data, inMemory=False)
+    if chunkSize is None and len(data) > streamingPoints:
+        chunkSize = chunkPoints
+    if chunkSize is not None and len(data) > chunkSize:
+        return streamingFit(model, data, initialGuesses, ftol, chunkSize,
+                            monitor=monitor)
+
+    data = data.inMemory()
+    if model.isLinear:
+        return linearFit(model, data)
+    if model.termJacobians is not None:
+        sparsity = model.jacobianSparsity(data.x, initialGuesses)
+        if sparsity is not None:
+            nonZeros = sum(len(rows)*len(indices) for (indices, function), rows
+                           in zip(model.termJacobians, sparsity))
+            if nonZeros <= sparseDensity*len(data)*len(initialGuesses):
+                return sparseFit(model, data, initialGuesses, ftol, monitor,
+                                 sparsity)
+    if model.isSeparable and model.hasJacobian(data.x, initialGuesses):
+        return separableFit(model, data, initialGuesses, ftol, monitor)
+
+    #Extract x,y and y_err Columns from the Dataset
+    x_data = data.x
+    y_data = data.y
+    y_err = data.err
+
+    #Only Use the Analytic Jacobian if it Can be Evaluated at the Guesses
+    if model.hasJacobian(x_data, initialGuesses):
+        return fusedFit(model, data, initialGuesses, ftol, monitor)
+
+    #Report Progress From Each Evaluation if Monitored
+    fitFunction = model
+    jac = None
+    if monitor is not None:
+        fitFunction, jac = monitor.watch(model, jac, len(initialGuesses),
+                                         y_data, y_err)
+
+    #Perform the Fit
+    fitResults, cov, info, mesg, ier = optimize.curve_fit(
+        fitFunction,x_data,y_data,p0=initialGuesses,absolute_sigma=True,
+        ftol=ftol,sigma=y_err,jac=jac,full_output=True)
+
+    #Chi-Squared From the Weighted Residuals (model-y)/y_err the Optimiser
+    #Ended With, so the Model is Not Evaluated Again
+    residuals = -info["fvec"]
+    chiSqrd = residuals @ residuals
+
+    #The Finite Difference Jacobian is Not Kept, but the Optimiser's QR
+    #Factorisation of it is: J P = Q R for a Column Permutation P, so R P^T
+    #Has the Same Singular Values and Right Singular Vectors as J
+    nParams = len(initialGuesses)
+    permutation = info["ipvt"]-min(info["ipvt"])     #1-Based in Older SciPy
+    r = np.triu(info["fjac"].T[:nParams,:])
+    unpermuted = np.empty_like(r)
+    unpermuted[:,permutation] = r
+    s, vt = np.linalg.svd(unpermuted)[1:]
+    cov, rank, condition = singularCovariance(s, vt, len(data))
+
+    #Each Finite Difference Iteration Costs nParams+1 Evaluations
+    return makeFitResult(fitResults, cov, chiSqrd, len(data), info["nfev"],
+                         info.get("njev",0), iterations=info["nfev"]//
+                         (nParams+1), message=mesg, rank=rank,
+                         condition=condition, residuals=residuals, data=data)
+
+def stackDatasets(datasets):
+    """
+    Stacks a List of Datasets (or Data Arrays) of Possibly Different
+        Lengths Into (K, N) Arrays of x, y and Weights (1/y_err)
+    Padding Points Repeat the Last x Value and Have Zero Weight, so They Do
+        Not Contribute to the Chi-Squared
+    """
+    datasets = [asDataset(data) for data in datasets]
+    nPoints = max(len(data) for data in datasets)
+    x = np.empty((len(datasets), nPoints))
+    y = np.zeros((len(datasets), nPoints))
+    weights = np.zeros((len(datasets), nPoints))
+
+    for k, data in enumerate(datasets):
+        n = len(data)
+        x[k,:n] = data.x
+        x[k,n:] = data.x[-1]
+        y[k,:n] = data.y
+        weights[k,:n] = data.weights
+
+    return x, y, weights
+
+def multiFit(model, datasets, initialGuesses, ftol=0.00000001,
+             maxIterations=None, monitor=None):
+    """
+    Fits the Same CompiledModel to Many Datasets at Once
+    Levenberg-Marquardt Steps are Taken for Every Dataset Together, With
+        Residuals as (K, N) and Jacobians as (K, N, P) Arrays, Each Dataset
+        Having its Own Damping and Dropping Out Once it Converges
+    initialGuesses is One Set of Guesses Shared by Every Dataset, or One Row
+        of Guesses per Dataset
+    An Optional FitMonitor is Kept Updated and Can Cancel the Fit
+    Returns a List of FitResults, Scaled the Same Way as performFit
+    """
+    datasets = [asDataset(data) for data in datasets]
+    x, y, weights = stackDatasets(datasets)
+    nSets = len(datasets)
+    nParams = len(model.fitSymbols)
+    if maxIterations is None:
+        maxIterations = 200*(nParams+1)
+
+    params = np.array(np.broadcast_to(np.asarray(initialGuesses, dtype=float),
+                                      (nSets, nParams)))
+
+    def columns(p):
+        #Split (K, P) Parameters Into P Columns Which Broadcast Against x
+        return [p[:,j:j+1] for j in range(nParams)]
+
+    def residuals(rows, p):
+        #Weighted Residuals of the Selected Datasets
+        return (y[rows]-model(x[rows], *columns(p)))*weights[rows]
+
+    useJacobian = model.hasJacobian(x, columns(params))
+
+    def jacobian(rows, p, r):
+        #Weighted Model Jacobian of the Selected Datasets
+        if useJacobian:
+            with np.errstate(all="ignore"):
+                jac = model.jacobian(x[rows], *columns(p))
+            return jac*weights[rows][...,None]
+
+        #Otherwise Forward Differences, One Extra Evaluation per Parameter
+        jac = np.empty(r.shape+(nParams,))
+        for j in range(nParams):
+            step = np.sqrt(np.finfo(float).eps)*np.maximum(np.abs(p[:,j]), 1.0)
+            shifted = p.copy()
+            shifted[:,j] += step
+            jac[...,j] = (r-residuals(rows, shifted))/step[:,None]
+        return jac
+
+    #Evaluate Every Dataset at the Initial Guesses
+    allRows = np.arange(nSets)
+    r = residuals(allRows, params)
+    chiSqrd = np.sum(r**2, axis=1)
+    jac = jacobian(allRows, params, r)
+    nfev = np.ones(nSets, dtype=int)
+    njev = np.ones(nSets, dtype=int)
+    damping = np.full(nSets, 0.001)
+
+    #Datasets Whose Model or Jacobian is Not Finite Cannot be Fit
+    failed = ~(np.isfinite(chiSqrd) & np.all(np.isfinite(jac), axis=(1,2)))
+    active = ~failed
+
+    #Datasets Where no Step Reduces the Chi-Squared Give Up Unconverged
+    stalled = np.zeros(nSets, dtype=bool)
+    xtol = 0.0000000149
+
+    for iteration in range(maxIterations):
+        rows = np.nonzero(active)[0]
+        if rows.size == 0:
+            break
+        if monitor is not None:
+            monitor.update(iteration, np.sum(chiSqrd[rows]))
+
+        #Solve the Damped Normal Equations for Every Active Dataset
+        jacRows = jac[rows]
+        normal = np.einsum("knp,knq->kpq", jacRows, jacRows)
+        gradient = np.einsum("knp,kn->kp", jacRows, r[rows])
+        diagonal = np.maximum(np.diagonal(normal, axis1=1, axis2=2),
+                              np.finfo(float).tiny)
+        damped = normal+(damping[rows,None]*diagonal)[...,None]*np.eye(nParams)
+        step = np.linalg.solve(damped, gradient[...,None])[...,0]
+
+        #Try the Step, Accepting it Where the Chi-Squared Decreased
+        trial = params[rows]+step
+        with np.errstate(all="ignore"):
+            trialR = residuals(rows, trial)
+            trialChi = np.sum(trialR**2, axis=1)
+        nfev[rows] += 1
+        better = np.isfinite(trialChi) & (trialChi <= chiSqrd[rows])
+
+        accepted = rows[better]
+        drop = chiSqrd[accepted]-trialChi[better]
+        converged = ((drop <= ftol*trialChi[better]) |
+                     (np.linalg.norm(step[better], axis=1) <=
+                      xtol*(np.linalg.norm(trial[better], axis=1)+xtol)))
+        params[accepted] = trial[better]
+        r[accepted] = trialR[better]
+        chiSqrd[accepted] = trialChi[better]
+        damping[accepted] /= 10.0
+        if accepted.size > 0:
+            jac[accepted] = jacobian(accepted, params[accepted], r[accepted])
+            njev[accepted] += 1
+            failed[accepted] = ~np.all(np.isfinite(jac[accepted]), axis=(1,2))
+        active[accepted[converged]] = False
+        active[failed] = False
+
+        #Increase the Damping Where the Step Was Rejected, Giving Up Once No
+        #Step Can Reduce the Chi-Squared
+        rejected = rows[~better]
+        damping[rejected] *= 10.0
+        stalled[rejected[damping[rejected] > 1e16]] = True
+        active[stalled] = False
+    converged = ~active & ~failed & ~stalled
+
+    #Covariance of Each Dataset From its Weighted Jacobian at the Best Fit
+    #(Padding Rows Have Zero Weight, so Do Not Change it)
+    cov = np.full((nSets, nParams, nParams), np.nan)
+    rank = np.zeros(nSets, dtype=int)
+    condition = np.full(nSets, np.inf)
+    if np.any(~failed):
+        cov[~failed], rank[~failed], condition[~failed] = jacobianCovariance(
+            jac[~failed])
+
+    messages = np.where(converged, "Converged", np.where(
+        failed, "Model Not Finite", np.where(
+            stalled, "Damping Limit Reached, No Further Improvement",
+            "Reached the Iteration Limit")))
+    results = []
+    for k, data in enumerate(datasets):
+        n = len(data)
+        results.append(makeFitResult(params[k], cov[k], chiSqrd[k], n,
+                                     nfev[k], njev[k], "multiFit",
+                                     bool(converged[k]),
+                                     message=str(messages[k]), rank=rank[k],
+                                     condition=condition[k],
+                                     residuals=r[k,:n], jacobian=jac[k,:n],
+                                     data=data))
+    return results
+
+#The Multi-Start Search Scores searchCandidates Random Parameter Sets, Then
+#Fits From the Best searchStarts, Scoring Blocks of Candidates at Once as
+#(Candidates x Points) Arrays Holding at Most searchBlockValues Values
+#Data With More Than searchPoints Rows is Searched Using Evenly Spaced Rows
+searchCandidates = 2000
+searchStarts = 8
+searchBlockValues = 4000000
+searchPoints = 10000
+
+def candidateChiSquared(model, data, candidates, monitor=None):
+    """
+    Returns the Chi-Squared of a CompiledModel at Each Row of a (Candidates x
+        Params) Array, Evaluating Blocks of Candidates Against Every Data
+        Point at Once
+    Candidates Where the Model is Not Finite Get an Infinite Chi-Squared
+    An Optional FitMonitor is Checked for Cancellation After Every Block
+    """
+    data = asDataset(data)
+    x_data = data.x[None,:]
+    y_data = data.y[None,:]
+    weights = data.weights[None,:]
+    blockSize = max(1, searchBlockValues//len(data))
+
+    chiSqrd = np.empty(len(candidates))
+    for start in range(0, len(candidates), blockSize):
+        block = candidates[start:start+blockSize]
+        with np.errstate(all="ignore"):
+            values = model(x_data, *[block[:,j:j+1]
+                                     for j in range(block.shape[1])])
+            blockChi = np.sum(((y_data-values)*weights)**2, axis=1)
+        chiSqrd[start:start+blockSize] = np.where(np.isfinite(blockChi),
+                                                  blockChi, np.inf)
+        if monitor is not None:
+            monitor.update()
+    return chiSqrd
+
+def processPool(processes, initializer, initargs):
+    """
+    Returns a ProcessPoolExecutor Whose Workers are Started by the
+        forkserver (or Where Unavailable, spawn) Method, Never by Forking
+        This Process, as a Fork Taken After Numba's Parallel Threading Layer
+        Has Started Hangs When the Program Exits
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                               initializer=initializer, initargs=initargs)
+
+#Model and Data Sent Once to Each Search Worker Process by initSearchWorker
+searchProblem = None
+
+def initSearchWorker(model, data):
+    """
+    Keeps the Search's Model and Data in Each Worker Process
+    """
+    global searchProblem
+    searchProblem = (model, data)
+
+def searchWorkerChiSquared(candidates):
+    """
+    Scores Candidates in a Search Worker Process (See candidateChiSquared)
+    """
+    return candidateChiSquared(searchProblem[0], searchProblem[1], candidates)
+
+def multiStartFit(model, data, bounds, initialGuesses=None, ftol=0.00000001,
+                  nCandidates=None, nStarts=None, processes=1, seed=0,
+                  monitor=None):
+    """
+    Searches for the Best Fit of a CompiledModel Within Bounds, Rather Than
+        Only Near One Set of Initial Guesses
+    bounds is One (low, high) Pair per Fit Parameter, Equal for Parameters
+        Which are Not Searched
+    nCandidates Random Parameter Sets Within the Bounds (Plus the Initial
+        Guesses, if Given) are Scored by Chi-Squared, Across processes Worker
+        Processes if More Than 1 (None for Every Core)
+    Local Fits are Then Made From the Best nStarts Together by multiFit, and
+        the Best of Those is Refined by performFit on the Full Data
+    The Bounds Only Limit Where the Search Starts, Not the Fits
+    An Optional FitMonitor is Kept Updated and Can Cancel the Search
+    Returns a FitResult
+    """
+    #Linear Models Have a Single Minimum, Found Directly
+    data = asDataset(data, inMemory=False)
+    if model.isLinear:
+        return performFit(model, data, initialGuesses, ftol, monitor=monitor)
+
+    if nCandidates is None:
+        nCandidates = searchCandidates
+    if nStarts is None:
+        nStarts = searchStarts
+    bounds = np.array(bounds, dtype=float)
+    low = bounds.min(axis=1)
+    high = bounds.max(axis=1)
+
+    #Draw the Candidates, Starting With the Initial Guesses
+    rng = np.random.default_rng(seed)
+    candidates = low+(high-low)*rng.random((nCandidates, len(bounds)))
+    if initialGuesses is not None:
+        candidates = np.vstack((np.array(initialGuesses, dtype=float),
+                                candidates))
+
+    #Only Evenly Spaced Rows of Large Data are Used Until the Final Fit
+    searchData = data.subset(slice(None, None,
+                                   max(1, len(data)//searchPoints)))
+
+    #Score Every Candidate
+    with profileStage("search"):
+        if processes == 1:
+            chiSqrd = candidateChiSquared(model, searchData, candidates,
+                                          monitor)
+        else:
+            with processPool(processes, initSearchWorker,
+                             (model, searchData)) as pool:
+                parts = np.array_split(candidates,
+                                       4*(processes or os.cpu_count()))
+                futures = [pool.submit(searchWorkerChiSquared, part)
+                           for part in parts]
+                chiSqrd = []
+                try:
+                    for future in futures:
+                        if monitor is not None:
+                            monitor.update()
+                        chiSqrd.append(future.result())
+                except FitCancelled:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            chiSqrd = np.concatenate(chiSqrd)
+
+    order = np.argsort(chiSqrd, kind="stable")[:nStarts]
+    order = order[np.isfinite(chiSqrd[order])]
+    if order.size == 0:
+        raise RuntimeError("No Parameters Within the Bounds Give a Finite"
+                           " Chi-Squared")
+
+    #Fit From the Best Candidates Together, Unless Stacking That Many Copies
+    #of the Data Would Use Too Much Memory
+    with profileStage("starts"):
+        if order.size*len(searchData)*len(bounds) <= searchBlockValues:
+            starts = multiFit(model, [searchData]*order.size,
+                              candidates[order], ftol, monitor=monitor)
+        else:
+            starts = []
+            for params in candidates[order]:
+                try:
+                    starts.append(performFit(model, searchData, params, ftol,
+                                             monitor=monitor))
+                except RuntimeError:
+                    pass    #This Start Did Not Converge
+    starts = [start for start in starts if np.isfinite(start.chiSqrd)]
+    if starts == []:
+        raise RuntimeError("Optimal parameters not found from any start")
+    best = min(starts, key=lambda start: start.chiSqrd)
+
+    #Refine the Best With the Usual Fitting Method
+    with profileStage("refine"):
+        try:
+            result = performFit(model, data, best.params, ftol,
+                                monitor=monitor)
+        except RuntimeError:
+            if len(searchData) != len(data):
+                raise
+            result = best
+    if len(searchData) == len(data) and result.chiSqrd > best.chiSqrd:
+        result = best
+
+    result.nfev = result.nfev+len(candidates)+sum(start.nfev for start in starts)
+    result.njev = result.njev+sum(start.njev for start in starts)
+    result.iterations = (result.iterations
+                         +sum(start.iterations for start in starts))
+    result.method = "multiStart"
+    return result
+
+#Resamples are Refit in Chunks of at Most resampleChunkSize Datasets (Fewer for
+#Large Data, so a Chunk Holds About resampleValues Values), and Checked in
+#Rounds of resampleRound Resamples: Resampling Stops Early Once No Interval
+#Moves by More Than resampleTolerance of its Width in a Round
+resampleCount = 10000
+resampleChunkSize = 250
+resampleValues = 20000000
+resampleRound = 1000
+resampleTolerance = 0.01
+
+#Worker Processes the GUI's Resampling Refits Across (None for Every Core)
+resampleProcesses = None
+
+class ResampleResult():
+    """
+    Stores the Outcome of resampleFit
+    params is a (Resamples x Params) Array of the Refit Parameters (Failed
+        Refits Left Out), intervals a (Params x 2) Array of the Percentile
+        Interval of Each Parameter Containing level of the Resamples and
+        correlation the Parameters' Correlation Matrix
+    nFailed Counts the Refits Which Did Not Converge, stoppedEarly is True if
+        the Intervals Settled Before Every Resample Was Used
+    """
+    def __init__(self, method, params, intervals, correlation, level,
+                 nFailed=0, stoppedEarly=False):
+        self.method = method
+        self.params = params
+        self.intervals = intervals
+        self.correlation = correlation
+        self.level = level
+        self.nFailed = nFailed
+        self.stoppedEarly = stoppedEarly
+
+def resampleData(data, nResamples, method, rng):
+    """
+    Returns a List of Resampled Datasets: for "bootstrap" Rows Drawn With
+        Replacement, for "montecarlo" the Data With Gaussian Noise of Size
+        y_err Added to y (Sharing the Original x, y_err and Weights)
+    """
+    data = asDataset(data)
+    if method == "bootstrap":
+        return [data.subset(rows) for rows in
+                rng.integers(0, len(data), (nResamples, len(data)))]
+    if method == "montecarlo":
+        noise = rng.normal(size=(nResamples, len(data)))*data.err
+        return [Dataset.fromColumns(data.x, data.y+shift, data.err,
+                                    data.weights) for shift in noise]
+    raise ValueError("Unknown Resampling Method: "+str(method))
+
+def resampleChunk(model, data, params, nResamples, method, seed, ftol):
+    """
+    Generates and Refits One Chunk of Resamples, Each Warm-Started From the
+        Best Fit Parameters params
+    seed is a numpy SeedSequence, so Every Chunk Draws Different Resamples
+    Returns a (Resamples x Params) Array, With NaN Rows Where a Refit Failed
+    """
+    rng = np.random.default_rng(seed)
+    resampled = resampleData(data, nResamples, method, rng)
+    results = multiFit(model, resampled, params, ftol)
+    return np.array([result.params if result.converged else
+                     np.full(len(params), np.nan) for result in results])
+
+#Model, Data and Best Fit Sent Once to Each Resampling Worker Process
+resampleProblem = None
+
+def initResampleWorker(model, data, params):
+    """
+    Keeps the Resampling's Model, Data and Best Fit in Each Worker Process
+    """
+    global resampleProblem
+    resampleProblem = (model, data, params)
+
+def resampleWorkerChunk(nResamples, method, seed, ftol):
+    """
+    Refits One Chunk of Resamples in a Worker Process (See resampleChunk)
+    """
+    model, data, params = resampleProblem
+    return resampleChunk(model, data, params, nResamples, method, seed, ftol)
+
+def resampleIntervals(params, level):
+    """
+    Returns the (Params x 2) Percentile Intervals Containing level of the
+        Rows of params
+    """
+    tail = 50.0*(1.0-level)
+    return np.percentile(params, [tail, 100.0-tail], axis=0).T
+
+def resampleFit(model, data, fitResult, nResamples=None, method="bootstrap",
+                level=0.6827, seed=0, processes=1, ftol=0.00000001,
+                monitor=None):
+    """
+    Estimates the Distribution of the Fit Parameters by Refitting Resampled
+        Copies of the Data (See resampleData), Each Warm-Started From the
+        Best Fit fitResult
+    Resamples are Generated and Refit a Chunk at a Time With multiFit, Across
+        processes Worker Processes if More Than 1 (None for Every Core), and
+        Resampling Stops Early Once the Intervals Settle
+    The Same seed Always Gives the Same Result, Whatever processes is
+    An Optional FitMonitor is Kept Updated With the Number of Resamples Done
+        and Can Cancel the Resampling
+    Returns a ResampleResult
+    """
+    if nResamples is None:
+        nResamples = resampleCount
+    params = np.array(fitResult.params, dtype=float)
+    data = asDataset(data)
+
+    #Split the Resamples Into Chunks, Each With its Own Random Stream
+    chunkSize = max(1, min(resampleChunkSize, resampleValues//
+                           (len(data)*(len(params)+3))))
+    sizes = [min(chunkSize, nResamples-start)
+             for start in range(0, nResamples, chunkSize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    pool = None
+    if processes != 1:
+        pool = processPool(processes, initResampleWorker,
+                           (model, data, params))
+    try:
+        chunks = []
+        done = 0
+        lastIntervals = None
+        stoppedEarly = False
+        while len(chunks) < len(sizes):
+            #Refit One Round of Chunks
+            roundEnd = len(chunks)+max(1, resampleRound//chunkSize)
+            roundChunks = range(len(chunks), min(roundEnd, len(sizes)))
+            if pool is None:
+                for i in roundChunks:
+                    chunks.append(resampleChunk(model, data, params, sizes[i],
+                                                method, seeds[i], ftol))
+                    done += sizes[i]
+                    if monitor is not None:
+                        monitor.update(done)
+            else:
+                futures = [pool.submit(resampleWorkerChunk, sizes[i], method,
+                                       seeds[i], ftol) for i in roundChunks]
+                for i, future in zip(roundChunks, futures):
+                    if monitor is not None:
+                        monitor.update(done)
+                    chunks.append(future.result())
+                    done += sizes[i]
+
+            #Stop Once No Interval Moved Much Since the Last Round
+            resampled = np.vstack(chunks)
+            resampled = resampled[np.all(np.isfinite(resampled), axis=1)]
+            if len(resampled) < 2:
+                continue
+            intervals = resampleIntervals(resampled, level)
+            if lastIntervals is not None and len(chunks) < len(sizes):
+                width = np.maximum(intervals[:,1]-intervals[:,0],
+                                   np.finfo(float).tiny)
+                shift = np.max(np.abs(intervals-lastIntervals), axis=1)
+                if np.all(shift <= resampleTolerance*width):
+                    stoppedEarly = True
+                    break
+            lastIntervals = intervals
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    resampled = np.vstack(chunks)
+    failed = ~np.all(np.isfinite(resampled), axis=1)
+    resampled = resampled[~failed]
+    if len(resampled) < 2:
+        raise RuntimeError("Too Few Resampled Fits Converged")
+
+    with np.errstate(all="ignore"):
+        correlation = np.atleast_2d(np.corrcoef(resampled, rowvar=False))
+    return ResampleResult(method, resampled,
+                          resampleIntervals(resampled, level), correlation,
+                          level, int(np.sum(failed)), stoppedEarly)
+
+#Milliseconds to Wait After the Last Keystroke Before Analysing an Equation
+equationDelay = 400
+
+#Data With More Rows Than streamingPoints are Fit in Chunks of chunkPoints
+#Rows, so Memory Use is Bounded by the Chunk Size Rather Than the Data Size
+streamingPoints = 5000000
+chunkPoints = 1000000
+
+#Text Files are Parsed Into the Binary Cache in Blocks of This Many Bytes
+textBlockSize = 64*1024*1024
+
+def iterChunks(data, chunkSize=None):
+    """
+    Yields the x, y, y_err and Weight Columns of Consecutive Blocks of
+        chunkSize Rows of a Dataset (or Data Array), so Memory-Mapped Rows
+        are Only Read (and Masked, See maskColumns) a Chunk at a Time
+    """
+    if chunkSize is None:
+        chunkSize = chunkPoints
+    data = asDataset(data, inMemory=False)
+
+    if data.rows is None:
+        for start in range(0, len(data), chunkSize):
+            stop = start+chunkSize
+            yield (data.x[start:stop], data.y[start:stop],
+                   data.err[start:stop], data.weights[start:stop])
+    else:
+        for start in range(0, len(data.rows), chunkSize):
+            chunk = np.asarray(data.rows[start:start+chunkSize])
+            yield maskColumns(chunk[:,0], chunk[:,1], chunk[:,2], data.dtype)
+
+def streamingChiSquared(model, data, params, chunkSize=None):
+    """
+    Returns the Chi-Squared of a CompiledModel, Accumulated a Chunk at a Time
+    """
+    chiSqrd = 0.0
+    for x_data, y_data, y_err, weights in iterChunks(data, chunkSize):
+        chiSqrd += model.chiSquared(x_data, y_data, y_err, params)
+    return chiSqrd
+
+def streamingNormal(model, data, params, useJacobian, chunkSize=None,
+                    monitor=None):
+    """
+    Accumulates the Chi-Squared, J^T W J and J^T W r of a CompiledModel a
+        Chunk at a Time, Where J is the Model's Jacobian, W the Weights
+        (1/y_err^2) and r the Residuals
+    Finite Differences are Used for J if useJacobian is False
+    An Optional FitMonitor is Checked for Cancellation After Every Chunk
+    """
+    nParams = len(params)
+    chiSqrd = 0.0
+    normal = np.zeros((nParams, nParams))
+    gradient = np.zeros(nParams)
+
+    for x_data, y_data, y_err, weights in iterChunks(data, chunkSize):
+        if useJacobian:
+            #Residuals and Jacobian Come From One Pass of the Fused Kernel
+            residuals, jac = model.residualsAndJacobian(x_data, y_data,
+                                                        weights, params)
+        else:
+            values = model(x_data, *params)
+            residuals = (y_data-values)*weights
+
+            #Forward Differences, One Extra Evaluation per Parameter
+            jac = np.empty((len(x_data), nParams))
+            for j in range(nParams):
+                step = np.sqrt(np.finfo(float).eps)*max(abs(params[j]), 1.0)
+                shifted = np.array(params, dtype=float)
+                shifted[j] += step
+                jac[:,j] = (model(x_data, *shifted)-values)/step
+            jac = jac*weights[:,None]
+
+        chiSqrd += residuals @ residuals
+        normal += jac.T @ jac
+        gradient += jac.T @ residuals
+
+        if monitor is not None:
+            monitor.update()
+
+    return chiSqrd, normal, gradient
+
+def streamingFit(model, data, initialGuesses, ftol=0.00000001, chunkSize=None,
+                 maxIterations=None, monitor=None):
+    """
+    Fits a CompiledModel by Levenberg-Marquardt Using Only the Accumulated
+        Chi-Squared, J^T W J and J^T W r, Which are Built a Chunk at a Time
+    Peak Memory is Set by the Chunk Size, so Memory-Mapped Data Larger Than
+        the Available Memory Can be Fit
+    Models Linear in Their Fit Parameters Need a Single Step
+    An Optional FitMonitor is Kept Updated and Can Cancel the Fit
+    Returns a FitResult
+    """
+    data = asDataset(data, inMemory=False)
+    params = np.array(initialGuesses, dtype=float)
+    nParams = len(params)
+    if maxIterations is None:
+        maxIterations = 200*(nParams+1)
+
+    #Only Use the Analytic Jacobian if it Can be Evaluated at the Guesses
+    first = next(iterChunks(data, min(len(data), 1000)))
+    useJacobian = model.hasJacobian(first[0], params)
+
+    chiSqrd, normal, gradient = streamingNormal(model, data, params,
+                                                useJacobian, chunkSize, monitor)
+    nfev = njev = 1
+    converged = False
+    message = "Reached the Iteration Limit"
+    iterations = 0
+
+    if model.isLinear:
+        #One Gauss-Newton Step Solves a Linear Model Exactly
+        params = params+np.linalg.lstsq(normal, gradient, rcond=None)[0]
+        chiSqrd, normal, gradient = streamingNormal(model, data, params,
+                                                    useJacobian, chunkSize,
+                                                    monitor)
+        nfev = njev = 2
+        converged = True
+        message = "Solved Directly (Linear in the Fit Parameters)"
+        iterations = 1
+
+    damping = 0.001
+    xtol = 0.0000000149
+    for iteration in range(maxIterations):
+        if converged:
+            break
+        iterations += 1
+        if monitor is not None:
+            monitor.update(iteration, chiSqrd)
+
+        #Solve the Damped Normal Equations
+        diagonal = np.maximum(np.diag(normal), np.finfo(float).tiny)
+        step = np.linalg.solve(normal+damping*np.diag(diagonal), gradient)
+        trial = params+step
+
+        #Try the Step, Accepting it if the Chi-Squared Decreased
+        with np.errstate(all="ignore"):
+            trialChi, trialNormal, trialGradient = streamingNormal(
+                model, data, trial, useJacobian, chunkSize, monitor)
+        nfev += 1
+        njev += 1
+
+        if np.isfinite(trialChi) and trialChi <= chiSqrd:
+            converged = (chiSqrd-trialChi <= ftol*trialChi or
+                         np.linalg.norm(step) <=
+                         xtol*(np.linalg.norm(trial)+xtol))
+            if converged:
+                message = ("Chi-Squared or Parameters Changed by Less Than"
+                           " the Tolerance")
+            params = trial
+            chiSqrd, normal, gradient = trialChi, trialNormal, trialGradient
+            damping /= 10.0
+        else:
+            #Increase the Damping, Giving Up (Unconverged) Once no Step
+            #Reduces Chi-Squared
+            damping *= 10.0
+            if damping > 1e16:
+                message = "Damping Limit Reached, No Further Improvement"
+                break
+
+    #Covariance From J^T W J at the Best Fit, as the Jacobian Itself is
+    #Never Held in Memory
+    cov, rank, condition = normalCovariance(normal, len(data))
+
+    return makeFitResult(params, cov, chiSqrd, len(data), nfev, njev,
+                         "streaming", converged, iterations, message, rank,
+                         condition)
+
+def getEquation(string):
+    """
+    Given a String Value, Convert Into a SymPy Expression and Solve for y
+    Returns the SymPy Expression
+    """ 
+    #Define y Symbol
+    y = sympy.symbols("y")
+    
+    #Convert to SymPy Expression
+    expression = sympy.sympify(string)
+
+    #Equations Linear in y (e.g. "f1*x+f2-y") are Rearranged Directly, Which
+    #is Much Faster Than solve for Long Equations
+    slope = expression.diff(y)
+    if slope != 0 and not slope.has(y):
+        return [-expression.subs(y,0)/slope]
+    
+    #Solve for y
+    expression = sympy.solve(expression,y)
+    return expression
+
+def returnFunction1(*args):
+    """
+    Returns a Function Which Can be Passed Into Curve_Fit
+    Extra Variables are fitSymbols (Array of SymPy Symbols) and equation
+        (SymPy Expression)
+    The Equation is Compiled Once Here, so Each Call Made by Curve_Fit Only
+        Evaluates the Equation With the Trial Guesses Rather Than Substituting
+        and Lambdifying Again
+    """
+    #Define fitSymbols and Equation
+    fitSymbols,equation = args
+
+    #Compile the Equation Into a Function of x and the Fit Parameters
+    return CompiledModel(equation, fitSymbols)
+
+#Models With at Least This Many Operations are Evaluated With numba on at
+#Least numbaPoints Points or numexpr on at Least numexprPoints, if Installed
+backendOperations = 4
+numexprPoints = 100000
+numbaPoints = 1000000
+
+class CompiledModel():
+    """
+    Vectorised Function f(x,*params) Compiled Once From the Output of
+        getEquation (After Constants are Substituted)
+    Reused by curve_fit, chiSquared and plotEquation so That SymPy is Only
+        Called When the Model is Built, Never Per Evaluation
+    Its Functions are Compiled From Generated Source (See modelRecipe), so a
+        Model Can be Saved and Rebuilt Without SymPy (See ModelCache)
+    Set backend to "numpy", "numexpr" or "numba" to Choose How it is
+        Evaluated, or Leave it "auto" to Pick by Expression Size and Points
+    """
+    def __init__(self, equation, fitSymbols):
+        """
+        equation is a SymPy Expression for y in Terms of x and the Fit Params
+        fitSymbols is an Array of the Fit Parameters' SymPy Symbols
+        """
+        self.load(modelRecipe(equation, fitSymbols))
+        self.expression = equation
+
+    @classmethod
+    def fromRecipe(cls, recipe):
+        """
+        Rebuilds a Compiled Model From a Recipe (See modelRecipe) Without
+            Solving, Differentiating or Lambdifying Anything
+        """
+        model = cls.__new__(cls)
+        model.load(recipe)
+        return model
+
+    def load(self, recipe):
+        """
+        Compiles the Generated Source in a Recipe Into the Model's Functions
+        """
+        self.recipe = recipe
+        self.expression = None
+        self.derivatives = None
+        self.fitSymbols = tuple(sympy.symbols(fkey)
+                                for fkey in recipe["fitNames"])
+
+        self.function = compileSource(recipe["function"], "function")
+
+        #numexpr and Numba Kernels are Only Compiled if They are Used
+        self.backend = "auto"
+        self.kernels = {}
+        self.failedBackends = set()
+        self.jacobianFunction = None
+        self.fusedFunction = None
+        if recipe["jacobian"] is not None:
+            self.jacobianFunction = compileSource(recipe["jacobian"],
+                                                  "jacobian")
+            self.fusedFunction = compileSource(recipe["fused"], "fused")
+
+        #Each Additive Term's Parameter Indices and Compiled Derivatives
+        self.termJacobians = None
+        if recipe.get("terms") is not None:
+            self.termJacobians = [(np.array(term["indices"]),
+                                   compileSource(term["jacobian"], "term"))
+                                  for term in recipe["terms"]]
+
+        self.linearIndices = list(recipe["linearIndices"])
+        self.nonlinearIndices = [i for i in range(len(self.fitSymbols))
+                                 if i not in self.linearIndices]
+
+        #Linear Models are Solved Directly, Partially Linear (Separable)
+        #Models Only Iterate Over Their Nonlinear Parameters
+        self.isLinear = (len(self.linearIndices) == len(self.fitSymbols)
+                         and len(self.fitSymbols) > 0)
+        self.isSeparable = (not self.isLinear and len(self.linearIndices) > 0)
+        if self.isLinear:
+            self.offsetFunction = compileSource(recipe["offset"], "offset")
+        elif self.isSeparable:
+            self.separableFunction = compileSource(recipe["separable"],
+                                                   "separable")
+
+    def __reduce__(self):
+        """
+        Pickles the Model as its Recipe, so it Can be Sent to Worker Processes
+        """
+        return (CompiledModel.fromRecipe, (self.recipe,))
+
+    def symbolic(self):
+        """
+        Returns the Model's SymPy Expression and its Partial Derivatives (None
+            if Differentiation Failed), Parsing Them From the Recipe the First
+            Time a Cached Model is Asked for Them
+        """
+        if self.expression is None:
+            self.expression = sympy.sympify(self.recipe["expression"])
+        if self.derivatives is None and self.recipe["derivatives"] is not None:
+            self.derivatives = [sympy.sympify(derivative) for derivative
+                                in self.recipe["derivatives"]]
+        return self.expression, self.derivatives
+
+    def __call__(self, x, *params):
+        """
+        Returns the Value of the Model Applied to the x Values Using the Given
+            Fit Parameter Values
+        """
+        backend = self.chooseBackend(x, params)
+        values = None
+        if backend != "numpy":
+            try:
+                values = self.kernel(backend, "function")(np.asarray(x),
+                                                          *params)
+            except:
+                self.failedBackends.add(backend)
+        if values is None:
+            values = self.function(x, *params)
+
+        #Expressions Without x (e.g. "f1-y") Return a Scalar, so Broadcast
+        #Them to the Shape of x
+        if np.shape(values) != np.shape(x):
+            values = values + np.zeros(np.shape(x))
+        return values
+
+    def chiSquared(self, x, y, y_err, params):
+        """
+        Returns the Chi-Squared of the Model With the Given Fit Parameters,
+            Which numexpr and Numba Sum in One Pass Without Storing the
+            Model or Residuals
+        """
+        backend = self.chooseBackend(x, params)
+        if backend != "numpy":
+            try:
+                return float(self.kernel(backend, "chiSquared")(
+                    np.asarray(x), np.asarray(y), np.asarray(y_err), *params))
+            except:
+                self.failedBackends.add(backend)
+        return float(np.sum(((y-self(x, *params))/y_err)**2))
+
+    def hasBackend(self, backend):
+        """
+        Returns True if the Model Can be Evaluated With a Backend ("numpy",
+            "numexpr" or "numba"), i.e. it is Installed and Supports the
+            Model's Functions
+        """
+        if backend == "numpy":
+            return True
+        return (backend not in self.failedBackends
+                and self.recipe.get(backend) is not None
+                and optionalModule(backend) is not None)
+
+    def chooseBackend(self, x, params):
+        """
+        Returns the Backend Used to Evaluate the Model at x: the Model's
+            backend Attribute, or if That is "auto", numba or numexpr for
+            Large Expressions on Many Points and NumPy Otherwise
+        Only 1D x With a Single Value per Fit Parameter Can Use numexpr or
+            Numba, Anything Else Falls Back to NumPy
+        """
+        if (self.backend == "numpy" or np.ndim(x) != 1
+                or any(np.ndim(p) != 0 for p in params)):
+            return "numpy"
+        if self.backend != "auto":
+            if self.hasBackend(self.backend):
+                return self.backend
+            return "numpy"
+
+        nPoints = np.shape(x)[0]
+        if self.recipe["operations"] < backendOperations:
+            return "numpy"
+        if nPoints >= numbaPoints and self.hasBackend("numba"):
+            return "numba"
+        if nPoints >= numexprPoints and self.hasBackend("numexpr"):
+            return "numexpr"
+        return "numpy"
+
+    def kernel(self, backend, name):
+        """
+        Returns the numexpr or Numba Kernel Called name ("function" or
+            "chiSquared"), Compiling it the First Time it is Needed
+        """
+        if (backend, name) not in self.kernels:
+            kernel = compileSource(self.recipe[backend], name)
+            if backend == "numba":
+                kernel = optionalModule("numba").njit(parallel=True,
+                                                      error_model="numpy")(kernel)
+            self.kernels[(backend, name)] = kernel
+        return self.kernels[(backend, name)]
+
+    def jacobian(self, x, *params):
+        """
+        Returns the Jacobian of the Model (Partial Derivatives With Respect to
+            Each Fit Parameter) at the x Values as an Array With One Column
+            per Fit Parameter
+        """
+        derivatives = self.jacobianFunction(x, *params)
+
+        #Broadcast Constant Derivatives (e.g. d(f1*x+f2)/df2 = 1) to x
+        columns = np.broadcast_arrays(x, *derivatives)[1:]
+        return np.stack(columns, axis=-1).astype(float)
+
+    def residualsAndJacobian(self, x, y, weights, params):
+        """
+        Returns the Weighted Residuals (y-f)*weights and the Weighted Jacobian
+            of the Model, Evaluated Together in One Fused Pass
+        Must Only be Called When hasJacobian is True
+        """
+        if self.fusedFunction is None:
+            residuals = (y-self(x, *params))*weights
+            return residuals, self.jacobian(x, *params)*weights[...,None]
+        return self.fusedFunction(x, y, weights, *params)
+
+    def jacobianSparsity(self, x, params):
+        """
+        Returns the Rows Each Additive Term's Derivatives are Evaluated on by
+            sparseJacobian: the Rows Where Any of its Derivatives at params is
+            Above sparseThreshold of its Largest Value, Widened in x by
+            sparseMargin of Their Span so the Term Can Move During the Fit
+        Returns None if the Model Has No Term Derivatives or They are Not
+            Finite at params
+        """
+        if self.termJacobians is None:
+            return None
+        params = np.asarray(params, dtype=float)
+
+        sparsity = []
+        for indices, function in self.termJacobians:
+            with np.errstate(all="ignore"):
+                jac = np.abs(np.stack(np.broadcast_arrays(
+                    x, *function(x, *params[indices]))[1:], axis=-1))
+            if not np.all(np.isfinite(jac)):
+                return None
+            scale = np.maximum(jac.max(axis=0), np.finfo(float).tiny)
+            support = np.any(jac > sparseThreshold*scale, axis=1)
+            if not np.any(support):
+                sparsity.append(np.arange(0))
+                continue
+            low, high = x[support].min(), x[support].max()
+            margin = sparseMargin*(high-low)
+            sparsity.append(np.nonzero((x >= low-margin) &
+                                       (x <= high+margin))[0])
+        return sparsity
+
+    def sparseJacobian(self, x, params, sparsity, weights=None):
+        """
+        Returns the (Weighted) Jacobian at x as a Sparse CSR Matrix,
+            Evaluating Each Term's Derivatives Only on its Rows in sparsity
+            (See jacobianSparsity), so the Cost Scales With the Number of
+            Non-Zeros Rather Than Points x Parameters
+        """
+        params = np.asarray(params, dtype=float)
+        rows, columns, values = [], [], []
+        for (indices, function), termRows in zip(self.termJacobians,
+                                                 sparsity):
+            termX = x[termRows]
+            jac = np.broadcast_arrays(termX,
+                                      *function(termX, *params[indices]))[1:]
+            for j, column in zip(indices, jac):
+                if weights is not None:
+                    column = column*weights[termRows]
+                rows.append(termRows)
+                columns.append(np.full(len(termRows), j))
+                values.append(column)
+
+        #Parameters Shared by Several Terms Have Their Derivatives Summed
+        return sparse.coo_matrix((np.concatenate(values).astype(float),
+                                  (np.concatenate(rows),
+                                   np.concatenate(columns))),
+                                 shape=(len(x), len(params))).tocsr()
+
+    def hasJacobian(self, x, params):
+        """
+        Returns True if the Analytic Jacobian Exists and is Finite at params
+        """
+        if self.jacobianFunction is None:
+            return False
+        try:
+            return bool(np.all(np.isfinite(self.jacobian(x, *params))))
+        except:
+            return False
+
+    def designMatrix(self, x):
+        """
+        Returns the Design Matrix (Columns are the Partial Derivatives With
+            Respect to Each Fit Parameter) and the Offset Term of a Model
+            Which is Linear in its Fit Parameters
+        """
+        zeros = [0.0]*len(self.fitSymbols)
+        offset = self.offsetFunction(x) + np.zeros(np.shape(x))
+        return self.jacobian(x, *zeros), offset
+
+    def separableBasis(self, x, nonlinearParams):
+        """
+        Returns the Basis Matrix (One Column per Linear Fit Parameter) and the
+            Offset Term of a Separable Model at the Given Nonlinear Parameters
+        """
+        terms = self.separableFunction(x, *nonlinearParams)
+        terms = np.broadcast_arrays(x, *terms)[1:]
+        return np.stack(terms[1:], axis=-1).astype(float), terms[0]*1.0
+
+    def bind(self, params):
+        """
+        Returns a Function of x Only, With the Fit Parameters Fixed to params
+        """
+        params = tuple(params)
+
+        #Define Nested Function
+        def boundModel(x):
+            return self(x, *params)
+
+        return boundModel
+
+def modelRecipe(equation, fitSymbols):
+    """
+    Differentiates an Equation, Finds the Parameters it is Linear in and
+        Generates the NumPy Source of Every Function a CompiledModel Needs
+    Returns a Dict of Plain Strings and Lists, so it Can be Saved as JSON and
+        the Model Rebuilt in Another Session Without SymPy
+    """
+    #Define x Symbol
+    xSymb = sympy.symbols("x")
+    fitSymbols = tuple(fitSymbols)
+    arguments = (xSymb,)+fitSymbols
+
+    recipe = {"fitNames":[str(f) for f in fitSymbols],
+              "expression":sympy.srepr(equation), "derivatives":None,
+              "jacobian":None, "fused":None, "offset":None, "separable":None,
+              "terms":None,
+              "linearIndices":[], "operations":int(sympy.count_ops(equation))}
+
+    #Convert SymPy Expression to a Function of x and Every Fit Parameter,
+    #for NumPy and for Each Optional Backend
+    recipe["function"] = generateSource("function", arguments, equation)
+    recipe["numexpr"] = numexprSource(arguments, equation)
+    recipe["numba"] = numbaSource(arguments, equation)
+
+    #Differentiate With Respect to Each Fit Parameter and Generate Every
+    #Partial Derivative as One Jacobian Function
+    try:
+        derivatives = [equation.diff(f) for f in fitSymbols]
+        recipe["jacobian"] = generateSource("jacobian", arguments, derivatives)
+        recipe["fused"] = fusedSource(arguments, equation, derivatives)
+        recipe["derivatives"] = [sympy.srepr(derivative) for derivative in
+                                 derivatives]
+    except:
+        #Differentiation Failed, Fall Back to Finite Differences
+        return recipe
+
+    #Models With Many Parameters Also Get Each Additive Term's Derivatives,
+    #so a Sparse Jacobian Can be Built Term by Term (See sparseFit)
+    terms = sympy.Add.make_args(equation)
+    if len(fitSymbols) >= sparseParameters and len(terms) > 1:
+        recipe["terms"] = []
+        for term in terms:
+            indices = [i for i, f in enumerate(fitSymbols)
+                       if f in term.free_symbols]
+            if indices != []:
+                recipe["terms"].append({"indices":indices,
+                    "jacobian":generateSource("term", (xSymb,)+tuple(
+                        fitSymbols[i] for i in indices),
+                        [term.diff(fitSymbols[i]) for i in indices])})
+
+    #Find the Fit Parameters the Model is Jointly Linear in: a Set of
+    #Parameters Whose Partial Derivatives Contain None of That Set, so the
+    #Model Can be Written as offset + Sum(f_i * basis_i) Over the Set
+    linearIndices = []
+    for i in range(len(fitSymbols)):
+        candidate = linearIndices+[i]
+        candidateSet = set(fitSymbols[j] for j in candidate)
+        if all(not (derivatives[j].free_symbols & candidateSet)
+               for j in candidate):
+            linearIndices = candidate
+    recipe["linearIndices"] = linearIndices
+
+    if len(linearIndices) == len(fitSymbols) and len(fitSymbols) > 0:
+        offset = equation.subs({f: 0 for f in fitSymbols})
+        recipe["offset"] = generateSource("offset", (xSymb,), offset)
+    elif len(linearIndices) > 0:
+        #Generate the Offset and the Basis Functions Multiplying Each Linear
+        #Parameter as Functions of x and the Nonlinear Parameters
+        linearSymbols = [fitSymbols[i] for i in linearIndices]
+        nonlinearSymbols = tuple(f for f in fitSymbols
+                                 if f not in linearSymbols)
+        offset = equation.subs({f: 0 for f in linearSymbols})
+        basis = [derivatives[i] for i in linearIndices]
+        recipe["separable"] = generateSource("separable",
+                                             (xSymb,)+nonlinearSymbols,
+                                             [offset]+basis)
+    return recipe
+
+def generateSource(name, arguments, expression):
+    """
+    Returns the Python Source of a Function Evaluating a SymPy Expression (or
+        List of Expressions) With NumPy/SciPy, as lambdify Would
+    Subexpressions Shared Between the Expressions are Only Computed Once
+    The Source Imports Every Module it Uses, so it Compiles on its Own
+    """
+    printer = numpyPrinting.SciPyPrinter({"fully_qualified_modules":True,
+                                          "inline":True})
+    isList = isinstance(expression, (list, tuple))
+    replacements, reduced = sympy.cse(list(expression) if isList
+                                      else [expression],
+                                      symbols=sympy.numbered_symbols("cse"))
+
+    lines = ["def "+name+"("+", ".join(str(a) for a in arguments)+"):"]
+    for symbol, value in replacements:
+        lines.append("    "+str(symbol)+" = "+printer.doprint(value))
+    lines.append("    return "+printer.doprint(reduced if isList
+                                               else reduced[0]))
+
+    imports = ["import "+module for module in sorted(printer.module_imports)]
+    return "\n".join(imports+lines)+"\n"
+
+def fusedSource(arguments, equation, derivatives):
+    """
+    Returns the Source of fused(x,y,weights,*params), Which Returns a
+        Model's Weighted Residuals (y-f)*weights and Weighted Jacobian
+        Together, Computing Each Subexpression Shared by the Model and its
+        Partial Derivatives (e.g. an Exponential) Only Once
+    """
+    printer = numpyPrinting.SciPyPrinter({"fully_qualified_modules":True,
+                                          "inline":True})
+    replacements, reduced = sympy.cse([equation]+list(derivatives),
+                                      symbols=sympy.numbered_symbols("cse"))
+
+    names = [str(a) for a in arguments]
+    lines = ["def fused("+", ".join(names[:1]+["y", "weights"]+names[1:])
+             +"):"]
+    for symbol, value in replacements:
+        lines.append("    "+str(symbol)+" = "+printer.doprint(value))
+    lines.append("    residuals = (y-("+printer.doprint(reduced[0])
+                 +"))*weights")
+    lines.append("    jacobian = numpy.empty(numpy.shape(residuals)+("
+                 +str(len(derivatives))+",))")
+    for i, derivative in enumerate(reduced[1:]):
+        lines.append("    jacobian[...,"+str(i)+"] = ("
+                     +printer.doprint(derivative)+")*weights")
+    lines.append("    return residuals, jacobian")
+
+    modules = set(printer.module_imports) | set(["numpy"])
+    imports = ["import "+module for module in sorted(modules)]
+    return "\n".join(imports+lines)+"\n"
+
+def compileSource(source, name):
+    """
+    Compiles Source From generateSource and Returns the Function it Defines
+    """
+    namespace = {}
+    exec(compile(source, "<"+name+">", "exec"), namespace)
+    return namespace[name]
+
+#Functions numexpr Can Evaluate
+numexprFunctions = set(["sin", "cos", "tan", "arcsin", "arccos", "arctan",
+                        "arctan2", "sinh", "cosh", "tanh", "arcsinh",
+                        "arccosh", "arctanh", "log", "log10", "log1p", "exp",
+                        "expm1", "sqrt", "abs", "where", "floor", "ceil"])
+
+def numexprSource(arguments, expression):
+    """
+    Returns the Source of numexpr Kernels for a Model Expression: function
+        (x,*params) and chiSquared(x,y,y_err,*params), Which Sums the
+        Weighted Squared Residuals Without Storing Them
+    Returns None if numexpr Cannot Evaluate the Expression
+    """
+    #numexpr Has No Named Constants (e.g. pi), so Write Them as Numbers
+    constants = expression.atoms(sympy.NumberSymbol)
+    expression = expression.xreplace(dict((c, sympy.Float(c))
+                                          for c in constants))
+    try:
+        text = lambdaPrinting.NumExprPrinter()._print(expression)
+    except:
+        return None
+    if any(name not in numexprFunctions
+           for name in re.findall(r"([\w.]+)\(", text)):
+        return None
+
+    names = [str(a) for a in arguments]
+    localDict = "{"+", ".join(repr(n)+":"+n for n in names)+"}"
+    chiText = "sum(((y - ("+text+"))/y_err)**2)"
+    lines = ["import numexpr",
+             "def function("+", ".join(names)+"):",
+             "    return numexpr.evaluate("+repr(text)+", local_dict="
+             +localDict+")",
+             "def chiSquared("+", ".join(names[:1]+["y", "y_err"]+names[1:])
+             +"):",
+             "    return numexpr.evaluate("+repr(chiText)+", local_dict="
+             +localDict[:-1]+", 'y':y, 'y_err':y_err})[()]"]
+    return "\n".join(lines)+"\n"
+
+def numbaSource(arguments, expression):
+    """
+    Returns the Source of Loops Numba Can Compile for a Model Expression:
+        function(xs,*params) and chiSquared(xs,ys,errs,*params), Which
+        Evaluates the Model, Residual and Chi-Squared in One Pass per Point
+    Returns None if the Expression Uses Functions Outside Python's math
+    """
+    printer = pycodePrinting.PythonCodePrinter({"fully_qualified_modules":
+                                                True, "inline":True})
+    try:
+        text = printer.doprint(expression)
+    except:
+        return None
+
+    params = [str(a) for a in arguments[1:]]
+    lines = ["import "+module for module in sorted(printer.module_imports)]
+    lines = lines+["import numpy", "import numba",
+                   "def function("+", ".join(["xs"]+params)+"):",
+                   "    values = numpy.empty(xs.shape[0])",
+                   "    for i in numba.prange(xs.shape[0]):",
+                   "        x = xs[i]",
+                   "        values[i] = "+text,
+                   "    return values",
+                   "def chiSquared("+", ".join(["xs", "ys", "errs"]+params)
+                   +"):",
+                   "    total = 0.0",
+                   "    for i in numba.prange(xs.shape[0]):",
+                   "        x = xs[i]",
+                   "        residual = (ys[i]-("+text+"))/errs[i]",
+                   "        total += residual*residual",
+                   "    return total"]
+    return "\n".join(lines)+"\n"
+
+#Optional Modules, Imported the First Time They are Needed (None if Missing)
+optionalModules = {}
+
+def optionalModule(name):
+    """
+    Returns an Optional Module (e.g. "numexpr"), or None if Not Installed
+    """
+    if name not in optionalModules:
+        try:
+            optionalModules[name] = importlib.import_module(name)
+        except ImportError:
+            optionalModules[name] = None
+    return optionalModules[name]
+
+def getFileName():
+    """
+    Opens File Selection Window and if Selected File is a .csv, .txt, .npy
+    or .npz Returns the Filename and the Delimeter (Empty for Binary Files)
+    """
+    #Opens File Selector and Brings it to Front
+    fileName = filedialog.askopenfilename()
+    
+    #If Cancel Pressed, Exit Program
+    if fileName == "":
+        print("No File Selected")
+
+    #Binary .npy and .npz Files Need no Delimeter
+    if os.path.splitext(fileName)[1].lower() in (".npy", ".npz"):
+        return fileName, ""
+
+    #Check  ends in ".csv" or ".txt"
+    delim = delimiterFromName(fileName)
+
+    if delim == "":     #Neither .csv or .txt
+        #Return Empty Strings
+        return "",""
+
+    #Return File Name and its Delimeter
+    return fileName, delim
+
+def delimiterFromName(fileName):
+    """
+    Returns "," for a .csv File, a Tab for a .txt File and the Empty String
+        for Any Other File
+    """
+    extension = os.path.splitext(fileName)[1].lower()
+
+    if extension == ".csv":     #File is a .csv
+        return ","
+    elif extension == ".txt":     #File is a .txt
+        return "\t"
+    return ""
+
+def loadData(fileName, delim=None, columns=(0,1,2), useCache=True):
+    """
+    Reads a Data File in the Three Column (x, y, y_err) Format
+    .npy and .npz Files are Opened Memory-Mapped. Text Files Skip Comments
+        Starting With '%' and Split on the Delimiter (Chosen From the File's
+        Extension if Not Given), and a Binary Copy is Cached so That Loading
+        the Same File Again Skips Parsing
+    columns Selects Which Columns Hold x, y and y_err
+    Returns a 2D Array With One Row per Data Point
+    """
+    extension = os.path.splitext(fileName)[1].lower()
+
+    if extension == ".npy":
+        data = np.load(fileName, mmap_mode="r")
+    elif extension == ".npz":
+        data = loadNpz(fileName)
+    else:
+        if delim is None:
+            delim = delimiterFromName(fileName)
+
+        #Use the Cached Binary Copy if the File Has Not Changed Since
+        cacheName = dataCacheName(fileName, delim)
+        data = None
+        if useCache and os.path.exists(cacheName):
+            try:
+                data = np.load(cacheName, mmap_mode="r")
+            except (OSError, ValueError):
+                data = None     #Corrupt Cache, Parse Again
+            try:
+                os.utime(cacheName)     #Recently Used, so it is Evicted Last
+            except OSError:
+                pass
+
+        if data is None:
+            if useCache:
+                data = cacheText(fileName, delim, cacheName)
+            else:
+                data = parseText(fileName, delim)
+
+    return selectColumns(data, columns)
+
+def parseText(fileName, delim):
+    """
+    Parses a Delimited Text File Into a 2D Array of Floats in One Vectorised
+        Pass, With the Same Rules as np.genfromtxt(comments='%'): Text After
+        a '%' is Ignored and Blank Lines are Skipped
+    Files That Cannot be Parsed This Way (e.g. Missing Values or Headers
+        Without a '%') Fall Back to np.genfromtxt
+    """
+    with open(fileName, "rb") as dataFile:
+        data = parseBytes(dataFile.read(), delim)
+
+    if data is None:
+        #Irregular File, Parse it Line by Line
+        data = np.genfromtxt(fileName, comments='%', delimiter = delim,
+                             ndmin=2)
+    return data
+
+def parseBytes(text, delim):
+    """
+    Parses Delimited Text (Bytes) Into a 2D Array of Floats in One Vectorised
+        Pass, Ignoring Text After a '%' and Blank Lines
+    Returns None if the Text is Irregular (Lines With Different Numbers of
+        Fields, Missing Values or Text Which is Not a Number)
+    """
+    #Remove Comments
+    if b"%" in text:
+        text = re.sub(rb"%[^\n]*", b"", text)
+
+    #Split the Text Into Lines, Each Ending at its Newline
+    if not text.endswith(b"\n"):
+        text = text+b"\n"
+    raw = np.frombuffer(text, dtype=np.uint8)
+    lineEnds = np.flatnonzero(raw == ord("\n"))
+    lineStarts = np.concatenate(([0], lineEnds[:-1]+1))
+
+    #Find Lines With Any Non-Whitespace (Blank Lines are Skipped)
+    used = np.add.reduceat((raw > ord(" ")).view(np.uint8), lineStarts,
+                           dtype=np.int64) > 0
+    nUsed = int(np.count_nonzero(used))
+    if nUsed == 0:
+        return None
+
+    if delim == "" or delim is None:
+        #Fields Split on Any Whitespace, so Count the First Used Line's
+        first = int(np.argmax(used))
+        nColumns = len(text[lineStarts[first]:lineEnds[first]].split())
+        values = text
+    else:
+        #Every Used Line Must Have the Same Number of Delimiters
+        separators = np.add.reduceat((raw == ord(delim)).view(np.uint8),
+                                     lineStarts, dtype=np.int64)[used]
+        nColumns = int(separators[0])+1
+        if not np.all(separators == nColumns-1):
+            return None
+        values = text.replace(delim.encode(), b" ")
+
+    #Parse Every Number at Once. Unparseable Text Stops the Parse Early
+    #(Older NumPy Warns, Newer NumPy Raises), Which Shows as Too Few Numbers
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            numbers = np.fromstring(values, sep=" ")
+    except ValueError:
+        return None
+    if numbers.size != nUsed*nColumns:
+        return None
+    return numbers.reshape(nUsed, nColumns)
+
+def iterTextBlocks(fileName, blockSize):
+    """
+    Yields a Text File as Blocks of Roughly blockSize Bytes, Each Ending on
+        a Line Break so no Line is Split Between Blocks
+    """
+    with open(fileName, "rb") as dataFile:
+        remainder = b""
+        while True:
+            block = dataFile.read(blockSize)
+            if block == b"":
+                break
+            block = remainder+block
+            lastLine = block.rfind(b"\n")+1
+            remainder = block[lastLine:]
+            if lastLine > 0:
+                yield block[:lastLine]
+        if remainder.strip() != b"":
+            yield remainder
+
+def npyHeader(shape):
+    """
+    Returns a Fixed Length (128 Byte) .npy Header for a Float Array, so it
+        Can be Rewritten Once the Final Shape is Known
+    """
+    header = repr({"descr":"<f8", "fortran_order":False, "shape":shape})
+    header = header+" "*(117-len(header))+"\n"
+    return (b"\x93NUMPY\x01\x00"+len(header).to_bytes(2, "little")
+            +header.encode("latin1"))
+
+def cacheText(fileName, delim, cacheName, blockSize=None):
+    """
+    Parses a Text Data File Block by Block Straight Into its .npy Cache and
+        Returns the Cache Memory-Mapped, so Files Larger Than the Available
+        Memory Can be Loaded
+    Files Whose Blocks Do Not Agree on the Number of Columns are Parsed
+        Whole by parseText Instead
+    """
+    if blockSize is None:
+        blockSize = textBlockSize
+
+    #Write to a Temporary File First so a Partial Cache is Never Read
+    temporaryName = cacheName+"."+str(os.getpid())+".tmp"
+    nRows = 0
+    nColumns = None
+    try:
+        with open(temporaryName, "wb") as cacheFile:
+            cacheFile.write(npyHeader((0, 0)))
+            for block in iterTextBlocks(fileName, blockSize):
+                rows = parseBytes(block, delim)
+                if rows is None:
+                    #Irregular Block, Parse it Line by Line
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore", UserWarning)
+                        rows = np.genfromtxt(io.BytesIO(block), comments='%',
+                                             delimiter = delim, ndmin=2)
+                if rows.size == 0:
+                    continue    #Only Comments or Blank Lines
+                if nColumns is not None and rows.shape[1] != nColumns:
+                    raise ValueError("Inconsistent Number of Columns")
+                nColumns = rows.shape[1]
+                cacheFile.write(np.ascontiguousarray(rows, dtype="<f8").tobytes())
+                nRows += len(rows)
+
+            #Rewrite the Header With the Final Shape
+            cacheFile.seek(0)
+            cacheFile.write(npyHeader((nRows, nColumns or 0)))
+        os.replace(temporaryName, cacheName)
+        evictDataCache(cacheName)
+        return np.load(cacheName, mmap_mode="r")
+    except (OSError, ValueError):
+        if os.path.exists(temporaryName):
+            os.remove(temporaryName)
+
+    #Could Not Stream the File, Parse it in Memory Instead
+    data = parseText(fileName, delim)
+    saveDataCache(data, cacheName)
+    return data
+
+def loadNpz(fileName, key=None):
+    """
+    Opens an Array From a .npz File, Memory-Mapped if it Was Stored Without
+        Compression (Otherwise it is Read Into Memory)
+    Uses the Array Named "data" if Present, Otherwise the First Array
+    """
+    with zipfile.ZipFile(fileName) as archive:
+        names = [name for name in archive.namelist() if name.endswith(".npy")]
+        if key is None:
+            key = "data" if "data.npy" in names else names[0][:-4]
+        info = archive.getinfo(key+".npy")
+
+    if info.compress_type != zipfile.ZIP_STORED:
+        return np.load(fileName)[key]
+
+    with open(fileName, "rb") as npzFile:
+        #Skip the Zip Member's Local Header to Reach the .npy Data
+        npzFile.seek(info.header_offset)
+        header = npzFile.read(30)
+        npzFile.seek(info.header_offset+30+int.from_bytes(header[26:28], "little")
+                     +int.from_bytes(header[28:30], "little"))
+
+        #Read the .npy Header to Find the Array's Shape, Order and Type
+        version = np.lib.format.read_magic(npzFile)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(npzFile)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(npzFile)
+        offset = npzFile.tell()
+
+    return np.memmap(fileName, dtype=dtype, mode="r", offset=offset,
+                     shape=shape, order="F" if fortran else "C")
+
+def selectColumns(data, columns=(0,1,2)):
+    """
+    Checks the Data Has an x, y and y_err Column and Returns Those Columns
+    Raises a ValueError if the Data Does Not Have Enough Rows or Columns
+    """
+    data = np.asarray(data) if not isinstance(data, np.ndarray) else data
+    if data.ndim != 2 or len(data) <= 1:
+        raise ValueError("File contained no useable data")
+    if data.shape[1] <= max(columns):
+        raise ValueError("File Has "+str(data.shape[1])+" Columns, Needs "
+                         +str(max(columns)+1))
+
+    #Keep the Array Unchanged (and Memory-Mapped) if Already in Order
+    if tuple(columns) == tuple(range(data.shape[1])):
+        return data
+    return np.ascontiguousarray(data[:,list(columns)], dtype=float)
+
+#Fits and Plots of a Dataset are Memoised per (Dataset, Model) Pair, Keeping
+#the Last datasetMemoEntries Results
+datasetMemoEntries = 16
+
+class Dataset():
+    """
+    Columnar Form of a Data Array (x, y, y_err Columns), Built Once When the
+        Data is Loaded and Shared by Every Fit, Chi-Squared and Plot
+    Rows With a NaN or Infinite Value, or Zero y_err, are Masked Out Once
+        Here (Counted in nMasked), and x, y, y_err and the Weights (1/y_err)
+        are Kept as Contiguous Arrays of dtype (float32 Halves Their Memory)
+    Data With More Than streamingPoints Rows is Left as it Was Given (e.g.
+        Memory-Mapped) in rows, and is Read a Chunk at a Time by iterChunks
+        Unless inMemory is Called
+    """
+    def __init__(self, data, dtype=float, streamed=None):
+        """
+        data is a 2D Array With x, y and y_err as its First Three Columns
+        streamed Keeps the Rows Unread if True, Reads Them Into Columns if
+            False, and Decides by Size if None
+        """
+        data = data if isinstance(data, np.ndarray) else np.asarray(data)
+        if data.ndim != 2 or data.shape[1] < 3:
+            raise ValueError("Data Needs x, y and y_err Columns")
+        if streamed is None:
+            streamed = len(data) > streamingPoints
+
+        self.dtype = np.dtype(dtype)
+        self.hashKey = None
+        self.sortOrder = None
+        if streamed:
+            self.rows = data
+            self.x = self.y = self.err = self.weights = None
+            self.nPoints = None     #Counted When First Needed
+            self.nMasked = None
+        else:
+            self.rows = None
+            self.x, self.y, self.err, self.weights = maskColumns(
+                data[:,0], data[:,1], data[:,2], self.dtype)
+            self.nPoints = len(self.x)
+            self.nMasked = len(data)-self.nPoints
+            if self.nPoints <= 1:
+                raise ValueError("File contained no useable data")
+
+    @classmethod
+    def fromColumns(cls, x, y, y_err, weights=None):
+        """
+        Builds a Dataset Straight From Columns Which are Already Masked, Such
+            as Those of Another Dataset, Without Copying or Checking Them
+        """
+        dataset = cls.__new__(cls)
+        dataset.dtype = x.dtype
+        dataset.hashKey = None
+        dataset.sortOrder = None
+        dataset.rows = None
+        dataset.x = x
+        dataset.y = y
+        dataset.err = y_err
+        dataset.weights = 1.0/y_err if weights is None else weights
+        dataset.nPoints = len(x)
+        dataset.nMasked = 0
+        return dataset
+
+    def __len__(self):
+        if self.nPoints is None:
+            self.nPoints = sum(len(x) for x, y, y_err, weights
+                               in iterChunks(self))
+            self.nMasked = len(self.rows)-self.nPoints
+        return self.nPoints
+
+    def __str__(self):
+        if self.rows is not None:
+            return str(self.rows)
+        if len(self) <= 6:
+            return str(np.column_stack((self.x, self.y, self.err)))
+
+        #Show the First and Last Rows Only, as NumPy Does for Large Arrays
+        ends = np.r_[0:3, len(self)-3:len(self)]
+        lines = str(np.column_stack((self.x[ends], self.y[ends],
+                                     self.err[ends]))).split("\n")
+        return "\n".join(lines[:3]+[" ..."]+lines[3:])
+
+    def inMemory(self):
+        """
+        Returns This Dataset if its Columns are in Memory, Otherwise Reads
+            Every Chunk of its Rows Into a New Dataset
+        """
+        if self.rows is None:
+            return self
+        chunks = list(iterChunks(self))
+        dataset = Dataset.fromColumns(*[np.concatenate(column)
+                                        for column in zip(*chunks)])
+        dataset.nMasked = len(self.rows)-len(dataset)
+        dataset.hashKey = self.hashKey
+        return dataset
+
+    def subset(self, rows):
+        """
+        Returns a Dataset of Only Some Rows (a Slice or Index Array)
+        """
+        if self.rows is not None:
+            return Dataset(self.rows[rows], self.dtype, streamed=False)
+        return Dataset.fromColumns(self.x[rows], self.y[rows], self.err[rows],
+                                   self.weights[rows])
+
+    def order(self):
+        """
+        Returns the Indices Which Sort the x Column, Found Once
+        """
+        if self.sortOrder is None:
+            self.sortOrder = np.argsort(self.inMemory().x, kind="stable")
+        return self.sortOrder
+
+    def key(self):
+        """
+        Returns a Hash of the Dataset's Contents, so Equal Data Loaded Twice
+            Shares its Memoised Results
+        """
+        if self.hashKey is None:
+            digest = hashlib.sha1(str(self.dtype).encode())
+            for x, y, y_err, weights in iterChunks(self):
+                for column in (x, y, y_err):
+                    digest.update(np.ascontiguousarray(column).data)
+            self.hashKey = digest.hexdigest()
+        return self.hashKey
+
+    def memoize(self, model, key, compute):
+        """
+        Returns compute() the First Time it is Called for This Dataset's
+            Contents, model and key, and the Remembered Result After That
+        """
+        memoKey = (self.key(), model, key)
+        with datasetMemoLock:
+            if memoKey in datasetMemo:
+                datasetMemo.move_to_end(memoKey)
+                return datasetMemo[memoKey]
+
+        #Compute Without the Lock, so Other Threads are Not Held Up
+        value = compute()
+        with datasetMemoLock:
+            datasetMemo[memoKey] = value
+            while len(datasetMemo) > datasetMemoEntries:
+                datasetMemo.popitem(last=False)
+        return value
+
+#Memoised Results Shared by Every Dataset (See Dataset.memoize)
+datasetMemo = OrderedDict()
+datasetMemoLock = threading.Lock()
+
+def maskColumns(x, y, y_err, dtype=float):
+    """
+    Returns Contiguous x, y, y_err and Weight (1/y_err) Columns of dtype,
+        Without the Rows Which Have a NaN or Infinite Value or Zero y_err
+    y_err is Made Positive, as Only its Size Matters
+    """
+    x = np.asarray(x, dtype=dtype)
+    y = np.asarray(y, dtype=dtype)
+    y_err = np.abs(np.asarray(y_err, dtype=dtype))
+    with np.errstate(divide="ignore"):
+        weights = 1.0/y_err
+
+    keep = (np.isfinite(x) & np.isfinite(y) & np.isfinite(y_err)
+            & np.isfinite(weights))
+    if not np.all(keep):
+        x, y, y_err, weights = x[keep], y[keep], y_err[keep], weights[keep]
+    return (np.ascontiguousarray(x), np.ascontiguousarray(y),
+            np.ascontiguousarray(y_err), np.ascontiguousarray(weights))
+
+def asDataset(data, inMemory=True):
+    """
+    Returns data as a Dataset, Building One if Given a Data Array
+    With inMemory the Dataset's Columns are Read Into Memory, Otherwise
+        Large Data is Left to be Read a Chunk at a Time
+    """
+    if not isinstance(data, Dataset):
+        return Dataset(data, streamed=False if inMemory else None)
+    return data.inMemory() if inMemory else data
+
+#Watched Files are Refit Every watchSeconds by Default, and Their Rows are
+#Kept in Buffers of at Least tailCapacity Rows
+watchSeconds = 2.0
+tailCapacity = 1024
+
+class DataTail():
+    """
+    Follows a Text Data File (.csv or .txt) That Rows are Being Appended To,
+        Reading and Parsing Only the Rows Added Since it Was Last Read
+    Keeps Every Row Read (an Expanding Window), or if window is Given Only
+        the Last window Rows (a Rolling Window), in Columns Masked as by
+        Dataset (See maskColumns)
+    A Partly Written Last Line is Left Until it is Complete, and if the File
+        Shrinks (e.g. is Rewritten) it is Read Again From the Start
+    """
+    def __init__(self, fileName, delim=None, window=None, dtype=float):
+        if delim is None:
+            delim = delimiterFromName(fileName)
+        if delim == "":
+            raise ValueError("Only .csv and .txt Files Can be Watched")
+        self.fileName = fileName
+        self.delim = delim
+        self.window = window
+        self.dtype = np.dtype(dtype)
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets Every Row Read, so the File is Read Again From the Start
+        """
+        self.offset = 0         #Bytes of the File Read So Far
+        self.start = 0          #Rows start:stop of the Buffers are Kept
+        self.stop = 0
+        self.nRows = 0          #Rows Read Since the Last Reset
+        self.nMasked = 0
+        self.columns = [np.empty(tailCapacity, self.dtype) for i in range(4)]
+        self.generation = os.urandom(8).hex()   #Changes on Every Reset
+
+    def __len__(self):
+        return self.stop-self.start
+
+    def read(self):
+        """
+        Reads and Parses the Complete Lines Appended Since the Last Read, a
+            Block of textBlockSize Bytes at a Time
+        Returns the Number of Rows Added (Not Counting Masked Rows), After
+            Which They are the Last Rows of dataset()
+        """
+        size = os.path.getsize(self.fileName)
+        if size < self.offset:
+            self.reset()
+
+        added = 0
+        with open(self.fileName, "rb") as dataFile:
+            while self.offset < size:
+                dataFile.seek(self.offset)
+                text = dataFile.read(min(textBlockSize, size-self.offset))
+                complete = text.rfind(b"\n")+1
+                if complete == 0:
+                    break       #The Last Line is Still Being Written
+                #Move Past the Lines First, so Lines Which Cannot be Used are
+                #Never Read Again
+                self.offset += complete
+                added += self.append(text[:complete])
+        return added
+
+    def append(self, text):
+        """
+        Parses Complete Lines of Text and Appends Their Rows to the Buffers,
+            Dropping the Oldest Rows if Beyond the Window
+        Lines With Fewer Than 3 Fields are Skipped, and Counted as Masked
+        Returns the Number of Rows Added
+        """
+        data = parseBytes(text, self.delim)
+        if data is not None and data.shape[1] < 3:
+            self.nMasked += len(data)
+            return 0
+        if data is None:
+            #Irregular (or Only Comments), Parse it Line by Line, Using the
+            #First 3 Fields and Skipping Lines With Fewer
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                data = np.genfromtxt(io.BytesIO(text), comments='%',
+                                     delimiter=self.delim, ndmin=2,
+                                     invalid_raise=False, usecols=(0,1,2))
+            nLines = sum(1 for line in text.split(b"\n")
+                         if line.split(b"%")[0].strip())
+            data = data.reshape(-1, 3)
+            self.nMasked += nLines-len(data)
+            if data.size == 0:
+                return 0
+        columns = maskColumns(data[:,0], data[:,1], data[:,2], self.dtype)
+        nAdded = len(columns[0])
+        self.nMasked += len(data)-nAdded
+
+        #Out of Room, Copy the Kept Rows to New Buffers With Room to Grow
+        #(Datasets Already Made Still Hold the Old Buffers, Unchanged)
+        if self.stop+nAdded > len(self.columns[0]):
+            nKept = self.stop-self.start
+            capacity = max(2*(nKept+nAdded), tailCapacity)
+            buffers = [np.empty(capacity, self.dtype) for i in range(4)]
+            for buffer, column in zip(buffers, self.columns):
+                buffer[:nKept] = column[self.start:self.stop]
+            self.columns = buffers
+            self.start, self.stop = 0, nKept
+
+        for buffer, column in zip(self.columns, columns):
+            buffer[self.stop:self.stop+nAdded] = column
+        self.stop += nAdded
+        self.nRows += nAdded
+        if self.window is not None:
+            self.start = max(self.start, self.stop-self.window)
+        return nAdded
+
+    def latest(self, nRows):
+        """
+        Returns the x, y, y_err and Weight Columns of the Last nRows Rows
+        """
+        return tuple(column[self.stop-nRows:self.stop]
+                     for column in self.columns)
+
+    def dataset(self):
+        """
+        Returns the Rows in the Window as a Dataset, Sharing the Buffers
+        Its Key (See Dataset.key) Comes From Which Rows it Holds Rather
+            Than Hashing Them, as Rows are Never Changed Once Read
+        """
+        if len(self) <= 1:
+            raise ValueError("File contained no useable data")
+        dataset = Dataset.fromColumns(*[column[self.start:self.stop]
+                                        for column in self.columns])
+        dataset.nMasked = self.nMasked
+        dataset.hashKey = (self.generation+":"+str(self.nRows-len(self))+":"
+                           +str(self.nRows))
+        return dataset
+
+class LiveFit():
+    """
+    Refits a CompiledModel to a DataTail Each Time Rows are Appended,
+        Starting Each Fit From the Previous Best Fit Parameters
+    Models Which are Linear in Their Fit Parameters Fit to Every Row (an
+        Expanding Window) are Instead Updated Directly From Only the New
+        Rows, by Adding Them to a QR Factorisation of the Weighted Design
+        Matrix, so a Refit Costs the Same However Long the File Gets
+    """
+    def __init__(self, model, tail, initialGuesses, ftol=0.00000001,
+                 bounds=None):
+        """
+        bounds, if Given, are Searched for the First Fit (See multiStartFit)
+        """
+        self.model = model
+        self.tail = tail
+        self.params = list(initialGuesses)
+        self.ftol = ftol
+        self.bounds = bounds
+        self.result = None
+        self.factor = None      #R, Q^T y, Chi-Squared and Generation
+        self.seconds = 0.0      #Time Taken by the Last Refit
+
+    def update(self, monitor=None):
+        """
+        Reads Any New Rows and Refits if There are Any
+        An Optional FitMonitor is Kept Updated and Can Cancel the Fit
+        Returns the FitResult, or None if No Rows Were Added
+        """
+        start = time.perf_counter()
+        added = self.tail.read()
+        if added == 0 and self.result is not None:
+            return None
+
+        data = self.tail.dataset()
+        if self.model.isLinear and self.tail.window is None:
+            result = self.updateLinear(added)
+        elif self.result is None and self.bounds is not None:
+            result = multiStartFit(self.model, data, self.bounds, self.params,
+                                   self.ftol, monitor=monitor)
+        else:
+            result = performFit(self.model, data, self.params, self.ftol,
+                                monitor=monitor)
+
+        self.params = list(result.params)
+        self.result = result
+        self.seconds = time.perf_counter()-start
+        return result
+
+    def updateLinear(self, added):
+        """
+        Adds the Last added Rows of the Tail to the QR Factorisation, Then
+            Solves it as linearFit Does
+        Returns a FitResult
+        """
+        nParams = len(self.model.fitSymbols)
+        if self.factor is None or self.factor[3] != self.tail.generation:
+            #Start Again (the File Was Rewritten) With Every Row
+            self.factor = (np.zeros((nParams, nParams)), np.zeros(nParams),
+                           0.0, self.tail.generation)
+            added = len(self.tail)
+        r, qty, chiSqrd, generation = self.factor
+
+        #Factorise [R Q^T y] With the New Rows' Weighted [Design y] Below it:
+        #the New R and Q^T y Come From its R, and its Last Diagonal Element
+        #is the New Rows' Contribution to the Chi-Squared
+        x, y, y_err, weights = self.tail.latest(added)
+        design, offset = self.model.designMatrix(x)
+        stacked = np.vstack((np.column_stack((r, qty)),
+                             np.column_stack((design*weights[:,None],
+                                              (y-offset)*weights))))
+        factor = np.zeros((nParams+1, nParams+1))
+        upper = np.linalg.qr(stacked, mode="r")
+        factor[:len(upper)] = upper
+        r, qty = factor[:nParams,:nParams], factor[:nParams,nParams]
+        chiSqrd = chiSqrd+factor[nParams,nParams]**2
+        self.factor = (r, qty, chiSqrd, generation)
+
+        #Solve Using the SVD of R, Ignoring Singular Values Which are Zero to
+        #Machine Precision
+        u, s, vt = np.linalg.svd(r)
+        cutoff = np.finfo(float).eps*max(len(self.tail), nParams)*s[0]
+        inverseS = np.where(s > cutoff, 1.0/np.where(s > cutoff, s, 1.0), 0.0)
+        fitResults = vt.T @ (inverseS*(u.T @ qty))
+        cov, rank, condition = singularCovariance(s, vt, len(self.tail))
+
+        #Any Part of Q^T y Which R Cannot Reach Adds to the Chi-Squared
+        chiSqrd = chiSqrd+np.sum((r @ fitResults-qty)**2)
+
+        return makeFitResult(fitResults, cov, chiSqrd, len(self.tail), 1, 1,
+                             "linear", message="Updated Directly From the"
+                             " New Rows (Linear in the Fit Parameters)",
+                             rank=rank, condition=condition)
+
+def cacheDirectory(kind):
+    """
+    Returns (and Creates) the Directory Caches of a Given Kind are Kept In
+    Set the GENERALLSFR_CACHE Environment Variable to Move the Cache
+    """
+    root = os.environ.get("GENERALLSFR_CACHE",
+                          os.path.join(os.path.expanduser("~"), ".cache",
+                                       "GeneralLSFR"))
+    directory = os.path.join(root, kind)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+#The Most Disk Space the Data Cache May Use Before the Least Recently Used
+#Binary Copies are Evicted
+dataCacheBytes = 1024*1024*1024
+
+def dataCacheName(fileName, delim):
+    """
+    Returns the Name of the Binary Cache for a Text Data File, Which Changes
+        Whenever the File's Path, Size, Modification Time or Delimiter Do
+    The Name Starts With a Hash of the Path Alone, so Older Copies of the
+        Same File Can be Found and Deleted (See evictDataCache)
+    """
+    fileName = os.path.abspath(fileName)
+    stat = os.stat(fileName)
+    key = "|".join([fileName, str(stat.st_size), str(stat.st_mtime_ns),
+                    repr(delim)])
+    return os.path.join(cacheDirectory("data"),
+                        hashlib.sha1(fileName.encode()).hexdigest()[:16]+"-"
+                        +hashlib.sha1(key.encode()).hexdigest()+".npy")
+
+def saveDataCache(data, cacheName):
+    """
+    Saves a Parsed Data Array as a .npy Cache, Ignoring Any Failure to Write
+    """
+    try:
+        #Write to a Temporary File First so a Partial Cache is Never Read
+        temporaryName = cacheName+"."+str(os.getpid())+".tmp"
+        with open(temporaryName, "wb") as cacheFile:
+            np.save(cacheFile, np.ascontiguousarray(data, dtype=float))
+        os.replace(temporaryName, cacheName)
+    except OSError:
+        return
+    evictDataCache(cacheName)
+
+def evictDataCache(cacheName, maxBytes=None):
+    """
+    Deletes the Older Binary Copies of the File cacheName Was Just Written
+        For, Then the Least Recently Used Copies of Other Files Until the Data
+        Cache Holds No More Than maxBytes (dataCacheBytes if Not Given)
+    cacheName Itself is Always Kept
+    """
+    if maxBytes is None:
+        maxBytes = dataCacheBytes
+    prefix = os.path.basename(cacheName).split("-")[0]+"-"
+
+    files = []
+    for fileName in glob.glob(os.path.join(os.path.dirname(cacheName),
+                                           "*.npy")):
+        if fileName == cacheName:
+            continue
+        try:
+            if os.path.basename(fileName).startswith(prefix):
+                os.remove(fileName)     #Stale Copy of the Same File
+                continue
+            stat = os.stat(fileName)
+        except OSError:
+            continue    #Evicted by Another Process
+        files.append((stat.st_mtime, stat.st_size, fileName))
+
+    try:
+        total = os.path.getsize(cacheName)
+    except OSError:
+        total = 0
+    total = total+sum(size for mtime, size, fileName in files)
+    for mtime, size, fileName in sorted(files):
+        if total <= maxBytes:
+            break
+        try:
+            os.remove(fileName)
+        except OSError:
+            pass
+        total = total-size
+
+#The Session (Equation, Parameters, Labels, Data File and Last Fit) is Saved
+#as sessionName in the Cache Directory After Every Fit and When the Window
+#Closes, and Restored When the Program Starts
+sessionName = "last.json"
+
+#Changed Whenever the Session Format Changes, so Old Sessions are Ignored
+sessionVersion = 1
+
+#FitResult Attributes Saved in a Session's JSON (Besides params and cov)
+sessionFields = ["chiSqrd", "redChiSqrd", "nfev", "njev", "method",
+                 "converged", "iterations", "message", "rank", "condition"]
+
+def lastSessionName():
+    """
+    Returns the Name of the Session Saved Automatically (See sessionName)
+    """
+    return os.path.join(cacheDirectory("sessions"), sessionName)
+
+def dataReference(fileName, delim, data):
+    """
+    Returns What a Session Keeps to Find its Dataset Again: the Data File's
+        Path and Delimiter, the Name of its Binary Cache (Which Changes
+        Whenever the File Does) and the Hash of the Dataset's Contents
+    """
+    fileName = os.path.abspath(fileName)
+    return {"file":fileName, "delim":delim,
+            "cache":dataCacheName(fileName, delim), "key":data.key()}
+
+def sessionDataset(reference):
+    """
+    Loads the Dataset a Session Refers To (See dataReference) Through the
+        Binary Cache, so the Data File is Only Parsed Again if it Changed,
+        or From the Cached Copy Alone if the File Has Since Been Deleted
+    The Content Hash is Taken From the Session Unless the File Changed
+    Returns the Dataset, or None if Neither Can be Read
+    """
+    fileName = reference["file"]
+    if os.path.exists(fileName):
+        data = Dataset(loadData(fileName, reference["delim"]))
+        if dataCacheName(fileName, reference["delim"]) == reference["cache"]:
+            data.hashKey = reference["key"]
+        return data
+    if os.path.exists(reference["cache"]):
+        data = Dataset(selectColumns(np.load(reference["cache"],
+                                             mmap_mode="r")))
+        data.hashKey = reference["key"]
+        return data
+    return None
+
+def sessionHash(key, data, initialGuesses, bounds, ftol):
+    """
+    Returns a Hash of Everything a Fit Depends On: the Compiled Model's Cache
+        key (See modelKey), the Dataset's Contents, the Initial Guesses, the
+        Search bounds and the Tolerance, so a Saved Fit is Only Reused if
+        None of Them Have Changed
+    """
+    if bounds is not None:
+        bounds = [[float(low), float(high)] for low, high in bounds]
+    inputs = [key, data.key(), [float(guess) for guess in initialGuesses],
+              bounds, float(ftol)]
+    return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
+
+def saveSession(fileName, session, result=None):
+    """
+    Writes a Session Dict (See Gui.sessionState) as JSON, Adding the Last
+        FitResult's Parameters, Covariance and sessionFields if Given
+    The Result's Model Values at the Data are Written Beside it as a .npz
+        File, so the Fit Can be Plotted Again Without Evaluating the Model
+    Each File is Written to a Temporary File First, so a Partially Written
+        Session is Never Read
+    """
+    session = dict(session, version=sessionVersion)
+    if result is not None:
+        fit = dict(session.get("fit") or {})
+        fit["params"] = [float(p) for p in result.params]
+        fit["cov"] = np.asarray(result.cov, dtype=float).tolist()
+        for field in sessionFields:
+            value = getattr(result, field)
+            if isinstance(value, np.generic):
+                value = value.item()    #JSON Only Takes Python Numbers
+            fit[field] = value
+        session["fit"] = fit
+
+        if result.values is not None:
+            arraysName = os.path.splitext(fileName)[0]+".npz"
+            temporaryName = arraysName+"."+str(os.getpid())+".tmp"
+            with open(temporaryName, "wb") as arraysFile:
+                np.savez(arraysFile, params=fit["params"],
+                         values=result.values)
+            os.replace(temporaryName, arraysName)
+
+    temporaryName = fileName+"."+str(os.getpid())+".tmp"
+    with open(temporaryName, "w") as sessionFile:
+        json.dump(session, sessionFile, indent=1)
+    os.replace(temporaryName, fileName)
+
+def loadSession(fileName):
+    """
+    Reads a Session Written by saveSession
+    Returns the Session Dict and its FitResult, or None if it Has no Fit
+    The FitResult's values are None if the .npz File Beside the Session is
+        Missing or Was Written With a Different Fit
+    """
+    with open(fileName) as sessionFile:
+        session = json.load(sessionFile)
+    if session.get("version") != sessionVersion:
+        raise ValueError("Session Was Saved by a Different Version")
+
+    fit = session.get("fit")
+    if fit is None or "params" not in fit:
+        return session, None
+
+    values = None
+    try:
+        with np.load(os.path.splitext(fileName)[0]+".npz") as arrays:
+            if np.array_equal(arrays["params"], fit["params"]):
+                values = arrays["values"]
+    except (OSError, KeyError, ValueError):
+        pass    #Plotting Will Evaluate the Model Instead
+
+    result = FitResult(np.array(fit["params"]), np.array(fit["cov"]),
+                       *[fit[field] for field in sessionFields],
+                       values=values)
+    return session, result
+
+#Number of Compiled Models Kept in Memory, and the Most Disk Space the Model
+#Cache May Use Before the Least Recently Used Models are Evicted
+modelCacheEntries = 64
+modelCacheBytes = 32*1024*1024
+
+#Changed Whenever the Recipe Format Changes, so Old Cache Files are Ignored
+modelCacheVersion = 4
+
+class ModelCache():
+    """
+    Cache of Compiled Models Keyed by modelKey, so an Equation is Only Solved
+        and Compiled the First Time it is Used With a Given Set of Constants
+    Keeps the Most Recently Used Models in Memory and Saves Each Model's
+        Recipe to the "models" Cache Directory, so Later Sessions Rebuild it
+        Without SymPy
+    Solved Equations are Cached Too, so Changing a Constant Does Not Solve
+        the Equation Again
+    Safe to Use From Several Threads at Once
+    """
+    def __init__(self, maxEntries=modelCacheEntries, maxBytes=modelCacheBytes):
+        """
+        maxEntries is the Number of Models (and Solved Equations) Kept in
+            Memory, maxBytes the Size the Cache Directory is Kept Under
+        """
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.models = OrderedDict()
+        self.solutions = OrderedDict()
+        self.lock = threading.Lock()
+
+        #Statistics Shown by report
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+    def get(self, string, fitNames, constants):
+        """
+        Returns the Compiled Model of an Equation String With the Constants
+            Substituted, Taken From Memory, Then Disk, Then Compiled
+        fitNames is a List of the Fit Parameter Names (e.g. ["f1","f2"])
+        constants is a Dict of Constant Names and Values (e.g. {"k1":2.0})
+        """
+        key = modelKey(string, fitNames, constants)
+        with profileStage("cache"):
+            model = self.lookup(key)
+        if model is not None:
+            return model
+
+        with profileStage("solve"):
+            equation = self.solve(string)
+
+            #Sub Each Constant Into Equation
+            for kkey, value in constants.items():
+                equation = equation.subs(sympy.symbols(kkey), float(value))
+
+        with profileStage("compile"):
+            model = CompiledModel(equation, [sympy.symbols(fkey)
+                                             for fkey in fitNames])
+        with self.lock:
+            self.misses += 1
+            self.remember(self.models, key, model)
+        self.save(key, model.recipe)
+        return model
+
+    def lookup(self, key):
+        """
+        Returns the Model Cached Under key, or None if There is None
+        """
+        with self.lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                self.hits += 1
+                return self.models[key]
+
+        recipe = self.read(key)
+        if recipe is None:
+            return None
+        try:
+            model = CompiledModel.fromRecipe(recipe)
+        except:
+            #Unreadable Recipe, e.g. Generated by Another Version of SciPy
+            self.discard(key)
+            return None
+
+        with self.lock:
+            self.hits += 1
+            self.diskHits += 1
+            self.remember(self.models, key, model)
+        return model
+
+    def solve(self, string):
+        """
+        Returns getEquation(string)[0], Only Solving Equations Not Seen Before
+        """
+        key = "solved-"+hashlib.sha1(json.dumps(
+            [modelCacheVersion, canonicalEquation(string)]).encode()).hexdigest()
+        with self.lock:
+            if key in self.solutions:
+                self.solutions.move_to_end(key)
+                return self.solutions[key]
+
+        equation = None
+        recipe = self.read(key)
+        if recipe is not None:
+            try:
+                equation = sympy.sympify(recipe["expression"])
+            except:
+                self.discard(key)
+        if equation is None:
+            equation = getEquation(string)[0]   #Get Equation
+            self.save(key, {"expression":sympy.srepr(equation)})
+
+        with self.lock:
+            self.remember(self.solutions, key, equation)
+        return equation
+
+    def remember(self, store, key, value):
+        """
+        Adds a Value to an In-Memory Store, Dropping the Least Recently Used
+            Values Once it Holds More Than maxEntries (Call With lock Held)
+        """
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self.maxEntries:
+            store.popitem(last=False)
+
+    def fileName(self, key):
+        """
+        Returns the Name of the File a Key's Recipe is Saved in
+        """
+        return os.path.join(cacheDirectory("models"), key+".json")
+
+    def read(self, key):
+        """
+        Returns the Recipe Saved Under key, or None if it Cannot be Read
+        """
+        try:
+            fileName = self.fileName(key)
+            with open(fileName) as cacheFile:
+                recipe = json.load(cacheFile)
+
+            #Mark as Recently Used, so it is Evicted Last
+            os.utime(fileName)
+        except (OSError, ValueError):
+            return None
+        return recipe
+
+    def save(self, key, recipe):
+        """
+        Saves a Recipe Under key, Then Evicts the Least Recently Used Files
+            Until the Cache Fits in maxBytes, Ignoring Any Failure to Write
+        """
+        try:
+            #Write to a Temporary File First so a Partial Recipe is Never Read
+            fileName = self.fileName(key)
+            temporaryName = (fileName+"."+str(os.getpid())+"."
+                             +str(threading.get_ident())+".tmp")
+            with open(temporaryName, "w") as cacheFile:
+                json.dump(recipe, cacheFile)
+            os.replace(temporaryName, fileName)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self):
+        """
+        Deletes the Least Recently Used Recipes Until the Cache Directory
+            Holds No More Than maxBytes
+        """
+        files = []
+        for fileName in glob.glob(os.path.join(cacheDirectory("models"),
+                                               "*.json")):
+            try:
+                stat = os.stat(fileName)
+            except OSError:
+                continue    #Evicted by Another Process
+            files.append((stat.st_mtime, stat.st_size, fileName))
+
+        total = sum(size for mtime, size, fileName in files)
+        for mtime, size, fileName in sorted(files):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(fileName)
+            except OSError:
+                pass
+            total = total-size
+
+    def discard(self, key):
+        """
+        Deletes the Recipe Saved Under key, if There is One
+        """
+        try:
+            os.remove(self.fileName(key))
+        except OSError:
+            pass
+
+    def report(self):
+        """
+        Returns a One Line Summary of the Cache's Hits and Misses
+        """
+        return ("Model Cache: "+str(self.hits)+" Hits ("+str(self.diskHits)
+                +" From Disk), "+str(self.misses)+" Misses")
+
+#Model Cache Shared by the GUI and Batch Fits
+modelCache = ModelCache()
+
+def paramNames(string):
+    """
+    Returns the Names of the Fitting Parameters (f#) and the Constants (k#)
+        in an Equation String, in the Order They First Appear
+    """
+    fArray = re.findall(r'\bf\d+\b', string)#Instances of f Followed by int
+    kArray = re.findall(r'\bk\d+\b', string)#Instances of k Followed by int
+
+    return list(dict.fromkeys(fArray)), list(dict.fromkeys(kArray))
+
+def compileEquation(string, fitNames, constants):
+    """
+    Solves an Equation String for y, Substitutes in the Constants and
+        Compiles it Into a CompiledModel, or Takes the Model From the Model
+        Cache if it Has Been Compiled Before
+    fitNames is a List of the Fit Parameter Names (e.g. ["f1","f2"])
+    constants is a Dict of Constant Names and Values (e.g. {"k1":2.0})
+    """
+    return modelCache.get(string, fitNames, constants)
+
+def canonicalEquation(string):
+    """
+    Returns an Equation String in the Form it is Cached Under: Without
+        Whitespace and With ^ Written as ** (as sympify Reads it)
+    """
+    return "".join(string.split()).replace("^", "**")
+
+def modelKey(string, fitNames, constants):
+    """
+    Returns the Key a Compiled Model is Cached Under: a Hash of the Canonical
+        Equation String, the Fit Parameter Names in Order and the Constants'
+        Names and Values
+    """
+    canonical = [modelCacheVersion, canonicalEquation(string), list(fitNames),
+                 sorted([kkey, repr(float(value))] for kkey, value in
+                        constants.items())]
+    return hashlib.sha1(json.dumps(canonical).encode()).hexdigest()
+
+#Model Compiled Once in Each Batch Worker Process by initBatchWorker
+batchModel = None
+
+def initBatchWorker(string, fitNames, constants, backend="auto"):
+    """
+    Compiles the Batch's Model Once per Worker Process
+    Workers Forked From the Parent Inherit its Model and Skip This
+    """
+    global batchModel
+
+    key = modelKey(string, fitNames, constants)
+    if batchModel is None or batchModel[0] != key:
+        batchModel = (key, compileEquation(string, fitNames, constants))
+    batchModel[1].backend = backend
+
+def fitFile(fileName, initialGuesses, ftol, chunkSize=None, bounds=None,
+            resample=None, nResamples=None, dtype=float, profiled=False,
+            processes=1):
+    """
+    Loads and Fits a Single Data File With the Worker's Model, its Columns
+        Kept as dtype (See Dataset)
+    Resampling Refits Across processes Worker Processes (See resampleFit)
+    Any Error is Captured in the Returned Row Rather Than Raised, so One Bad
+        File Does Not Stop the Batch
+    If profiled is True the Row's "profile" is the Fit's FitProfile as a Dict
+    Returns a Dict Holding One Row of the Results Table
+    """
+    if not profiled:
+        return fitFileRow(fileName, initialGuesses, ftol, chunkSize, bounds,
+                          resample, nResamples, dtype, processes)
+
+    profile = FitProfile()
+    with profile.activate():
+        row = fitFileRow(fileName, initialGuesses, ftol, chunkSize, bounds,
+                         resample, nResamples, dtype, processes, profile)
+    row["profile"] = profile.toDict()
+    return row
+
+def fitFileRow(fileName, initialGuesses, ftol, chunkSize, bounds, resample,
+               nResamples, dtype, processes, profile=None):
+    """
+    Does the Work of fitFile, Recording the Fit in profile if Given
+    """
+    row = {"file":fileName, "status":"ok", "message":""}
+    try:
+        with profileStage("load"):
+            #Each File is Loaded Once, so a Binary Copy Would Never be Read
+            data = Dataset(loadData(fileName, useCache=False), dtype)
+        row["points"] = len(data)
+        row["masked"] = data.nMasked
+
+        model = batchModel[1]
+        with profileStage("fit"):
+            if bounds is None:
+                result = performFit(model, data, initialGuesses, ftol,
+                                    chunkSize)
+            else:
+                result = multiStartFit(model, data, bounds, initialGuesses,
+                                       ftol)
+        if profile is not None:
+            profile.record(result)
+
+        #Add the Parameters and Their Uncertainties to the Row
+        row["redChiSqrd"] = result.redChiSqrd
+        row["method"] = result.method
+        row["rank"] = result.rank
+        row["condition"] = result.condition
+        for f, value, uncert in zip(model.fitSymbols, result.params,
+                                    result.uncertainties()):
+            row[str(f)] = value
+            row[str(f)+"_err"] = uncert
+
+        #Add Each Parameter's Resampled Interval
+        if resample is not None:
+            with profileStage("resample"):
+                resampling = resampleFit(model, data, result, nResamples,
+                                         resample, processes=processes,
+                                         ftol=ftol)
+            for f, (low, high) in zip(model.fitSymbols, resampling.intervals):
+                row[str(f)+"_low"] = low
+                row[str(f)+"_high"] = high
+    except Exception as error:
+        row["status"] = "error"
+        row["message"] = str(error)
+
+    return row
+
+def batchFit(string, constants, guesses, pattern, outputFile=None,
+             processes=None, ftol=0.00000001, verbose=True, chunkSize=None,
+             backend="auto", resample=None, nResamples=None, dtype=float,
+             profileFile=None):
+    """
+    Fits an Equation to Every Data File Matching a Glob Pattern in Parallel
+        Across a Process Pool, Without the Graphical User Interface
+    constants and guesses are Dicts of Constant Values and Initial Guesses
+        Keyed by Name (Unset Guesses Default to 0.0, as in the GUI), a
+        (low, high) Guess Searching That Range With multiStartFit
+    processes is the Number of Worker Processes (Default: Every Core), Which
+        Fit a File Each, or if There is Only One File Share its Resampling
+    chunkSize Fits Files With More Rows Than it in Chunks (See performFit)
+    backend Sets How the Model is Evaluated (See CompiledModel)
+    resample ("bootstrap" or "montecarlo") Adds Each Parameter's Interval
+        From nResamples Resamples to the Results (See resampleFit)
+    dtype is the Type Each File's Columns are Kept as (float or np.float32)
+    Writes One Results Table (.csv) to outputFile if Given, and Each File's
+        FitProfile as a JSON Line to profileFile if Given
+    Returns a List of Dicts, One Row per File
+    """
+    fileNames = sorted(glob.glob(pattern))
+    fitNames, constNames = paramNames(string)
+
+    #Check the Equation Can be Fit Before Starting Any Workers
+    if fitNames == []:
+        raise ValueError("No Fitting Parameters in Equation")
+    missing = [kkey for kkey in constNames if kkey not in constants]
+    if missing != []:
+        raise ValueError("No Value Given for Constants: "+", ".join(missing))
+    constants = dict((kkey, float(constants[kkey])) for kkey in constNames)
+    initialGuesses, bounds = searchBounds([guesses.get(fkey, 0.0)
+                                           for fkey in fitNames])
+
+    #Compile Once Here, Forked Workers Then Reuse This Model
+    initBatchWorker(string, fitNames, constants, backend)
+
+    rows = []
+    if processes == 1 or len(fileNames) <= 1:
+        #Run in This Process, Resampling Across the Worker Processes Instead
+        for fileName in fileNames:
+            rows.append(fitFile(fileName, initialGuesses, ftol, chunkSize,
+                                bounds, resample, nResamples, dtype,
+                                profileFile is not None, processes))
+            if verbose:
+                printProgress(rows[-1], len(rows), len(fileNames))
+    else:
+        with processPool(processes, initBatchWorker,
+                         (string, fitNames, constants, backend)) as pool:
+            futures = [pool.submit(fitFile, fileName, initialGuesses, ftol,
+                                   chunkSize, bounds, resample, nResamples,
+                                   dtype, profileFile is not None)
+                       for fileName in fileNames]
+            for future in as_completed(futures):
+                rows.append(future.result())
+                if verbose:
+                    printProgress(rows[-1], len(rows), len(fileNames))
+
+        #Return Rows in File Order Rather Than Completion Order
+        order = dict((fileName, i) for i, fileName in enumerate(fileNames))
+        rows.sort(key=lambda row: order[row["file"]])
+
+    if outputFile is not None:
+        writeResults(rows, fitNames, outputFile)
+    if profileFile is not None:
+        with open(profileFile, "a") as profiles:
+            for row in rows:
+                profile = {"file":row["file"], "status":row["status"]}
+                profile.update(row.get("profile", {}))
+                profiles.write(json.dumps(profile)+"\n")
+    return rows
+
+def printProgress(row, done, total, name="file"):
+    """
+    Prints One Line of Batch Progress, Naming the Row by its name Column
+    """
+    status = row["status"]
+    if row["message"] != "":
+        status = status+" ("+row["message"]+")"
+    print("["+str(done)+"/"+str(total)+"] "+row[name]+": "+status)
+    sys.stdout.flush()
+
+def writeResults(rows, fitNames, outputFile):
+    """
+    Writes Batch Result Rows to a .csv Table With One Column per Parameter
+        and Uncertainty
+    """
+    columns = ["file", "status", "points", "masked", "redChiSqrd", "method",
+               "rank", "condition"]
+    resampled = any(fkey+"_low" in row for row in rows for fkey in fitNames)
+    for fkey in fitNames:
+        columns = columns+[fkey, fkey+"_err"]
+        if resampled:
+            columns = columns+[fkey+"_low", fkey+"_high"]
+    columns.append("message")
+
+    with open(outputFile, "w", newline="") as table:
+        writer = csv.DictWriter(table, fieldnames=columns, restval="",
+                                extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+def parseAssignments(assignments, parse=float):
+    """
+    Converts a List of "name=value" Strings Into a Dict of Floats (or
+        Whatever parse Converts Each Value Into)
+    """
+    values = {}
+    for assignment in assignments:
+        name, value = assignment.split("=", 1)
+        values[name.strip()] = parse(value)
+    return values
+
+def parseGuess(string):
+    """
+    Converts an Initial Guess String Into a Float, or a Search Range String
+        "low:high" Into a (low, high) Tuple
+    """
+    if ":" in string:
+        low, high = string.split(":", 1)
+        return (float(low), float(high))
+    return float(string)
+
+def formatGuess(guess):
+    """
+    Converts an Initial Guess or Search Range Back Into a String
+    """
+    if isinstance(guess, tuple):
+        return str(guess[0])+":"+str(guess[1])
+    return str(guess)
+
+def searchBounds(guesses):
+    """
+    Splits Initial Guesses, Each a Float or a (low, high) Search Range, Into
+        Starting Values (the Middle of Each Range) and the Bounds to Search
+        Within, Where a Float is a Range of Zero Width
+    Returns the Starting Values and the Bounds (None if Nothing is a Range)
+    """
+    if not any(isinstance(guess, tuple) for guess in guesses):
+        return [float(guess) for guess in guesses], None
+
+    bounds = [guess if isinstance(guess, tuple) else (guess, guess)
+              for guess in guesses]
+    return [0.5*(low+high) for low, high in bounds], bounds
+
+#Candidate Equations are Ranked by One of These (See compareModels)
+compareCriteria = ["redChiSqrd", "aic", "bic"]
+
+def equationStructure(string):
+    """
+    Returns an Equation String With its Fit Parameters Renumbered f1, f2, ...
+        in the Order They First Appear, and Those Parameter Names, so
+        Equations Differing Only in Parameter Names and Whitespace Share One
+        Structure (e.g. "f3*x + f7 - y" and "f1*x+f2-y")
+    """
+    fitNames = paramNames(string)[0]
+    renamed = dict((fkey, "f"+str(i+1)) for i, fkey in enumerate(fitNames))
+    structure = re.sub(r'\bf\d+\b', lambda match: renamed[match.group()],
+                       canonicalEquation(string))
+    return structure, [renamed[fkey] for fkey in fitNames]
+
+#Models and Data Kept in Each Comparison Worker Process by initCompareWorker
+compareProblem = None
+
+def initCompareWorker(models, data):
+    """
+    Keeps Every Candidate's Compiled Model and the Data in Each Worker
+        Process, so Each is Sent Once per Worker Rather Than per Fit
+    """
+    global compareProblem
+    compareProblem = (models, data)
+
+def compareWorkerFit(key, initialGuesses, bounds, ftol):
+    """
+    Fits One Candidate in a Comparison Worker Process (See compareFit)
+    """
+    return compareFit(compareProblem[0][key], compareProblem[1],
+                      initialGuesses, bounds, ftol)
+
+def compareFit(model, data, initialGuesses, bounds, ftol, monitor=None):
+    """
+    Fits One Candidate Model, Searching Within bounds First if Given, and
+        Times the Fit
+    Any Error Other Than Cancellation is Returned Rather Than Raised, so
+        One Bad Candidate Does Not Stop the Comparison
+    Returns the FitResult (or the Error Message) and the Seconds Taken
+    """
+    start = time.perf_counter()
+    try:
+        if bounds is None:
+            result = performFit(model, data, initialGuesses, ftol,
+                                monitor=monitor)
+        else:
+            result = multiStartFit(model, data, bounds, initialGuesses, ftol,
+                                   monitor=monitor)
+    except FitCancelled:
+        raise
+    except Exception as error:
+        result = " ".join((str(error) or type(error).__name__).split())
+    return result, time.perf_counter()-start
+
+def compareModels(strings, data, constants=None, guesses=None, processes=None,
+                  ftol=0.00000001, rankBy="aic", progress=None, monitor=None):
+    """
+    Fits Every Candidate Equation String to One Dataset (or Data Array) in
+        Parallel Across a Process Pool, and Ranks Them
+    Candidates With the Same Structure (See equationStructure) are Solved
+        and Compiled Once, in This Process, and Share the Compiled Model
+    constants and guesses are Dicts of Constant Values and Initial Guesses
+        Keyed by Name, Shared by Every Candidate (Unset Guesses Default to
+        0.0), a (low, high) Guess Searching That Range With multiStartFit
+    processes is the Number of Worker Processes (Default: Every Core), 1
+        Fitting in This Process, Where an Optional FitMonitor Can Cancel
+    progress, if Given, is Called as progress(row, done, total) as Each
+        Candidate Finishes
+    Each Fitted Candidate is Scored by its Reduced Chi-Squared, its AIC
+        (Chi-Squared + 2k) and its BIC (Chi-Squared + k ln(n)), for k
+        Parameters Fit to n Points, and Ranked by Each (1 is Best)
+    Returns a List of Dicts, One Row per Candidate, Sorted by the rankBy
+        Criterion With Candidates Which Could Not be Fit Last
+    """
+    if rankBy not in compareCriteria:
+        raise ValueError("Cannot Rank by "+str(rankBy)+", Only by "
+                         +", ".join(compareCriteria))
+    constants = {} if constants is None else constants
+    guesses = {} if guesses is None else guesses
+    data = asDataset(data, inMemory=False)
+
+    #Check and Compile Each Distinct Structure Before Starting Any Workers
+    rows = []
+    models = {}
+    tasks = []
+    for string in strings:
+        row = {"equation":string, "status":"ok", "message":""}
+        rows.append(row)
+        fitNames, constNames = paramNames(string)
+        missing = [kkey for kkey in constNames if kkey not in constants]
+        if fitNames == []:
+            row["status"], row["message"] = "error", "No Fitting Parameters"
+            continue
+        if missing != []:
+            row["status"] = "error"
+            row["message"] = "No Value Given for Constants: "+", ".join(missing)
+            continue
+        used = dict((kkey, float(constants[kkey])) for kkey in constNames)
+        structure, structNames = equationStructure(string)
+        key = modelKey(structure, structNames, used)
+        if key not in models:
+            try:
+                models[key] = compileEquation(structure, structNames, used)
+            except Exception as error:
+                models[key] = "Equation Invalid: "+" ".join(
+                    (str(error) or type(error).__name__).split())
+        if isinstance(models[key], str):
+            row["status"], row["message"] = "error", models[key]
+            continue
+        row["structure"] = structure
+        row["parameters"] = len(fitNames)
+        initialGuesses, bounds = searchBounds([guesses.get(fkey, 0.0)
+                                               for fkey in fitNames])
+        tasks.append((row, key, fitNames, initialGuesses, bounds))
+    models = dict((key, model) for key, model in models.items()
+                  if not isinstance(model, str))
+
+    #Define Nested Function
+    def finish(task, result, seconds):
+        row, key, fitNames = task[:3]
+        row["seconds"] = seconds
+        if isinstance(result, str):
+            row["status"], row["message"] = "error", result
+        else:
+            row["result"] = result
+            row["method"] = result.method
+            row["rank"] = result.rank
+            row["condition"] = result.condition
+            row["chiSqrd"] = result.chiSqrd
+            row["redChiSqrd"] = result.redChiSqrd
+            row["aic"] = result.chiSqrd+2*len(fitNames)
+            row["bic"] = result.chiSqrd+len(fitNames)*np.log(len(data))
+            row["params"] = "; ".join(
+                fkey+"="+("%.6g" % value)+"±"+("%.2g" % uncert)
+                for fkey, value, uncert in zip(fitNames, result.params,
+                                               result.uncertainties()))
+            if not np.isfinite(result.chiSqrd):
+                row["status"] = "error"
+                row["message"] = "Chi-Squared is Not Finite"
+        finish.done += 1
+        if progress is not None:
+            progress(row, finish.done, len(tasks))
+    finish.done = 0
+
+    if processes == 1 or len(tasks) <= 1:
+        #Run in This Process
+        if len(tasks) > 0:
+            data = data.inMemory()
+        for task in tasks:
+            if monitor is not None:
+                monitor.update()
+            finish(task, *compareFit(models[task[1]], data, task[3], task[4],
+                                     ftol, monitor))
+    else:
+        with processPool(processes, initCompareWorker,
+                         (models, data.inMemory())) as pool:
+            futures = dict((pool.submit(compareWorkerFit, task[1], task[3],
+                                        task[4], ftol), task)
+                           for task in tasks)
+            pending = set(futures)
+            try:
+                while pending:
+                    if monitor is not None:
+                        monitor.update()
+                    done, pending = wait(pending, timeout=0.1,
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(futures[future], *future.result())
+            except FitCancelled:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    #Rank the Fitted Candidates by Each Criterion
+    fitted = [row for row in rows if row["status"] == "ok"]
+    for criterion in compareCriteria:
+        fitted.sort(key=lambda row: row[criterion])
+        for rank, row in enumerate(fitted):
+            row[criterion+"Rank"] = rank+1
+
+    order = dict((id(row), i) for i, row in enumerate(rows))
+    rows.sort(key=lambda row: (row["status"] != "ok",
+                               row.get(rankBy+"Rank", 0), order[id(row)]))
+    return rows
+
+def formatComparison(rows, rankBy="aic"):
+    """
+    Returns Ranked Comparison Rows (See compareModels) as a Text Table
+    """
+    lines = ["%4s  %-12s %-12s %-12s %8s %8s  %s" % ("Rank", "Red. Chi-Sq",
+                                                     "AIC", "BIC", "Params",
+                                                     "Seconds", "Equation")]
+    for row in rows:
+        seconds = ("%8.3f" % row["seconds"]) if "seconds" in row else " "*8
+        if row["status"] != "ok":
+            lines.append("%4s  %-38s %8s %s  0 = %s\n      (%s)"
+                         % ("-", "Not Fit", row.get("parameters", ""),
+                            seconds, row["equation"], row["message"]))
+            continue
+        lines.append("%4d  %-12.6g %-12.6g %-12.6g %8d %s  0 = %s"
+                     % (row[rankBy+"Rank"], row["redChiSqrd"], row["aic"],
+                        row["bic"], row["parameters"], seconds,
+                        row["equation"]))
+        lines.append("      "+row["params"])
+    return "\n".join(lines)
+
+def writeComparison(rows, outputFile):
+    """
+    Writes Comparison Rows (See compareModels) to a .csv Table
+    """
+    columns = (["equation", "status", "parameters", "chiSqrd"]
+               +compareCriteria
+               +[criterion+"Rank" for criterion in compareCriteria]
+               +["seconds", "method", "rank", "condition", "structure",
+                 "params", "message"])
+
+    with open(outputFile, "w", newline="") as table:
+        writer = csv.DictWriter(table, fieldnames=columns, restval="",
+                                extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+#Listed at the End of Every Command Line Help, as Each Mode Has its Own
+#Options
+commandLineModes = """modes:
+  python GeneralLSFR.py
+      open the graphical interface, restoring the last session
+  python GeneralLSFR.py --session FILE.json
+      open the graphical interface, restoring a saved session
+  python GeneralLSFR.py --batch PATTERN [options]
+      fit an equation to every matching data file
+      (options: python GeneralLSFR.py --help)
+  python GeneralLSFR.py --compare EQUATION --data FILE [options]
+      fit candidate equations to one data file and rank them
+      (options: python GeneralLSFR.py --help --compare)"""
+
+def batchMain(argv):
+    """
+    Command Line Entry Point for Fitting a Directory of Data Files, e.g.
+        python GeneralLSFR.py --batch "data/*.csv" --equation "f1*x+f2-y"
+            --guess f1=1.0 --const k1=2.0 --output results.csv
+    """
+    parser = argparse.ArgumentParser(prog="GeneralLSFR.py",
+                                     description="Fit an equation to every "
+                                     "data file matching a glob pattern.",
+                                     epilog=commandLineModes,
+                                     formatter_class=argparse.
+                                     RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", required=True, metavar="PATTERN",
+                        help="glob pattern of .csv/.txt data files")
+    parser.add_argument("--equation", default="f1*x+f2-y",
+                        help="equation, with 0 = EQUATION (default: %(default)s)")
+    parser.add_argument("--guess", action="append", default=[],
+                        metavar="fN=VALUE", help="initial guess (default 0.0),"
+                        " or fN=LOW:HIGH to search that range for the best fit")
+    parser.add_argument("--const", action="append", default=[],
+                        metavar="kN=VALUE", help="constant value")
+    parser.add_argument("--output", default="results.csv",
+                        help="results table (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: every core)")
+    parser.add_argument("--tol", type=float, default=0.00000001,
+                        help="fit tolerance (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="fit files with more rows than this in chunks "
+                        "of this many rows, bounding memory use")
+    parser.add_argument("--backend", default="auto",
+                        choices=["auto", "numpy", "numexpr", "numba"],
+                        help="how the model is evaluated (default: %(default)s,"
+                        " numexpr/numba if installed for large fits)")
+    parser.add_argument("--resample", default=None,
+                        choices=["bootstrap", "montecarlo"],
+                        help="add each parameter's 68%% interval from "
+                        "refitting resampled data")
+    parser.add_argument("--resamples", type=int, default=None,
+                        help="most resamples per file (default: %d, fewer "
+                        "once the intervals settle)" % resampleCount)
+    parser.add_argument("--profile", default=None, metavar="FILE",
+                        help="append each file's stage timings, evaluation "
+                        "counts and peak memory to FILE as JSON lines")
+    parser.add_argument("--float32", action="store_true",
+                        help="keep each file's columns in single precision, "
+                        "halving their memory")
+    args = parser.parse_args(argv)
+
+    rows = batchFit(args.equation, parseAssignments(args.const),
+                    parseAssignments(args.guess, parseGuess), args.batch,
+                    args.output, args.processes, abs(args.tol),
+                    chunkSize=args.chunk_size, backend=args.backend,
+                    resample=args.resample, nResamples=args.resamples,
+                    dtype=np.float32 if args.float32 else float,
+                    profileFile=args.profile)
+
+    failed = len([row for row in rows if row["status"] != "ok"])
+    print("Fit "+str(len(rows)-failed)+" of "+str(len(rows))+" Files, Results"
+          +" Written to "+args.output)
+    print(modelCache.report())
+
+def compareMain(argv):
+    """
+    Command Line Entry Point for Ranking Candidate Equations Fit to One Data
+        File, e.g.
+        python GeneralLSFR.py --compare "f1*x+f2-y" --compare "f1*x**2+f2-y"
+            --data data.csv --guess f1=1.0 --output comparison.csv
+    """
+    parser = argparse.ArgumentParser(prog="GeneralLSFR.py",
+                                     description="Fit candidate equations to "
+                                     "one data file and rank them.",
+                                     epilog=commandLineModes,
+                                     formatter_class=argparse.
+                                     RawDescriptionHelpFormatter)
+    parser.add_argument("--compare", action="append", required=True,
+                        metavar="EQUATION", help="candidate equation, with "
+                        "0 = EQUATION (repeat for each candidate)")
+    parser.add_argument("--data", required=True, metavar="FILE",
+                        help=".csv/.txt/.npy/.npz data file")
+    parser.add_argument("--guess", action="append", default=[],
+                        metavar="fN=VALUE", help="initial guess (default 0.0),"
+                        " or fN=LOW:HIGH to search that range for the best fit")
+    parser.add_argument("--const", action="append", default=[],
+                        metavar="kN=VALUE", help="constant value")
+    parser.add_argument("--rank", default="aic", choices=compareCriteria,
+                        help="criterion to rank by (default: %(default)s)")
+    parser.add_argument("--output", default="comparison.csv",
+                        help="comparison table (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: every core)")
+    parser.add_argument("--tol", type=float, default=0.00000001,
+                        help="fit tolerance (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    rows = compareModels(args.compare, Dataset(loadData(args.data)),
+                         parseAssignments(args.const),
+                         parseAssignments(args.guess, parseGuess),
+                         args.processes, abs(args.tol), args.rank,
+                         lambda row, done, total: printProgress(row, done,
+                                                                total,
+                                                                "equation"))
+    writeComparison(rows, args.output)
+
+    print(formatComparison(rows, args.rank))
+    print("Results Written to "+args.output)
+    print(modelCache.report())
+
+def preloadModules(modules):
+    """
+    Imports Lazy Modules (See LazyModule) on a Background Thread, so They
+        are Ready by the Time They are First Used
+    """
+    #Define Nested Function
+    def load():
+        for module in modules:
+            try:
+                module.load()
+            except ImportError:
+                pass    #Raised Again Where the Module is First Used
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread
+
+def openGui(sessionFile=None):
+    """
+    Opens the Gui's Window and Sets it Up, Preloading the Heavy Modules
+        Behind it, and Schedules Restoring the Session in sessionFile (or if
+        None the Last Session, See sessionName) for Once the Window is Shown
+    Returns the Gui, Whose Main Loop Has Not Been Started
+    """
+    #Create New Window to Place Widgets Onto
+    window = tk.Tk()    
+    
+    #Initialise  and Set-Up Graphical User Interface
+    gui = Gui(window)   
+    gui.window.title("General LSFR")
+    gui.window.minsize(width=1500, height=850)
+    gui.setup()         #adds widgets to window
+    preloadModules(guiPreload)      #while the window opens
+
+    #Carry On From the Last Session Once the Window Has Been Shown,
+    #Saving it Again on Closing
+    gui.window.protocol("WM_DELETE_WINDOW", gui.closeWindow)
+    if sessionFile is None:
+        sessionFile = lastSessionName()
+    gui.window.after(100, gui.restoreSession, sessionFile)
+    
+    #window bring to front
+    window.attributes("-topmost", True)  
+    return gui
+
+def main(sessionFile=None):
+    """
+    Main Function, Opens Gui, Sets it Up and Runs It's Main Loop
+    Restores the Session in sessionFile, or if None the Last Session (See
+        sessionName)
+    """
+    try:
+        gui = openGui(sessionFile)
         
         #runs GUI's main loop
         gui.window.mainloop()       
-        window.withdraw()
+        gui.window.withdraw()
         
     except SystemExit:      #catch any attempt to end program
         print("Terminating program")
@@ -694,7 +5441,15 @@ def main():
     except tk.TclError:      #catch any attempt to close GUI
         print("Terminating program")
 
-#Run Main Function    
+#Run Main Function (Opening a Session if Given --session file.json), or a
+#Batch Fit or Model Comparison if Given Other Command Line Arguments
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) == 3 and sys.argv[1] == "--session":
+        main(sys.argv[2])
+    elif "--compare" in sys.argv[1:]:
+        compareMain(sys.argv[1:])
+    elif len(sys.argv) > 1:
+        batchMain(sys.argv[1:])
+    else:
+        main()
                     
\ No newline at end of file
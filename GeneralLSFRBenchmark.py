@@ -0,0 +1,1208 @@
+# -*- coding: utf-8 -*-
+"""
+_______________________________________________________________________________
+GeneralLSFRBenchmark.py
+(Benchmarks for the Least Squares Fitting Routine)
+_______________________________________________________________________________
+Runs Headless Fits on Synthetic Data and Times Them, and Times Importing
+    GeneralLSFR, so That Regressions in the Fitting Path and in Startup Can
+    be Measured
+Run With:
+    python GeneralLSFRBenchmark.py
+Or Run the Benchmark Suite Over Equation Families, Parameter Counts and Data
+    Sizes, Comparing it Against an Earlier Run With:
+    python GeneralLSFRBenchmark.py --suite --output new.json
+        --baseline old.json
+_______________________________________________________________________________
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+import GeneralLSFR
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")   #Draw Off Screen
+import matplotlib.pyplot as plt
+from sympy import symbols, lambdify
+from scipy.optimize import curve_fit
+from GeneralLSFR import (getEquation, returnFunction1, chiSquared,
+                         CompiledModel, performFit, linearFit, multiFit,
+                         separableFit, streamingFit, compileEquation,
+                         paramNames, fusedFit, resampleFit, Dataset,
+                         drawFit, FitProfile, profileStage,
+                         compareModels, loadData, DataTail, LiveFit,
+                         ModelCache, modelKey, dataReference, sessionDataset,
+                         sessionHash, saveSession, loadSession)
+
+def legacyReturnFunction1(fitSymbols, equation):
+    """
+    The Original Fitting Function, Which Substitutes Every Trial Guess Into
+        the Equation and Lambdifies it on Each Call Made by Curve_Fit
+    Kept Only as a Reference Point for the Compiled Model
+    """
+    def returnFunction2(x,*param):
+        expr = equation
+        for i in range(len(fitSymbols)):
+            expr = expr.subs(fitSymbols[i],param[i])
+        return lambdify(symbols("x"), expr)(x)
+
+    return returnFunction2
+
+def makeData(string, trueParams, fitSymbols, nPoints, seed=0):
+    """
+    Creates a Synthetic 3 Column Data Array (x, y, y_err) From an Equation
+        String and the True Values of its Fit Parameters
+    """
+    rng = np.random.default_rng(seed)
+    equation = getEquation(string)[0]
+    x_data = np.linspace(0.1, 10.0, nPoints)
+    y_true = returnFunction1(fitSymbols, equation)(x_data, *trueParams)
+    y_err = 0.01 + 0.01*np.abs(y_true)
+    y_data = y_true + rng.normal(0.0, y_err)
+    return np.column_stack((x_data, y_data, y_err))
+
+def timeFit(function, data, initialGuesses, repeats=3):
+    """
+    Returns the Best Wall Time (Seconds) of Fitting the Data With function
+    """
+    best = np.inf
+    for i in range(repeats):
+        start = time.perf_counter()
+        curve_fit(function, data[:,0], data[:,1], p0=initialGuesses,
+                  sigma=data[:,2], absolute_sigma=True, ftol=1e-8)
+        best = min(best, time.perf_counter()-start)
+    return best
+
+def benchmarkCompiledModel(nPoints=20000, repeats=3):
+    """
+    Compares the Compiled Model Against the Legacy Substitute-and-Lambdify
+        Path on a 6 Parameter Model, Returns a Dict of Timings and Speedup
+    """
+    string = "f1*exp(-x/f2)+f3*sin(f4*x)+f5*x+f6-y"
+    trueParams = [2.0, 3.0, 0.5, 1.5, 0.2, 1.0]
+    initialGuesses = [1.8, 2.5, 0.6, 1.45, 0.1, 0.8]
+    fitSymbols = symbols("f1 f2 f3 f4 f5 f6")
+
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    equation = getEquation(string)[0]
+
+    #Time Both Paths on the Same Data and Starting Point
+    legacy = timeFit(legacyReturnFunction1(fitSymbols, equation), data,
+                     initialGuesses, repeats)
+    compiled = timeFit(returnFunction1(fitSymbols, equation), data,
+                       initialGuesses, repeats)
+
+    #Check Both Paths Agree on the Chi-Squared at the True Parameters
+    chiLegacy = np.sum(((data[:,1]-legacyReturnFunction1(fitSymbols,equation)(
+                         data[:,0],*trueParams))/data[:,2])**2)
+    chiCompiled = chiSquared(trueParams, data, equation, fitSymbols)
+    assert np.isclose(chiLegacy, chiCompiled)
+
+    return {"benchmark":"compiledModel", "nPoints":nPoints,
+            "legacy":legacy, "compiled":compiled, "speedup":legacy/compiled}
+
+def benchmarkJacobian(nPoints=200000, repeats=3):
+    """
+    Compares Fits Using the Analytic Jacobian Against Finite Differences on
+        an 8 Parameter Model, Returns a Dict of Timings and Evaluation Counts
+    """
+    string = "f1*exp(-x/f2)+f3*exp(-x/f4)+f5*sin(f6*x)+f7*x+f8-y"
+    trueParams = [2.0, 0.5, 1.0, 4.0, 0.3, 1.5, 0.05, 0.5]
+    initialGuesses = [1.5, 0.6, 1.2, 3.5, 0.25, 1.48, 0.0, 0.4]
+    fitSymbols = symbols("f1:9")
+
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    result = {"benchmark":"jacobian", "nPoints":nPoints}
+    for name, jacobianFunction in (("analytic", model.jacobianFunction),
+                                   ("finiteDifference", None)):
+        #Finite Differences are Forced by Removing the Compiled Jacobian
+        model.jacobianFunction = jacobianFunction
+        best = np.inf
+        for i in range(repeats):
+            start = time.perf_counter()
+            fit = performFit(model, data, initialGuesses)
+            best = min(best, time.perf_counter()-start)
+        result[name] = {"time":best, "nfev":fit.nfev, "njev":fit.njev}
+    return result
+
+def benchmarkLinear(nPoints=1000000, repeats=3):
+    """
+    Compares the Direct Linear Solve Against Iterative curve_fit on a Cubic
+        Polynomial, Returns a Dict of Timings
+    """
+    string = "f1+f2*x+f3*x**2+f4*x**3-y"
+    trueParams = [1.0, -2.0, 0.5, 0.01]
+    fitSymbols = symbols("f1:5")
+
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    iterative = timeFit(model, data, [0.0]*4, repeats)
+    best = np.inf
+    for i in range(repeats):
+        start = time.perf_counter()
+        linearFit(model, data)
+        best = min(best, time.perf_counter()-start)
+
+    return {"benchmark":"linear", "nPoints":nPoints, "iterative":iterative,
+            "linear":best, "speedup":iterative/best}
+
+def benchmarkMultiFit(nSets=2000, nPoints=50):
+    """
+    Compares Fitting Many Small Datasets at Once With multiFit Against
+        Looping performFit Over Them, Returns a Dict of Timings
+    """
+    string = "f1*exp(-(x-f2)**2/f3)+f4-y"
+    fitSymbols = symbols("f1:5")
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    #Each Dataset Has its Own Peak Height, Position and Width
+    rng = np.random.default_rng(0)
+    x_data = np.linspace(-5.0, 5.0, nPoints)
+    datasets = []
+    for i in range(nSets):
+        trueParams = [2.0+rng.random(), rng.normal(0.0, 0.5),
+                      1.0+rng.random(), 0.5]
+        y_data = model(x_data, *trueParams)+rng.normal(0.0, 0.05, nPoints)
+        datasets.append(np.column_stack((x_data, y_data, 0.05+0.0*x_data)))
+    initialGuesses = [2.0, 0.0, 1.5, 0.0]
+
+    start = time.perf_counter()
+    for data in datasets:
+        try:
+            performFit(model, data, initialGuesses)
+        except RuntimeError:
+            pass    #Failures Still Cost Their Time
+    loop = time.perf_counter()-start
+
+    start = time.perf_counter()
+    multiFit(model, datasets, initialGuesses)
+    batched = time.perf_counter()-start
+
+    return {"benchmark":"multiFit", "nSets":nSets, "nPoints":nPoints,
+            "loop":loop, "multiFit":batched, "speedup":loop/batched}
+
+def benchmarkStreaming(nPoints=2000000, chunkSize=100000):
+    """
+    Compares the Peak Memory and Time of an In-Memory Fit Against a Chunked
+        Fit of the Same Memory-Mapped Data, Returns a Dict of Results
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 1.0]
+    initialGuesses = [1.5, 2.0, 0.5]
+    fitSymbols = symbols("f1:4")
+
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    with tempfile.TemporaryDirectory() as directory:
+        fileName = os.path.join(directory, "data.npy")
+        np.save(fileName, data)
+        del data
+        mapped = np.load(fileName, mmap_mode="r")
+
+        result = {"benchmark":"streaming", "nPoints":nPoints,
+                  "chunkSize":chunkSize}
+        for name, fit in (("inMemory", lambda: separableFit(
+                              model, np.array(mapped), initialGuesses)),
+                          ("streaming", lambda: streamingFit(
+                              model, mapped, initialGuesses,
+                              chunkSize=chunkSize))):
+            tracemalloc.start()
+            start = time.perf_counter()
+            fitResult = fit()
+            elapsed = time.perf_counter()-start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            result[name] = {"time":elapsed, "peakMB":peak/1e6,
+                            "params":[float(p) for p in fitResult.params]}
+        del mapped
+    return result
+
+def benchmarkFused(nPoints=1000000, repeats=3):
+    """
+    Compares Fitting With the Fused Residual and Jacobian Kernel Against
+        curve_fit Calling the Model and Jacobian Separately, on a Model
+        Whose Derivatives Share its Exponential, Returns a Dict of Timings
+    """
+    string = "f1*exp(-(x/f2)**f3)*sin(f4*x)-y"
+    trueParams = [2.0, 4.0, 1.5, 1.2]
+    initialGuesses = [1.8, 3.6, 1.4, 1.22]
+    fitSymbols = symbols("f1:5")
+
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    separate = np.inf
+    for i in range(repeats):
+        start = time.perf_counter()
+        curve_fit(model, data[:,0], data[:,1], p0=initialGuesses,
+                  sigma=data[:,2], absolute_sigma=True, jac=model.jacobian,
+                  ftol=1e-8)
+        separate = min(separate, time.perf_counter()-start)
+
+    fused = np.inf
+    for i in range(repeats):
+        start = time.perf_counter()
+        fusedFit(model, data, initialGuesses)
+        fused = min(fused, time.perf_counter()-start)
+
+    return {"benchmark":"fused", "nPoints":nPoints, "separate":separate,
+            "fused":fused, "speedup":separate/fused}
+
+def benchmarkDataset(nPoints=1000000, repeats=3):
+    """
+    Compares Fitting a Data Array (Converted to a Dataset on Every Fit)
+        Against Fitting a Dataset Built Once, and Against Refitting a
+        Memoised Dataset and Model, Returns a Dict of Timings and the
+        Column Memory in Double and Single Precision
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 0.5]
+    initialGuesses = [1.8, 2.7, 0.4]
+    fitSymbols = symbols("f1:4")
+
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    timings = {}
+    for name in ("array", "dataset", "memoised"):
+        best = np.inf
+        for i in range(repeats):
+            start = time.perf_counter()
+            if name == "array":
+                performFit(model, data, initialGuesses)
+            elif name == "dataset":
+                performFit(model, Dataset(data), initialGuesses)
+            else:
+                dataset = Dataset(data)
+                dataset.memoize(model, ("fit", tuple(initialGuesses)),
+                                lambda: performFit(model, dataset,
+                                                   initialGuesses))
+            best = min(best, time.perf_counter()-start)
+        timings[name] = best
+
+    columnMB = {}
+    for name, dtype in (("float64", float), ("float32", np.float32)):
+        dataset = Dataset(data, dtype)
+        columnMB[name] = sum(column.nbytes for column in (
+            dataset.x, dataset.y, dataset.err, dataset.weights))/1e6
+
+    return {"benchmark":"dataset", "nPoints":nPoints, "timings":timings,
+            "columnMB":columnMB}
+
+def benchmarkPlotting(nPoints=1000000, fullPoints=50000):
+    """
+    Times Drawing a Fit and its Residuals Decimated to the Figure's Pixel
+        Columns (First Draw and Redraw) for nPoints Points, Against Drawing
+        Every Error Bar for fullPoints Points, Returns a Dict of Timings
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 0.5]
+    fitSymbols = symbols("f1:4")
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    #Define Nested Function
+    def draw(dataset):
+        start = time.perf_counter()
+        fig = plt.figure(figsize=(8, 6), dpi=100)
+        drawFit(fig, dataset, model, trueParams, "b")
+        fig.canvas.draw()
+        plt.close(fig)
+        return time.perf_counter()-start
+
+    #Shuffle the Rows, as x is Not Always in Order
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    data = data[np.random.default_rng(0).permutation(nPoints)]
+    dataset = Dataset(data)
+    first = draw(dataset)
+    redraw = draw(dataset)
+
+    points = GeneralLSFR.plotPoints
+    GeneralLSFR.plotPoints = fullPoints
+    try:
+        full = draw(Dataset(data[:fullPoints]))
+    finally:
+        GeneralLSFR.plotPoints = points
+
+    return {"benchmark":"plotting", "nPoints":nPoints, "first":first,
+            "redraw":redraw, "fullPoints":fullPoints, "full":full}
+
+def benchmarkFitReuse(nPoints=1000000):
+    """
+    Times Drawing a Finished Fit From the Model Values Kept in its FitResult
+        Against Evaluating the Model at the Data Again, and Times the
+        Chi-Squared Evaluation Which Followed a curve_fit Fit, for a Model
+        With an Analytic Jacobian and One Without
+    Returns a Dict of Timings per Model, With the Fit's Jacobian Rank and
+        Condition Number
+    """
+    result = {"benchmark":"fitReuse", "nPoints":nPoints}
+    for string, trueParams, initialGuesses in (
+            ("f1*exp(f2*x)+f3*x-y", [2.0, -0.3, 0.5], [1.8, -0.25, 0.45]),
+            ("f1*Abs(x-f2)**f3-y", [2.0, -1.0, 1.5], [1.8, -0.9, 1.4])):
+        fitNames = paramNames(string)[0]
+        fitSymbols = [symbols(fkey) for fkey in fitNames]
+        model = CompiledModel(getEquation(string)[0], fitSymbols)
+        dataset = Dataset(makeData(string, trueParams, fitSymbols, nPoints))
+        fit = performFit(model, dataset, initialGuesses)
+
+        #Define Nested Function
+        def draw(values):
+            GeneralLSFR.datasetMemo.clear()
+            start = time.perf_counter()
+            fig = plt.figure(figsize=(8, 6), dpi=100)
+            drawFit(fig, dataset, model, fit.params, "b", values=values)
+            fig.canvas.draw()
+            plt.close(fig)
+            return time.perf_counter()-start
+
+        draw(fit.values)    #The First Figure Drawn Takes Longer
+        start = time.perf_counter()
+        chiSquared(fit.params, dataset, model)
+        chiSeconds = time.perf_counter()-start
+
+        result[string] = {"method":fit.method, "rank":fit.rank,
+                          "condition":fit.condition,
+                          "evaluated":draw(None), "kept":draw(fit.values),
+                          "chiSquared":chiSeconds}
+    return result
+
+def benchmarkProfiling(nPoints=100000, repeats=5):
+    """
+    Compares the Same Fit Unprofiled and Profiled (Timing Each Stage and
+        Tracking Peak Memory), Returns a Dict of Timings and the Profile
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 0.5]
+    initialGuesses = [1.8, 2.7, 0.4]
+    fitSymbols = symbols("f1:4")
+
+    data = Dataset(makeData(string, trueParams, fitSymbols, nPoints))
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+    timings = {}
+    for name in ("off", "on"):
+        best = np.inf
+        for i in range(repeats):
+            start = time.perf_counter()
+            if name == "off":
+                performFit(model, data, initialGuesses)
+            else:
+                profile = FitProfile()
+                with profile.activate(), profileStage("fit"):
+                    profile.record(performFit(model, data, initialGuesses))
+            best = min(best, time.perf_counter()-start)
+        timings[name] = best
+
+    return {"benchmark":"profiling", "nPoints":nPoints, "timings":timings,
+            "profile":profile.toDict()}
+
+#Modules Importing GeneralLSFR Should Not Load, as Headless Fits Do Not Need
+#Them or Load Them Only When First Used (See benchmarkImportTime)
+startupModules = ["tkinter", "matplotlib", "sympy", "scipy.optimize"]
+
+def benchmarkImportTime(repeats=5):
+    """
+    Times Importing GeneralLSFR in Fresh Interpreters, Then Loading the
+        Modules the GUI Preloads, and Lists Which of startupModules the
+        Import Alone Loaded (Which Should be None)
+    Returns a Dict of the Best Times and the Modules
+    """
+    script = ("import sys, json, time\n"
+              "start = time.perf_counter()\n"
+              "import GeneralLSFR\n"
+              "imported = time.perf_counter()\n"
+              "loaded = [name for name in %r if name in sys.modules]\n"
+              "for module in GeneralLSFR.guiPreload:\n"
+              "    module.load()\n"
+              "preloaded = time.perf_counter()\n"
+              "print(json.dumps([imported-start, preloaded-imported, loaded]))"
+              % startupModules)
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    importSeconds = preloadSeconds = np.inf
+    for i in range(repeats):
+        output = subprocess.run([sys.executable, "-c", script], cwd=directory,
+                                capture_output=True, text=True,
+                                check=True).stdout
+        imported, preloaded, loaded = json.loads(output.splitlines()[-1])
+        importSeconds = min(importSeconds, imported)
+        preloadSeconds = min(preloadSeconds, preloaded)
+
+    return {"benchmark":"importTime", "importSeconds":importSeconds,
+            "preloadSeconds":preloadSeconds, "heavyModules":len(loaded),
+            "heavyModuleNames":loaded}
+
+def benchmarkGuiStartup(nPoints=1000000, repeats=5):
+    """
+    Times Opening the GUI in Fresh Interpreters as a Typical Launch Does,
+        With a Saved Session (Data File, Cached Model and Fit) to Restore:
+        Until the Window's First Idle, the Time restoreSession Holds the
+        Main Thread, and Until the Main Loop is Next Idle After it
+    Returns a Dict of the Best Times, or None if No Window Can be Opened
+        (e.g. There is No Display)
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 0.5]
+    initialGuesses = [1.5, 2.0, 0.4]
+    fitNames = paramNames(string)[0]
+    key = modelKey(string, fitNames, {})
+
+    script = ("import sys, json, time\n"
+              "start = time.perf_counter()\n"
+              "import GeneralLSFR\n"
+              "times = {}\n"
+              "restore = GeneralLSFR.Gui.restoreSession\n"
+              "def idle(window):\n"
+              "    times['idle'] = time.perf_counter()-start\n"
+              "    window.quit()\n"
+              "def timedRestore(self, fileName):\n"
+              "    begin = time.perf_counter()\n"
+              "    restored = restore(self, fileName)\n"
+              "    times['restore'] = time.perf_counter()-begin\n"
+              "    self.window.after_idle(idle, self.window)\n"
+              "    return restored\n"
+              "GeneralLSFR.Gui.restoreSession = timedRestore\n"
+              "gui = GeneralLSFR.openGui(sys.argv[1])\n"
+              "gui.window.after_idle(lambda: times.setdefault('shown',\n"
+              "                      time.perf_counter()-start))\n"
+              "gui.window.mainloop()\n"
+              "print(json.dumps([times['shown'], times['restore'],\n"
+              "                  times['idle']]))\n")
+    packageDirectory = os.path.dirname(os.path.abspath(__file__))
+
+    with tempfile.TemporaryDirectory() as directory:
+        #Save the Session Into a Cache of its Own, as the GUI Would Have
+        cacheRoot = os.environ.get("GENERALLSFR_CACHE")
+        cache = GeneralLSFR.modelCache
+        os.environ["GENERALLSFR_CACHE"] = directory
+        GeneralLSFR.modelCache = ModelCache()
+        try:
+            fileName = os.path.join(directory, "session.csv")
+            np.savetxt(fileName, makeData(string, trueParams,
+                                          symbols(fitNames), nPoints),
+                       delimiter=",")
+            data = Dataset(loadData(fileName, ","))
+            model = compileEquation(string, fitNames, {})
+            result = performFit(model, data, initialGuesses)
+            session = {"equation":string,
+                       "fitParams":dict((fkey, str(guess)) for fkey, guess
+                                        in zip(fitNames, initialGuesses)),
+                       "constParams":{}, "tolerance":"1e-08",
+                       "title":"Graph Title", "xLabel":"x", "yLabel":"y",
+                       "data":dataReference(fileName, ",", data),
+                       "fit":{"modelKey":key,
+                              "inputs":sessionHash(key, data, initialGuesses,
+                                                   None, 0.00000001)}}
+            sessionFile = os.path.join(directory, "session.json")
+            saveSession(sessionFile, session, result)
+        finally:
+            GeneralLSFR.modelCache = cache
+            if cacheRoot is None:
+                del os.environ["GENERALLSFR_CACHE"]
+            else:
+                os.environ["GENERALLSFR_CACHE"] = cacheRoot
+
+        environment = dict(os.environ, GENERALLSFR_CACHE=directory)
+        shownSeconds = restoreSeconds = idleSeconds = np.inf
+        for i in range(repeats):
+            try:
+                output = subprocess.run([sys.executable, "-c", script,
+                                         sessionFile], cwd=packageDirectory,
+                                        env=environment, capture_output=True,
+                                        text=True, check=True).stdout
+            except subprocess.CalledProcessError:
+                return None     #No Display to Open the Window On
+            shown, restored, idle = json.loads(output.splitlines()[-1])
+            shownSeconds = min(shownSeconds, shown)
+            restoreSeconds = min(restoreSeconds, restored)
+            idleSeconds = min(idleSeconds, idle)
+
+    return {"benchmark":"guiStartup", "nPoints":nPoints,
+            "shownSeconds":shownSeconds, "restoreSeconds":restoreSeconds,
+            "idleSeconds":idleSeconds}
+
+def benchmarkLiveTail(nPoints=1000000, nAppends=5, appendPoints=10000):
+    """
+    Appends Rows to a Growing .csv File and Compares Refitting it With a
+        LiveFit (Reading Only the New Rows, Warm Started) Against Reading
+        the Whole File Again and Fitting From the Initial Guesses, for a
+        Linear and a Non-Linear Model
+    Returns a Dict of Timings per Model
+    """
+    result = {"benchmark":"liveTail", "nPoints":nPoints,
+              "appendPoints":appendPoints}
+    for string, trueParams, initialGuesses in (
+            ("f1*x+f2-y", [2.0, 1.0], [0.0, 0.0]),
+            ("f1*exp(-x/f2)+f3-y", [2.0, 3.0, 1.0], [1.5, 2.0, 0.5])):
+        fitNames = paramNames(string)[0]
+        fitSymbols = [symbols(fkey) for fkey in fitNames]
+        model = CompiledModel(getEquation(string)[0], fitSymbols)
+
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "live.csv")
+            np.savetxt(fileName, makeData(string, trueParams, fitSymbols,
+                                          nPoints), delimiter=",")
+            liveFit = LiveFit(model, DataTail(fileName), initialGuesses)
+            liveFit.update()
+            first = liveFit.seconds
+
+            updates = []
+            iterations = []
+            for i in range(nAppends):
+                with open(fileName, "a") as dataFile:
+                    np.savetxt(dataFile, makeData(string, trueParams,
+                                                  fitSymbols, appendPoints,
+                                                  seed=i+1), delimiter=",")
+                liveFit.update()
+                updates.append(liveFit.seconds)
+                iterations.append(liveFit.result.iterations)
+
+            #Refitting Without Watching: Read Everything, Fit From Scratch
+            start = time.perf_counter()
+            data = Dataset(loadData(fileName, useCache=False))
+            reloaded = performFit(model, data, initialGuesses)
+            reload = time.perf_counter()-start
+
+        result[string] = {"method":liveFit.result.method, "first":first,
+                          "update":float(np.mean(updates)),
+                          "iterations":float(np.mean(iterations)),
+                          "reload":reload, "speedup":reload/np.mean(updates),
+                          "params":[float(p) for p in liveFit.result.params],
+                          "reloadParams":[float(p) for p in
+                                          reloaded.params]}
+    return result
+
+def benchmarkSession(nPoints=1000000):
+    """
+    Times Starting From Scratch (Parsing the Data File, Solving and
+        Compiling the Equation, Then Fitting) Against Restoring a Saved
+        Session (Reading the Data's Binary Cache, Loading the Model From the
+        Model Cache's Disk Copy and Reusing the Saved Fit Once its Inputs'
+        Hash Matches), Returns a Dict of Timings
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 0.5]
+    initialGuesses = [1.5, 2.0, 0.4]
+    fitNames = paramNames(string)[0]
+    fitSymbols = [symbols(fkey) for fkey in fitNames]
+    key = modelKey(string, fitNames, {})
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        fileName = os.path.join(directory, "session.csv")
+        sessionFile = os.path.join(directory, "session.json")
+        np.savetxt(fileName, makeData(string, trueParams, fitSymbols,
+                                      nPoints), delimiter=",")
+
+        start = time.perf_counter()
+        data = Dataset(loadData(fileName, ","))
+        timings["parse"] = time.perf_counter()-start
+        start = time.perf_counter()
+        model = CompiledModel(getEquation(string)[0], fitSymbols)
+        timings["solve"] = time.perf_counter()-start
+        compileEquation(string, fitNames, {})   #Into the Model Cache on Disk
+        start = time.perf_counter()
+        result = performFit(model, data, initialGuesses)
+        timings["fit"] = time.perf_counter()-start
+
+        session = {"data":dataReference(fileName, ",", data),
+                   "fit":{"modelKey":key,
+                          "inputs":sessionHash(key, data, initialGuesses,
+                                               None, 0.00000001)}}
+        start = time.perf_counter()
+        saveSession(sessionFile, session, result)
+        timings["save"] = time.perf_counter()-start
+
+        #Restore With an Empty Model Cache in Memory, as a New Launch Has
+        cache = GeneralLSFR.modelCache
+        GeneralLSFR.modelCache = ModelCache()
+        try:
+            start = time.perf_counter()
+            session, restored = loadSession(sessionFile)
+            data = sessionDataset(session["data"])
+            compileEquation(string, fitNames, {})
+            reused = (sessionHash(key, data, initialGuesses, None, 0.00000001)
+                      == session["fit"]["inputs"])
+            timings["restore"] = time.perf_counter()-start
+        finally:
+            GeneralLSFR.modelCache = cache
+            os.remove(session["data"]["cache"])
+
+    return {"benchmark":"session", "nPoints":nPoints, "timings":timings,
+            "reused":reused, "speedup":(timings["parse"]+timings["solve"]
+                                        +timings["fit"])/timings["restore"]}
+
+def benchmarkResampling(nPoints=200, nResamples=10000):
+    """
+    Times Bootstrap Resampling of a 3 Parameter Fit, Returns a Dict of the
+        Time and the Number of Resamples Used Before the Intervals Settled
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 0.5]
+    fitSymbols = symbols("f1:4")
+
+    data = makeData(string, trueParams, fitSymbols, nPoints)
+    model = CompiledModel(getEquation(string)[0], fitSymbols)
+    fit = performFit(model, data, trueParams)
+
+    start = time.perf_counter()
+    resampling = resampleFit(model, data, fit, nResamples)
+    return {"benchmark":"resampling", "nPoints":nPoints,
+            "nResamples":nResamples, "time":time.perf_counter()-start,
+            "used":len(resampling.params)+resampling.nFailed}
+
+def benchmarkSparse(nPeaks=40, nPoints=40000):
+    """
+    Compares the Time and Peak Memory of Fitting a Sum of Many Gaussian Peaks
+        With a Sparse Jacobian Against the Dense Fit, Returns a Dict of
+        Results
+    """
+    string = "+".join("f%d*exp(-(x-f%d)**2/f%d)" % (3*i+1, 3*i+2, 3*i+3)
+                      for i in range(nPeaks))+"+f%d-y" % (3*nPeaks+1)
+    fitNames = paramNames(string)[0]
+    model = compileEquation(string, fitNames, {})
+
+    #Peaks Spread Evenly Along x, Guessed Slightly Off Their True Values
+    rng = np.random.default_rng(0)
+    trueParams, initialGuesses = [], []
+    for i in range(nPeaks):
+        trueParams += [1.0+rng.random(), 5.0+10.0*i+rng.normal(0.0, 0.3),
+                       0.5+0.5*rng.random()]
+        initialGuesses += [1.5, 5.0+10.0*i, 0.75]
+    trueParams.append(0.2)
+    initialGuesses.append(0.0)
+    data = makeData(string, trueParams, symbols(fitNames), nPoints)
+    data[:,0] = np.linspace(0.0, 10.0*nPeaks, nPoints)
+    data[:,1] = model(data[:,0], *trueParams)+rng.normal(0.0, 0.02, nPoints)
+    data[:,2] = 0.02
+
+    result = {"benchmark":"sparse", "nPeaks":nPeaks, "nPoints":nPoints}
+    termJacobians = model.termJacobians
+    for name, terms in (("sparse", termJacobians), ("dense", None)):
+        #The Dense Fit is Forced by Removing the Term Derivatives
+        model.termJacobians = terms
+        tracemalloc.start()
+        start = time.perf_counter()
+        fit = performFit(model, data, initialGuesses)
+        elapsed = time.perf_counter()-start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result[name] = {"time":elapsed, "peakMB":peak/1e6,
+                        "method":fit.method, "redChiSqrd":fit.redChiSqrd}
+    model.termJacobians = termJacobians
+    return result
+
+def benchmarkBackends(nPoints=5000000, repeats=3):
+    """
+    Compares Evaluating the Model and its Chi-Squared With Each Installed
+        Backend on a Set of Typical Models, Returns a Dict of Timings per
+        Model (Backends That are Not Installed or Cannot Evaluate a Model
+        are Left Out)
+    """
+    models = {"exponential":("f1*exp(-x/f2)+f3-y", [2.0, 3.0, 1.0]),
+              "gaussian":("f1*exp(-(x-f2)**2/f3)+f4-y", [2.0, 5.0, 1.5, 0.5]),
+              "dampedSine":("f1*exp(-x/f2)*sin(f3*x+f4)+f5-y",
+                            [2.0, 3.0, 1.5, 0.2, 0.1]),
+              "powerLaw":("f1*x**f2+f3*sqrt(x)-y", [1.5, 0.7, 0.3])}
+
+    result = {"benchmark":"backends", "nPoints":nPoints}
+    for name, (string, trueParams) in models.items():
+        fitNames = paramNames(string)[0]
+        data = makeData(string, trueParams, symbols(fitNames), nPoints)
+        x_data, y_data, y_err = data[:,0], data[:,1], data[:,2]
+        model = compileEquation(string, fitNames, {})
+
+        result[name] = {}
+        for backend in ("numpy", "numexpr", "numba"):
+            if not model.hasBackend(backend):
+                continue
+            model.backend = backend
+
+            #Call Once First so Numba's Compile Time is Not Counted
+            model.chiSquared(x_data, y_data, y_err, trueParams)
+            model(x_data, *trueParams)
+
+            evaluate, chiSqrd = np.inf, np.inf
+            for i in range(repeats):
+                start = time.perf_counter()
+                model(x_data, *trueParams)
+                evaluate = min(evaluate, time.perf_counter()-start)
+                start = time.perf_counter()
+                model.chiSquared(x_data, y_data, y_err, trueParams)
+                chiSqrd = min(chiSqrd, time.perf_counter()-start)
+            result[name][backend] = {"evaluate":evaluate, "chiSqrd":chiSqrd}
+        model.backend = "auto"
+    return result
+
+def benchmarkCompareModels(nPoints=20000, processes=None):
+    """
+    Compares Solving, Compiling and Fitting Candidate Equations One After
+        Another Against compareModels, Which Compiles Each Structure Once
+        and Fits in Parallel, Both Starting From an Empty Model Cache
+    Returns a Dict of Timings and the Ranked Equations
+    """
+    string = "f1*exp(-x/f2)+f3-y"
+    trueParams = [2.0, 3.0, 0.5]
+    candidates = ["f1*x+f2-y", "f1*x**2+f2*x+f3-y", "f1*exp(-x/f2)-y",
+                  "f1*exp(-x/f2)+f3-y", "f4*exp(-x/f5)+f6-y",
+                  "f1*exp(-x/f2)+f3*x+f4-y", "f1/(1+x/f2)+f3-y",
+                  "f1*exp(-(x/f2)**2)+f3-y"]
+    guesses = {"f1":1.8, "f2":2.7, "f3":0.4, "f4":1.8, "f5":2.7, "f6":0.4}
+    data = Dataset(makeData(string, trueParams, symbols("f1:4"), nPoints))
+
+    timings = {}
+    start = time.perf_counter()
+    for candidate in candidates:
+        fitNames = paramNames(candidate)[0]
+        model = CompiledModel(getEquation(candidate)[0],
+                              [symbols(fkey) for fkey in fitNames])
+        try:
+            performFit(model, data, [guesses[fkey] for fkey in fitNames])
+        except RuntimeError:
+            pass    #Ranked Last by compareModels
+    timings["serial"] = time.perf_counter()-start
+
+    #Start From an Empty Cache, in Memory and on Disk
+    cache = GeneralLSFR.modelCache
+    root = os.environ.get("GENERALLSFR_CACHE")
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["GENERALLSFR_CACHE"] = directory
+        GeneralLSFR.modelCache = GeneralLSFR.ModelCache()
+        try:
+            start = time.perf_counter()
+            rows = compareModels(candidates, data, guesses=guesses,
+                                 processes=processes)
+            timings["compareModels"] = time.perf_counter()-start
+            compiled = GeneralLSFR.modelCache.misses
+        finally:
+            GeneralLSFR.modelCache = cache
+            if root is None:
+                del os.environ["GENERALLSFR_CACHE"]
+            else:
+                os.environ["GENERALLSFR_CACHE"] = root
+
+    return {"benchmark":"compareModels", "nPoints":nPoints,
+            "candidates":len(candidates), "compiled":compiled,
+            "timings":timings,
+            "speedup":timings["serial"]/timings["compareModels"],
+            "ranked":[row["equation"] for row in rows]}
+
+def main():
+    """
+    Runs Every Benchmark and Prints the Results
+    """
+    result = benchmarkImportTime()
+    print("Import Time: import %.3fs, then preloading the GUI's modules %.3fs,"
+          " heavy modules loaded by the import: %s" % (
+          result["importSeconds"], result["preloadSeconds"],
+          ", ".join(result["heavyModuleNames"]) or "none"))
+
+    result = benchmarkGuiStartup()
+    if result is None:
+        print("GUI Startup: skipped, no display to open the window on")
+    else:
+        print("GUI Startup (Session With %d points): window shown %.3fs, "
+              "restoring the session held the main thread %.3fs, idle again "
+              "%.3fs" % (result["nPoints"], result["shownSeconds"],
+                         result["restoreSeconds"], result["idleSeconds"]))
+
+    result = benchmarkCompiledModel()
+    print("Compiled Model (%d points): legacy %.3fs, compiled %.4fs, "
+          "speedup x%.0f" % (result["nPoints"], result["legacy"],
+                             result["compiled"], result["speedup"]))
+
+    result = benchmarkJacobian()
+    for name in ("analytic", "finiteDifference"):
+        print("Jacobian %s (%d points): %.4fs, nfev %d, njev %d" % (
+              name, result["nPoints"], result[name]["time"],
+              result[name]["nfev"], result[name]["njev"]))
+
+    result = benchmarkFused()
+    print("Fused Kernel (%d points): curve_fit %.3fs, fused %.3fs, "
+          "speedup x%.1f" % (result["nPoints"], result["separate"],
+                             result["fused"], result["speedup"]))
+
+    result = benchmarkLinear()
+    print("Linear Solve (%d points): curve_fit %.3fs, linear %.3fs, "
+          "speedup x%.1f" % (result["nPoints"], result["iterative"],
+                             result["linear"], result["speedup"]))
+
+    result = benchmarkMultiFit()
+    print("Many Datasets (%d x %d points): loop %.3fs, multiFit %.3fs, "
+          "speedup x%.1f" % (result["nSets"], result["nPoints"], result["loop"],
+                             result["multiFit"], result["speedup"]))
+
+    result = benchmarkStreaming()
+    for name in ("inMemory", "streaming"):
+        print("Memory %s (%d points): %.3fs, peak %.1f MB" % (
+              name, result["nPoints"], result[name]["time"],
+              result[name]["peakMB"]))
+
+    result = benchmarkDataset()
+    print("Dataset (%d points): array %.3fs, dataset %.3fs, memoised %.4fs, "
+          "columns %.0f MB (float64) / %.0f MB (float32)" % (
+          result["nPoints"], result["timings"]["array"],
+          result["timings"]["dataset"], result["timings"]["memoised"],
+          result["columnMB"]["float64"], result["columnMB"]["float32"]))
+
+    result = benchmarkPlotting()
+    print("Plotting (%d points): decimated %.3fs, redraw %.3fs; every error "
+          "bar (%d points) %.3fs" % (result["nPoints"], result["first"],
+                                     result["redraw"], result["fullPoints"],
+                                     result["full"]))
+
+    result = benchmarkFitReuse()
+    for name, timings in result.items():
+        if not isinstance(timings, dict):
+            continue
+        print("Fit Reuse %s (%d points): %s, rank %d, condition %.3g, draw "
+              "evaluating the model %.3fs, from the kept values %.3fs, "
+              "chi-squared no longer evaluated %.3fs" % (
+              name, result["nPoints"], timings["method"], timings["rank"],
+              timings["condition"], timings["evaluated"], timings["kept"],
+              timings["chiSquared"]))
+
+    result = benchmarkProfiling()
+    print("Profiling (%d points): off %.4fs, on %.4fs, peak %.1f MB" % (
+          result["nPoints"], result["timings"]["off"],
+          result["timings"]["on"], result["profile"]["peakMB"]))
+
+    result = benchmarkCompareModels()
+    print("Compare Models (%d candidates, %d compiled, %d points): serial "
+          "%.3fs, compareModels %.3fs, speedup x%.1f, best %s" % (
+          result["candidates"], result["compiled"], result["nPoints"],
+          result["timings"]["serial"], result["timings"]["compareModels"],
+          result["speedup"], result["ranked"][0]))
+
+    result = benchmarkLiveTail()
+    for name, timings in result.items():
+        if not isinstance(timings, dict):
+            continue
+        print("Live Tail %s (%d points, +%d per refit): %s first %.3fs, "
+              "refit %.4fs (%.1f iterations), reading again %.3fs, speedup "
+              "x%.0f" % (name, result["nPoints"], result["appendPoints"],
+                         timings["method"], timings["first"],
+                         timings["update"], timings["iterations"],
+                         timings["reload"], timings["speedup"]))
+
+    result = benchmarkSession()
+    print("Session (%d points): parse %.3fs, solve %.3fs, fit %.3fs, save "
+          "%.3fs; restore %.3fs (fit reused: %s), speedup x%.0f" % (
+          result["nPoints"], result["timings"]["parse"],
+          result["timings"]["solve"], result["timings"]["fit"],
+          result["timings"]["save"], result["timings"]["restore"],
+          result["reused"], result["speedup"]))
+
+    result = benchmarkResampling()
+    print("Resampling (%d points): %d of %d resamples in %.3fs" % (
+          result["nPoints"], result["used"], result["nResamples"],
+          result["time"]))
+
+    result = benchmarkSparse()
+    for name in ("sparse", "dense"):
+        print("Sparse Jacobian %s (%d peaks, %d points): %s %.3fs, peak %.1f "
+              "MB" % (name, result["nPeaks"], result["nPoints"],
+                      result[name]["method"], result[name]["time"],
+                      result[name]["peakMB"]))
+
+    result = benchmarkBackends()
+    for name, timings in result.items():
+        if not isinstance(timings, dict):
+            continue
+        for backend, timing in timings.items():
+            print("Backend %s %s (%d points): evaluate %.4fs, chi-squared "
+                  "%.4fs" % (name, backend, result["nPoints"],
+                             timing["evaluate"], timing["chiSqrd"]))
+
+#The Benchmark Suite Fits Every Equation Family at Every Parameter Count and
+#Data Size in suiteSizes (quickSizes With --quick), Skipping Cases With More
+#Than suiteValues Points x Parameters. Each Fit is Repeated at Least
+#suiteRepeats Times and Until suiteSeconds Have Passed (at Most
+#suiteMaxRepeats Times), to Give its Latency Percentiles
+suiteSizes = [100, 1000, 10000, 100000, 1000000, 10000000]
+quickSizes = [100, 1000, 10000, 100000]
+suiteValues = 20000000
+suiteRepeats = 3
+suiteMaxRepeats = 50
+suiteSeconds = 1.0
+
+#A Metric Regresses When it is More Than threshold Worse Than the Baseline
+#and Also Worse by More Than its Floor (Seconds or MB), so Noise in Very
+#Fast Cases is Not Reported
+suiteThreshold = 0.25
+suiteFloors = {"solveSeconds":0.02, "compileSeconds":0.02,
+               "fitP50":0.002, "chiSquaredP50":0.001, "peakMB":1.0,
+               "importSeconds":0.05, "preloadSeconds":0.1,
+               "heavyModules":0.5, "shownSeconds":0.05,
+               "restoreSeconds":0.05, "idleSeconds":0.05}
+
+def linearFamily(nParams):
+    """
+    A Straight Line (Always 2 Parameters)
+    """
+    return "f1*x+f2-y", [2.0, 1.0], [0.0, 0.0]
+
+def polynomialFamily(nParams):
+    """
+    A Polynomial With nParams Coefficients, Scaled so Every Term is of
+        Order 1 Over 0.1 <= x <= 10
+    """
+    string = "+".join("f%d*x**%d" % (j+1, j) for j in range(nParams))+"-y"
+    trueParams = [(1.0+0.1*j)*10.0**-j for j in range(nParams)]
+    return string, trueParams, [0.0]*nParams
+
+def gaussiansFamily(nParams):
+    """
+    A Sum of nParams/3 Gaussian Peaks Spread Evenly Over 0.1 <= x <= 10,
+        Fit From Guesses a Little Away From the True Peaks
+    """
+    nPeaks = max(1, nParams//3)
+    spacing = 9.9/nPeaks
+    terms = []
+    trueParams = []
+    initialGuesses = []
+    for i in range(nPeaks):
+        terms.append("f%d*exp(-((x-f%d)/f%d)**2)" % (3*i+1, 3*i+2, 3*i+3))
+        amplitude = 1.0+0.1*i
+        centre = 0.1+spacing*(i+0.5)
+        width = 0.3*spacing
+        trueParams = trueParams+[amplitude, centre, width]
+        initialGuesses = initialGuesses+[1.05*amplitude, centre+0.05*width,
+                                         1.05*width]
+    return "+".join(terms)+"-y", trueParams, initialGuesses
+
+def implicitFamily(nParams):
+    """
+    An Equation Which Must be Solved for y: log(y)=f1*x+f2, With an Offset
+        f3 if nParams is 3
+    """
+    if nParams == 2:
+        return "log(y)-f1*x-f2", [-0.3, 1.0], [-0.25, 0.9]
+    return "log(y-f3)-f1*x-f2", [-0.3, 1.0, 0.5], [-0.25, 0.9, 0.45]
+
+#Each Equation Family and the Parameter Counts it is Benchmarked With
+suiteFamilies = [("linear", linearFamily, [2]),
+                 ("polynomial", polynomialFamily, [3, 6, 10]),
+                 ("gaussians", gaussiansFamily, [3, 12, 33, 99]),
+                 ("implicit", implicitFamily, [2, 3])]
+
+def repeatTimes(function):
+    """
+    Calls function Repeatedly (See suiteRepeats) and Returns its Wall Times
+    """
+    times = []
+    start = time.perf_counter()
+    while (len(times) < suiteRepeats or
+           (time.perf_counter()-start < suiteSeconds and
+            len(times) < suiteMaxRepeats)):
+        callStart = time.perf_counter()
+        function()
+        times.append(time.perf_counter()-callStart)
+    return times
+
+def suiteCase(model, data, trueParams, initialGuesses):
+    """
+    Benchmarks Fitting One Dataset: Latency Percentiles and Throughput of the
+        Fit and of the Chi-Squared, the Fit's Peak Memory and its Outcome
+    """
+    nPoints = len(data)
+    fitTimes = repeatTimes(lambda: performFit(model, data, initialGuesses))
+    chiTimes = repeatTimes(lambda: chiSquared(trueParams, data, model))
+
+    #Memory is Measured on a Separate Fit, as Tracing Slows the Fit
+    tracemalloc.start()
+    result = performFit(model, data, initialGuesses)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    fitP50, fitP90, fitP99 = np.percentile(fitTimes, [50, 90, 99])
+    return {"nPoints":nPoints, "nParams":len(trueParams),
+            "repeats":len(fitTimes), "fitP50":fitP50, "fitP90":fitP90,
+            "fitP99":fitP99, "chiSquaredP50":float(np.median(chiTimes)),
+            "pointsPerSecond":nPoints/fitP50,
+            "evaluationsPerSecond":result.nfev*nPoints/fitP50,
+            "peakMB":peak/1e6, "method":result.method, "nfev":result.nfev,
+            "iterations":result.iterations, "converged":result.converged,
+            "redChiSqrd":float(result.redChiSqrd),
+            "maxParamError":float(np.max(np.abs(np.array(result.params)
+                                                -trueParams)))}
+
+def runSuite(sizes=None, families=None, verbose=True):
+    """
+    Runs the Benchmark Suite, Returning a Dict of the Environment it Ran In
+        and One Dict of Metrics per Case, Keyed "family/pN/nPoints"
+    Every Case Uses the Same Seeded Synthetic Data Each Run, so Results From
+        Different Commits Can be Compared by compareSuites
+    """
+    if sizes is None:
+        sizes = suiteSizes
+    if families is None:
+        families = [name for name, family, counts in suiteFamilies]
+
+    suite = {"suite":1, "created":time.strftime("%Y-%m-%dT%H:%M:%S"),
+             "environment":suiteEnvironment(), "cases":{}}
+
+    #Startup is Timed as its Own Case, so Slower Imports Show as Regressions
+    case = benchmarkImportTime(suiteRepeats)
+    del case["benchmark"]
+    case["family"] = "startup"
+    suite["cases"]["startup/import"] = case
+    if verbose:
+        print("%-26s import %.4fs, preload %.4fs, heavy modules: %s" % (
+              "startup/import", case["importSeconds"], case["preloadSeconds"],
+              ", ".join(case["heavyModuleNames"]) or "none"))
+
+    #As is Opening the Window and Restoring a Session, Which Must Not Wait
+    #for the Heavy Modules or the Data
+    case = benchmarkGuiStartup(repeats=suiteRepeats)
+    if case is not None:
+        del case["benchmark"]
+        case["family"] = "startup"
+        suite["cases"]["startup/gui"] = case
+        if verbose:
+            print("%-26s shown %.4fs, restore %.4fs, idle %.4fs" % (
+                  "startup/gui", case["shownSeconds"], case["restoreSeconds"],
+                  case["idleSeconds"]))
+    for name, family, counts in suiteFamilies:
+        if name not in families:
+            continue
+        for nParams in counts:
+            string, trueParams, initialGuesses = family(nParams)
+            fitNames = paramNames(string)[0]
+            fitSymbols = symbols(" ".join(fitNames))
+            if not isinstance(fitSymbols, tuple):
+                fitSymbols = (fitSymbols,)
+
+            #Solving and Compiling are Timed Once per Equation, Before SymPy
+            #Has Cached Anything About it
+            start = time.perf_counter()
+            equation = getEquation(string)[0]
+            solveSeconds = time.perf_counter()-start
+            start = time.perf_counter()
+            model = CompiledModel(equation, fitSymbols)
+            compileSeconds = time.perf_counter()-start
+
+            for nPoints in sizes:
+                if nPoints*len(trueParams) > suiteValues:
+                    continue
+                data = Dataset(makeData(string, trueParams, fitSymbols,
+                                        nPoints))
+                case = suiteCase(model, data, trueParams, initialGuesses)
+                case["family"] = name
+                case["solveSeconds"] = solveSeconds
+                case["compileSeconds"] = compileSeconds
+                key = "%s/p%d/%d" % (name, len(trueParams), nPoints)
+                suite["cases"][key] = case
+                if verbose:
+                    print("%-26s %-10s p50 %9.4fs p90 %9.4fs %12.0f points/s"
+                          " %8.1f MB" % (key, case["method"], case["fitP50"],
+                                         case["fitP90"],
+                                         case["pointsPerSecond"],
+                                         case["peakMB"]))
+                    sys.stdout.flush()
+                del data
+    return suite
+
+def suiteEnvironment():
+    """
+    Returns the Versions, Machine and Commit a Suite Ran On
+    """
+    import scipy
+    import sympy
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"python":platform.python_version(), "numpy":np.__version__,
+            "scipy":scipy.__version__, "sympy":sympy.__version__,
+            "machine":platform.machine(), "processor":platform.processor(),
+            "system":platform.system(), "cpus":os.cpu_count(),
+            "commit":commit}
+
+def compareSuites(baseline, current, threshold=None):
+    """
+    Compares Two Suites From runSuite Case by Case, Returning a List of
+        (case, metric, baseline, current) for Every Metric More Than
+        threshold (Default: suiteThreshold) Worse in current, Beyond its
+        Floor in suiteFloors
+    """
+    if threshold is None:
+        threshold = suiteThreshold
+    regressions = []
+    for key, case in current["cases"].items():
+        if key not in baseline["cases"]:
+            continue
+        for metric, floor in suiteFloors.items():
+            if metric not in case or metric not in baseline["cases"][key]:
+                continue    #Startup and Fit Cases Measure Different Metrics
+            old = baseline["cases"][key][metric]
+            new = case[metric]
+            if new > old*(1.0+threshold) and new-old > floor:
+                regressions.append((key, metric, old, new))
+    return regressions
+
+def suiteMain(argv):
+    """
+    Command Line Entry Point for the Benchmark Suite, e.g.
+        python GeneralLSFRBenchmark.py --suite --output new.json
+            --baseline old.json
+    Exits With Status 1 if Any Case Regressed Against the Baseline
+    """
+    parser = argparse.ArgumentParser(prog="GeneralLSFRBenchmark.py",
+                                     description="Run the benchmark suite "
+                                     "and compare it against a baseline.")
+    parser.add_argument("--suite", action="store_true", required=True,
+                        help="run the benchmark suite")
+    parser.add_argument("--quick", action="store_true",
+                        help="only use up to %d points" % quickSizes[-1])
+    parser.add_argument("--family", action="append", default=None,
+                        choices=[name for name, family, counts
+                                 in suiteFamilies],
+                        help="only benchmark this equation family")
+    parser.add_argument("--output", default=None,
+                        help="save the results to this JSON file")
+    parser.add_argument("--baseline", default=None,
+                        help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=suiteThreshold,
+                        help="relative slowdown counted as a regression "
+                        "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    suite = runSuite(quickSizes if args.quick else suiteSizes, args.family)
+    if args.output is not None:
+        with open(args.output, "w") as resultsFile:
+            json.dump(suite, resultsFile, indent=1)
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as baselineFile:
+        baseline = json.load(baselineFile)
+    if baseline["environment"]["machine"] != suite["environment"]["machine"]:
+        print("Warning: Baseline Ran on a Different Machine")
+    regressions = compareSuites(baseline, suite, args.threshold)
+    for key, metric, old, new in regressions:
+        print("Regression: %s %s %.4g -> %.4g (x%.2f)" % (
+              key, metric, old, new, new/old if old > 0 else np.inf))
+    print("%d Regressions in %d Cases Compared" % (
+          len(regressions), len(set(baseline["cases"]) & set(suite["cases"]))))
+    return 1 if regressions else 0
+
+
+#Run Main Function, or the Benchmark Suite if Given Arguments
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(suiteMain(sys.argv[1:]))
+    main()
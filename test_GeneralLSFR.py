@@ -0,0 +1,716 @@
+"""
+Tests for GeneralLSFR.py, Run With: python -m pytest -q
+"""
+import csv
+import glob
+import os
+import numpy as np
+import pytest
+from scipy import optimize
+import GeneralLSFR
+from GeneralLSFR import DataTail, loadData
+
+
+@pytest.fixture(autouse=True)
+def cacheDirectory(tmp_path, monkeypatch):
+    """
+    Every Test Keeps its Data and Model Caches in its Own Directory
+    """
+    monkeypatch.setenv("GENERALLSFR_CACHE", str(tmp_path/"cache"))
+
+
+def noisyData(function, x, err=0.01, seed=0):
+    """
+    Returns a Data Array (x, y, y_err) of function(x) With Gaussian Noise of
+        Size err Added to y
+    """
+    rng = np.random.default_rng(seed)
+    return np.column_stack((x, function(x)+rng.normal(0.0, err, len(x)),
+                            np.full(len(x), err)))
+
+
+def test_tail_skips_short_lines(tmp_path):
+    """
+    A Line With Too Few Fields Appended to a Watched File is Skipped, and
+        the Good Rows After it Still Arrive
+    """
+    fileName = tmp_path/"live.csv"
+    fileName.write_text("1,2,0.1\n2,4,0.1\n")
+    tail = DataTail(str(fileName))
+    assert tail.read() == 2
+
+    with open(fileName, "a") as dataFile:
+        dataFile.write("3,6\n4,8,0.1\n5,10,0.1\n")
+    assert tail.read() == 2
+    assert tail.nMasked == 1
+    assert np.array_equal(tail.dataset().x, [1.0, 2.0, 4.0, 5.0])
+
+    #The Short Line is Not Read Again
+    with open(fileName, "a") as dataFile:
+        dataFile.write("6,12,0.1\n")
+    assert tail.read() == 1
+    assert len(tail) == 5
+
+
+def test_tail_skips_block_of_short_lines(tmp_path):
+    """
+    A Block of Only Short Lines Adds no Rows, and Does Not Stop Later Rows
+    """
+    fileName = tmp_path/"live.csv"
+    fileName.write_text("1,2,0.1\n2,4,0.1\n")
+    tail = DataTail(str(fileName))
+    tail.read()
+
+    with open(fileName, "a") as dataFile:
+        dataFile.write("3,6\n")
+    assert tail.read() == 0
+    with open(fileName, "a") as dataFile:
+        dataFile.write("4,8,0.1\n")
+    assert tail.read() == 1
+    assert np.array_equal(tail.dataset().x, [1.0, 2.0, 4.0])
+
+
+def test_data_cache_keeps_latest_copy(tmp_path, monkeypatch):
+    """
+    Loading a Changed File Replaces its Binary Copy Instead of Adding One
+    """
+    monkeypatch.setenv("GENERALLSFR_CACHE", str(tmp_path/"cache"))
+    fileName = tmp_path/"data.csv"
+    fileName.write_text("1,2,0.1\n2,4,0.1\n")
+    loadData(str(fileName))
+    fileName.write_text("1,2,0.1\n2,4,0.1\n3,6,0.1\n")
+    assert len(loadData(str(fileName))) == 3
+
+    copies = glob.glob(str(tmp_path/"cache"/"data"/"*.npy"))
+    assert len(copies) == 1
+    assert len(np.load(copies[0])) == 3
+
+
+def test_data_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    """
+    Copies of Other Files are Deleted, Oldest First, Once the Data Cache
+        Passes dataCacheBytes, but the Copy Just Written is Kept
+    """
+    monkeypatch.setenv("GENERALLSFR_CACHE", str(tmp_path/"cache"))
+    names = []
+    for index in range(3):
+        fileName = tmp_path/("data"+str(index)+".csv")
+        fileName.write_text("1,2,0.1\n2,4,0.1\n")
+        names.append(str(fileName))
+        loadData(names[-1])
+        os.utime(GeneralLSFR.dataCacheName(names[-1], ","),
+                 (index, index))
+
+    copySize = os.path.getsize(GeneralLSFR.dataCacheName(names[0], ","))
+    monkeypatch.setattr(GeneralLSFR, "dataCacheBytes", 2*copySize)
+    fileName = tmp_path/"data3.csv"
+    fileName.write_text("1,2,0.1\n2,4,0.1\n")
+    loadData(str(fileName))
+
+    kept = [os.path.exists(GeneralLSFR.dataCacheName(name, ","))
+            for name in names+[str(fileName)]]
+    assert kept == [False, False, True, True]
+
+
+def test_streaming_fit_damping_limit_is_not_converged(monkeypatch):
+    """
+    A Fit Which Stops Because no Step Reduces the Chi-Squared (Here as the
+        Model is Not Finite Anywhere but the Initial Guesses, Which are Far
+        From the Data) is Reported as Not Converged
+    """
+    x = np.linspace(1.0, 10.0, 50)
+    data = GeneralLSFR.Dataset(np.column_stack((x, 2.0e6*np.exp(-x/3.0),
+                                                np.full(50, 0.1))))
+    model = GeneralLSFR.compileEquation("f1*exp(-x/f2)-y", ["f1", "f2"], {})
+    exact = model.residualsAndJacobian
+
+    def onlyAtGuesses(x_data, y_data, weights, params):
+        residuals, jac = exact(x_data, y_data, weights, params)
+        if not np.array_equal(params, [1.5, 2.5]):
+            residuals = residuals*np.nan
+        return residuals, jac
+    monkeypatch.setattr(model, "residualsAndJacobian", onlyAtGuesses)
+
+    result = GeneralLSFR.streamingFit(model, data, [1.5, 2.5])
+    assert not result.converged
+    assert result.message == "Damping Limit Reached, No Further Improvement"
+    assert np.array_equal(result.params, [1.5, 2.5])
+
+
+class FiniteOnlyAtGuesses():
+    """
+    Wraps a CompiledModel so its Values are Not Finite for Any Parameters But
+        the Initial Guesses, so No Step Can Ever be Accepted
+    """
+    def __init__(self, model, guesses):
+        self.model = model
+        self.guesses = guesses
+        self.fitSymbols = model.fitSymbols
+
+    def __call__(self, x, *params):
+        values = self.model(x, *params)
+        away = np.zeros(np.shape(values)[:-1], dtype=bool)
+        for param, guess in zip(params, self.guesses):
+            away = away | (np.asarray(param)[...,0] != guess)
+        return np.where(away[...,None], np.nan, values)
+
+    def hasJacobian(self, x, params):
+        return self.model.hasJacobian(x, params)
+
+    def jacobian(self, x, *params):
+        return self.model.jacobian(x, *params)
+
+
+def test_multi_fit_damping_limit_is_not_converged():
+    """
+    multiFit Reports a Dataset Which Stops Because no Step Reduces the
+        Chi-Squared as Not Converged, as streamingFit Does
+    """
+    x = np.linspace(1.0, 10.0, 50)
+    data = np.column_stack((x, 2.0e6*np.exp(-x/3.0), np.full(50, 0.1)))
+    model = GeneralLSFR.compileEquation("f1*exp(-x/f2)-y", ["f1", "f2"], {})
+
+    result, = GeneralLSFR.multiFit(FiniteOnlyAtGuesses(model, [1.5, 2.5]),
+                                   [data], [1.5, 2.5])
+    assert not result.converged
+    assert result.message == "Damping Limit Reached, No Further Improvement"
+    assert np.array_equal(result.params, [1.5, 2.5])
+
+
+def test_resampling_same_seed_any_processes():
+    """
+    The Same Seed Gives the Same Resampled Intervals Whether the Resamples
+        are Refit in This Process or Across Worker Processes
+    """
+    rng = np.random.default_rng(1)
+    x = np.linspace(1.0, 10.0, 40)
+    data = np.column_stack((x, 2.0*np.exp(-x/3.0)+rng.normal(0.0, 0.01, 40),
+                            np.full(40, 0.01)))
+    model = GeneralLSFR.compileEquation("f1*exp(-x/f2)-y", ["f1", "f2"], {})
+    fit = GeneralLSFR.performFit(model, data, [1.5, 2.5])
+
+    serial = GeneralLSFR.resampleFit(model, data, fit, 500, seed=3,
+                                     processes=1)
+    parallel = GeneralLSFR.resampleFit(model, data, fit, 500, seed=3,
+                                       processes=2)
+    assert np.array_equal(serial.intervals, parallel.intervals)
+    assert np.array_equal(serial.params, parallel.params)
+
+
+def test_analytic_jacobian_matches_finite_differences():
+    """
+    The Model's Analytic Jacobian Matches Central Differences of the Model
+    """
+    model = GeneralLSFR.compileEquation("exp(-f1*x)/(1+f2*x**2)-y",
+                                        ["f1", "f2"], {})
+    x = np.linspace(0.0, 5.0, 30)
+    params = np.array([0.7, 0.3])
+
+    step = 0.000001
+    numeric = np.empty((len(x), 2))
+    for j in range(2):
+        shift = np.zeros(2)
+        shift[j] = step
+        numeric[:,j] = (model(x, *(params+shift))
+                        -model(x, *(params-shift)))/(2*step)
+    assert np.allclose(model.jacobian(x, *params), numeric, rtol=0.000001,
+                       atol=0.00000001)
+
+
+def test_analytic_jacobian_fit_matches_finite_difference_fit():
+    """
+    A Fit Using the Analytic Jacobian Finds the Same Parameters as curve_fit
+        Using Finite Differences, and Evaluates the Jacobian Analytically
+    """
+    model = GeneralLSFR.compileEquation("exp(-f1*x)/(1+f2*x**2)-y",
+                                        ["f1", "f2"], {})
+    data = noisyData(lambda x: np.exp(-0.7*x)/(1+0.3*x**2),
+                     np.linspace(0.0, 5.0, 200))
+    result = GeneralLSFR.performFit(model, data, [1.0, 0.1])
+
+    expected, cov = optimize.curve_fit(model, data[:,0], data[:,1],
+                                       p0=[1.0, 0.1], sigma=data[:,2],
+                                       absolute_sigma=True)
+    assert result.njev > 0
+    assert np.allclose(result.params, expected, rtol=0.00001)
+
+    #Every Method Scales the Covariance by (N-P)/(N-P+2) (See makeFitResult)
+    assert np.allclose(result.cov, cov*198/200, rtol=0.001)
+
+
+@pytest.mark.parametrize("string, function", [
+    ("f1*x+f2-y", lambda x: 2.0*x+1.0),
+    ("f1*x**2+f2*x+f3-y", lambda x: 0.5*x**2-3.0*x+2.0)])
+def test_linear_solve_matches_curve_fit(string, function):
+    """
+    A Model Linear in its Fit Parameters is Solved Directly, Giving the Same
+        Parameters and Covariance as curve_fit
+    """
+    fitNames = GeneralLSFR.paramNames(string)[0]
+    model = GeneralLSFR.compileEquation(string, fitNames, {})
+    data = noisyData(function, np.linspace(-5.0, 5.0, 100), err=0.1)
+    result = GeneralLSFR.performFit(model, data, [0.0]*len(fitNames))
+
+    expected, cov = optimize.curve_fit(model, data[:,0], data[:,1],
+                                       p0=[1.0]*len(fitNames),
+                                       sigma=data[:,2], absolute_sigma=True)
+    nFree = 100-len(fitNames)
+    assert model.isLinear
+    assert result.method == "linear"
+    assert result.nfev == 1
+    assert np.allclose(result.params, expected, rtol=0.000001)
+    assert np.allclose(result.cov, cov*nFree/(nFree+2), rtol=0.0001)
+    assert np.isclose(result.chiSqrd, np.sum(((data[:,1]-model(
+        data[:,0], *expected))/data[:,2])**2))
+
+
+def test_variable_projection_matches_full_fit():
+    """
+    Variable Projection, Which Only Searches the Nonlinear Parameters,
+        Finds the Same Parameters and Covariance as Fitting Every Parameter
+    """
+    model = GeneralLSFR.compileEquation("f1*exp(-x/f2)+f3*sin(x)+f4-y",
+                                        ["f1", "f2", "f3", "f4"], {})
+    data = noisyData(lambda x: 2.0*np.exp(-x/3.0)+0.5*np.sin(x)+1.0,
+                     np.linspace(0.0, 10.0, 300))
+    guesses = [1.0, 2.0, 0.0, 0.0]
+
+    separable = GeneralLSFR.performFit(model, data, guesses)
+    full = GeneralLSFR.fusedFit(model, data, guesses)
+    assert model.isSeparable
+    assert separable.method == "separable"
+    assert full.method == "fused"
+    assert np.allclose(separable.params, full.params, rtol=0.00001)
+    assert np.allclose(separable.cov, full.cov, rtol=0.001)
+    assert np.isclose(separable.chiSqrd, full.chiSqrd, rtol=0.000001)
+    assert np.allclose(separable.params, [2.0, 3.0, 0.5, 1.0], atol=0.05)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_batch_fit_table(tmp_path, processes):
+    """
+    batchFit Fits Every File Matching the Pattern, Whether in This Process
+        or a Pool, Writes One Row per File in File Order, and Marks a File
+        Which Cannot be Fit as an Error Without Stopping the Others
+    """
+    slopes = [1.0, 2.0, 3.0]
+    for slope in slopes:
+        np.savetxt(tmp_path/("line"+str(slope)+".csv"),
+                   noisyData(lambda x: slope*x+0.5,
+                             np.linspace(0.0, 10.0, 50)), delimiter=",")
+    (tmp_path/"line9.csv").write_text("1,2,0.1\n")     #Too Few Points
+    outputFile = str(tmp_path/"results.csv")
+
+    rows = GeneralLSFR.batchFit("f1*x+f2-k1-y", {"k1":0.5}, {"f1":1.0},
+                                str(tmp_path/"line*.csv"), outputFile,
+                                processes=processes, verbose=False)
+    assert [os.path.basename(row["file"]) for row in rows] == [
+        "line1.0.csv", "line2.0.csv", "line3.0.csv", "line9.csv"]
+    assert [row["status"] for row in rows] == ["ok", "ok", "ok", "error"]
+    for row, slope in zip(rows, slopes):
+        assert abs(row["f1"]-slope) < 3*row["f1_err"]
+        assert abs(row["f2"]-1.0) < 3*row["f2_err"]
+        assert row["points"] == 50
+        assert row["method"] == "linear"
+
+    with open(outputFile, newline="") as table:
+        written = list(csv.DictReader(table))
+    assert len(written) == 4
+    assert [float(row["f1"]) for row in written[:3]] == [
+        row["f1"] for row in rows[:3]]
+    assert written[3]["status"] == "error"
+    assert written[3]["message"] != ""
+
+
+def test_multi_fit_matches_separate_fits():
+    """
+    multiFit Finds the Same Parameters and Covariances for Each Dataset as
+        Fitting the Datasets One at a Time, Even With Different Lengths
+    """
+    model = GeneralLSFR.compileEquation("f1*exp(-x/f2)-y", ["f1", "f2"], {})
+    truths = [(2.0, 3.0), (1.0, 1.5), (4.0, 6.0)]
+    datasets = [noisyData(lambda x: a*np.exp(-x/b),
+                          np.linspace(0.0, 10.0, n), seed=n)
+                for (a, b), n in zip(truths, [40, 60, 80])]
+
+    results = GeneralLSFR.multiFit(model, datasets, [1.0, 2.0])
+    assert len(results) == 3
+    for result, data, truth in zip(results, datasets, truths):
+        single = GeneralLSFR.fusedFit(model, data, [1.0, 2.0])
+        assert result.converged
+        assert result.method == "multiFit"
+        assert len(result.residuals) == len(data)
+        assert np.allclose(result.params, single.params, rtol=0.00001)
+        assert np.allclose(result.cov, single.cov, rtol=0.001)
+        assert np.isclose(result.chiSqrd, single.chiSqrd, rtol=0.000001)
+        assert np.isclose(result.redChiSqrd, single.redChiSqrd,
+                          rtol=0.000001)
+        assert np.all(np.abs(result.params-truth)
+                      < 3*np.sqrt(np.diag(result.cov)))
+
+
+@pytest.mark.parametrize("extension, delim", [(".csv", ","), (".txt", "\t")])
+def test_load_text_and_binary_copy(tmp_path, monkeypatch, extension, delim):
+    """
+    A Text File is Parsed the Same as np.genfromtxt, Skipping '%' Comments
+        and Blank Lines, Across Several Blocks, and Loading it Again Reads
+        the Same Values Back From its Binary Copy Without Parsing
+    """
+    data = noisyData(lambda x: 2.0*x+1.0, np.linspace(0.0, 10.0, 200))
+    lines = ["% x, y, y_err"]+[delim.join(repr(float(value)) for value in row)
+                               +("  % Point "+str(i) if i%7 == 0 else "")
+                               for i, row in enumerate(data)]
+    lines.insert(50, "")
+    fileName = tmp_path/("data"+extension)
+    fileName.write_text("\n".join(lines)+"\n")
+    monkeypatch.setattr(GeneralLSFR, "textBlockSize", 1000)
+
+    expected = np.genfromtxt(str(fileName), comments="%", delimiter=delim)
+    parsed = loadData(str(fileName))
+    assert np.array_equal(expected, data)
+    assert np.array_equal(parsed, data)
+    assert np.array_equal(GeneralLSFR.parseText(str(fileName), delim), data)
+    assert os.path.exists(GeneralLSFR.dataCacheName(str(fileName), delim))
+
+    def noParsing(*args):
+        raise AssertionError("Parsed Again Instead of Using the Binary Copy")
+    monkeypatch.setattr(GeneralLSFR, "parseBytes", noParsing)
+    monkeypatch.setattr(GeneralLSFR, "parseText", noParsing)
+    cached = loadData(str(fileName))
+    assert isinstance(cached, np.memmap)
+    assert np.array_equal(cached, data)
+    assert np.array_equal(loadData(str(fileName), columns=(2,0,1)),
+                          data[:,[2,0,1]])
+
+
+def test_model_cache_reloads_from_disk(monkeypatch):
+    """
+    A Compiled Model is Saved Under its modelKey and a New Cache (as in a
+        Later Session) Rebuilds it From Disk Without Solving the Equation,
+        Giving the Same Values and Jacobian
+    """
+    string, constants = "f1*exp(-x/f2)+k1-y", {"k1":0.5}
+    key = GeneralLSFR.modelKey(string, ["f1", "f2"], constants)
+    assert key == GeneralLSFR.modelKey("f1 * exp(-x/f2) + k1 - y",
+                                       ["f1", "f2"], {"k1":0.5})
+    assert key != GeneralLSFR.modelKey(string, ["f1", "f2"], {"k1":0.6})
+    assert key != GeneralLSFR.modelKey(string, ["f2", "f1"], constants)
+
+    first = GeneralLSFR.ModelCache()
+    model = first.get(string, ["f1", "f2"], constants)
+    assert (first.misses, first.hits) == (1, 0)
+    assert os.path.exists(first.fileName(key))
+    assert first.get(string, ["f1", "f2"], constants) is model
+    assert (first.misses, first.hits, first.diskHits) == (1, 1, 0)
+
+    def noSolving(string):
+        raise AssertionError("Solved Again Instead of Using the Saved Model")
+    monkeypatch.setattr(GeneralLSFR, "getEquation", noSolving)
+    later = GeneralLSFR.ModelCache()
+    reloaded = later.get(string, ["f1", "f2"], constants)
+    assert (later.misses, later.diskHits) == (0, 1)
+
+    x = np.linspace(0.0, 10.0, 50)
+    assert np.allclose(reloaded(x, 2.0, 3.0), model(x, 2.0, 3.0))
+    assert np.allclose(reloaded(x, 2.0, 3.0), 2.0*np.exp(-x/3.0)+0.5)
+    assert np.allclose(reloaded.jacobian(x, 2.0, 3.0),
+                       model.jacobian(x, 2.0, 3.0))
+
+
+@pytest.mark.parametrize("string, fitNames, params", [
+    ("f1*exp(-x/f2)*cos(f3*x)-y", ["f1", "f2", "f3"], [2.0, 3.0, 1.5]),
+    ("f1*x+f2-y", ["f1", "f2"], [2.0, 1.0]),
+    ("f1+f2**2-y", ["f1", "f2"], [1.0, 0.5])])
+def test_fused_evaluation_matches_separate(string, fitNames, params):
+    """
+    The Fused Kernel's Weighted Residuals and Jacobian Match Evaluating the
+        Model and its Jacobian Separately, Including Derivatives Which are
+        Constant or Expressions Without x
+    """
+    model = GeneralLSFR.compileEquation(string, fitNames, {})
+    data = noisyData(lambda x: np.sin(x), np.linspace(0.0, 10.0, 40))
+    x, y, weights = data[:,0], data[:,1], 1.0/data[:,2]
+
+    residuals, jac = model.residualsAndJacobian(x, y, weights, params)
+    assert model.fusedFunction is not None
+    assert jac.shape == (40, len(fitNames))
+    assert np.allclose(residuals, (y-model(x, *params))*weights,
+                       rtol=0.000000000001)
+    assert np.allclose(jac, model.jacobian(x, *params)*weights[:,None],
+                       rtol=0.000000000001)
+
+
+def test_fused_fit_matches_separate_evaluation():
+    """
+    fusedFit Finds the Same Parameters and Covariance as Fitting With the
+        Model and its Jacobian Evaluated Separately
+    """
+    model = GeneralLSFR.compileEquation("f1*exp(-x/f2)*cos(f3*x)-y",
+                                        ["f1", "f2", "f3"], {})
+    data = noisyData(lambda x: 2.0*np.exp(-x/3.0)*np.cos(1.5*x),
+                     np.linspace(0.0, 10.0, 200))
+    guesses = [1.5, 2.5, 1.4]
+    result = GeneralLSFR.fusedFit(model, data, guesses)
+
+    expected, cov = optimize.curve_fit(
+        model, data[:,0], data[:,1], p0=guesses, sigma=data[:,2],
+        absolute_sigma=True, jac=lambda x, *p: model.jacobian(x, *p))
+    assert result.method == "fused"
+    assert np.allclose(result.params, expected, rtol=0.00001)
+    assert np.allclose(result.cov, cov*197/199, rtol=0.001)
+    assert np.allclose(result.values, model(data[:,0], *result.params))
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_multi_start_fit_finds_global_minimum(processes):
+    """
+    multiStartFit Finds the Global Minimum of a Sine's Frequency From a Guess
+        Where a Single Local Fit Stops in a Local Minimum, Whether the
+        Candidates are Scored in This Process or a Pool
+    """
+    model = GeneralLSFR.compileEquation("f1*sin(f2*x)-y", ["f1", "f2"], {})
+    data = noisyData(lambda x: 1.0*np.sin(3.7*x),
+                     np.linspace(0.0, 10.0, 300), err=0.1)
+    guesses = [1.0, 1.0]
+
+    local = GeneralLSFR.performFit(model, data, guesses)
+    best = GeneralLSFR.performFit(model, data, [1.0, 3.7])
+    result = GeneralLSFR.multiStartFit(model, data, [(0.5, 2.0), (0.1, 10.0)],
+                                       guesses, processes=processes)
+    assert local.chiSqrd > 2*best.chiSqrd
+    assert result.method == "multiStart"
+    assert np.allclose(result.params, best.params, rtol=0.00001)
+    assert np.isclose(result.chiSqrd, best.chiSqrd, rtol=0.000001)
+    assert np.allclose(result.cov, best.cov, rtol=0.001)
+    assert np.all(np.abs(result.params-[1.0, 3.7])
+                  < 3*np.sqrt(np.diag(result.cov)))
+
+
+def test_sparse_fit_matches_dense_fit():
+    """
+    A Model of Many Narrow Peaks, Each Parameter Affecting Only the Points
+        Near its Peak, is Fit With a Sparse Jacobian, Finding the Same
+        Parameters and Covariance as a Fit With the Full Jacobian
+    """
+    nPeaks = 20
+    string = "+".join("f"+str(3*i+1)+"*exp(-(x-f"+str(3*i+2)+")**2/f"
+                      +str(3*i+3)+"**2)" for i in range(nPeaks))+"-y"
+    fitNames = GeneralLSFR.paramNames(string)[0]
+    model = GeneralLSFR.compileEquation(string, fitNames, {})
+    truth = np.ravel([(1.0+0.1*i, 5.0*i+2.5, 0.6) for i in range(nPeaks)])
+    data = noisyData(lambda x: model(x, *truth),
+                     np.linspace(0.0, 100.0, 2000))
+    guesses = np.ravel([(1.1+0.1*i, 5.0*i+2.5+0.1*(-1)**i, 0.7)
+                        for i in range(nPeaks)])
+
+    sparse = GeneralLSFR.performFit(model, data, guesses)
+    dense = GeneralLSFR.fusedFit(model, data, guesses)
+    assert len(fitNames) >= GeneralLSFR.sparseParameters
+    assert sparse.method == "sparse"
+    assert np.allclose(sparse.params, dense.params, rtol=0.000001)
+    assert np.isclose(sparse.chiSqrd, dense.chiSqrd, rtol=0.000001)
+    assert np.allclose(np.diag(sparse.cov), np.diag(dense.cov), rtol=0.0001)
+    assert np.allclose(sparse.cov, dense.cov,
+                       atol=0.000001*np.max(np.abs(dense.cov)))
+    assert np.all(np.abs(np.abs(sparse.params)-truth)
+                  < 4*np.sqrt(np.diag(sparse.cov)))
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_dataset_masks_unusable_rows(streamed):
+    """
+    Rows With a NaN or Infinite Value or Zero y_err are Masked Out and
+        Counted, Whether the Rows are Read Into Columns or Streamed, and a
+        Fit Ignores Them
+    """
+    clean = noisyData(lambda x: 2.0*x+1.0, np.linspace(0.0, 10.0, 50))
+    data = clean.copy()
+    data[3,0] = np.nan
+    data[10,1] = np.inf
+    data[20,2] = 0.0
+    data[30,2] = -data[30,2]     #Only the Size of y_err Matters
+    kept = np.ones(50, dtype=bool)
+    kept[[3, 10, 20]] = False
+
+    dataset = GeneralLSFR.Dataset(data, streamed=streamed)
+    assert len(dataset) == 47
+    assert dataset.nMasked == 3
+    columns = dataset.inMemory()
+    assert np.array_equal(columns.x, clean[kept,0])
+    assert np.array_equal(columns.err, clean[kept,2])
+    assert np.array_equal(columns.weights, 1.0/clean[kept,2])
+
+    model = GeneralLSFR.compileEquation("f1*x+f2-y", ["f1", "f2"], {})
+    masked = GeneralLSFR.performFit(model, dataset, [1.0, 0.0])
+    expected = GeneralLSFR.performFit(model, clean[kept], [1.0, 0.0])
+    assert np.allclose(masked.params, expected.params, rtol=0.000000001)
+    assert np.allclose(masked.cov, expected.cov, rtol=0.000000001)
+
+
+def test_dataset_memo_follows_contents():
+    """
+    Memoised Results are Shared by Datasets With Equal Contents and
+        Computed Again Once the Data Changes
+    """
+    data = noisyData(lambda x: 2.0*x+1.0, np.linspace(0.0, 10.0, 50))
+    calls = []
+
+    def compute(dataset):
+        calls.append(1)
+        return float(np.sum(dataset.y))
+
+    first = GeneralLSFR.Dataset(data)
+    again = GeneralLSFR.Dataset(data.copy())
+    assert first.key() == again.key()
+    assert first.memoize("model", "sum", lambda: compute(first)) == \
+        again.memoize("model", "sum", lambda: compute(again))
+    assert len(calls) == 1
+    again.memoize("other model", "sum", lambda: compute(again))
+    assert len(calls) == 2
+
+    data[5,1] += 1.0
+    changed = GeneralLSFR.Dataset(data)
+    assert changed.key() != first.key()
+    assert changed.memoize("model", "sum", lambda: compute(changed)) == \
+        pytest.approx(first.memoize("model", "sum", lambda: compute(first))
+                      +1.0)
+    assert len(calls) == 3
+    assert GeneralLSFR.Dataset(data, dtype=np.float32).key() != changed.key()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_compare_models_ranks_true_equation_first(processes):
+    """
+    compareModels Ranks the Equation the Data Came From First by Every
+        Criterion, Whether Fit in This Process or a Pool, and Lists
+        Candidates Which Cannot be Fit Last
+    """
+    data = noisyData(lambda x: 2.0*np.exp(-x/3.0), np.linspace(0.0, 10.0, 100))
+    strings = ["f1*x+f2-y", "f1*x**2+f2*x+f3-y", "f1*exp(-x/f2)-y",
+               "f1*exp(-x/f2)+f3-y", "f1*x+k9-y"]
+
+    rows = GeneralLSFR.compareModels(strings, data,
+                                     guesses={"f1":1.0, "f2":(0.5, 10.0)},
+                                     processes=processes)
+    assert [row["equation"] for row in rows][0] == "f1*exp(-x/f2)-y"
+    assert [row["status"] for row in rows] == ["ok"]*4+["error"]
+    assert rows[-1]["equation"] == "f1*x+k9-y"
+    assert "k9" in rows[-1]["message"]
+    best = rows[0]
+    assert (best["aicRank"], best["bicRank"], best["parameters"]) == (1, 1, 2)
+    assert np.all(np.abs(best["result"].params-[2.0, 3.0])
+                  < 3*best["result"].uncertainties())
+    assert best["aic"] == pytest.approx(best["chiSqrd"]+4)
+    assert best["bic"] == pytest.approx(best["chiSqrd"]+2*np.log(100))
+    assert [row["aicRank"] for row in rows[:4]] == [1, 2, 3, 4]
+
+
+@pytest.mark.filterwarnings("ignore:divide by zero:RuntimeWarning")
+def test_finite_difference_fit_result_matches_curve_fit():
+    """
+    A Model Whose Analytic Jacobian is Not Finite at the Guesses is Fit by
+        curve_fit, and its FitResult Gives curve_fit's Parameters and
+        Scaled Covariance, the Weighted Jacobian's Rank and Condition
+        Number, and the Residuals and Model Values at the Best Fit
+    """
+    model = GeneralLSFR.compileEquation("f1*sqrt(x+f2)-y", ["f1", "f2"], {})
+    data = noisyData(lambda x: 2.0*np.sqrt(x+0.5), np.linspace(0.0, 10.0, 100))
+    x, y, y_err = data.T
+    result = GeneralLSFR.performFit(model, data, [1.0, 0.0])
+
+    expected, cov = optimize.curve_fit(model, x, y, p0=[1.0, 0.0],
+                                       sigma=y_err, absolute_sigma=True)
+    assert result.method == "curve_fit"
+    assert np.allclose(result.params, expected, rtol=0.000001)
+    assert np.allclose(result.cov, cov*98/100, rtol=0.0001)
+    assert np.allclose(result.uncertainties(), np.sqrt(np.diag(cov*98/100)),
+                       rtol=0.0001)
+
+    residuals = (y-model(x, *result.params))/y_err
+    jac = model.jacobian(x, *result.params)/y_err[:,None]
+    assert result.rank == 2
+    assert np.isclose(result.condition, np.linalg.cond(jac), rtol=0.00001)
+    assert np.allclose(result.residuals, residuals, atol=0.00001)
+    assert np.allclose(result.values, model(x, *result.params),
+                       rtol=0.0000001)
+    assert np.isclose(result.chiSqrd, residuals @ residuals, rtol=0.000001)
+    assert np.isclose(result.redChiSqrd, result.chiSqrd/98)
+
+
+def test_rank_deficient_fit_reports_rank():
+    """
+    A Model Where Only the Product of Two Parameters Affects the Data Has a
+        Jacobian of Rank 2 for 3 Parameters, Which the FitResult Reports
+        Along With a Finite Covariance
+    """
+    model = GeneralLSFR.compileEquation("f1*f2*x+f3-y", ["f1", "f2", "f3"],
+                                        {})
+    data = noisyData(lambda x: 2.0*x+1.0, np.linspace(0.0, 10.0, 100))
+    result = GeneralLSFR.performFit(model, data, [1.0, 1.0, 0.0])
+
+    assert result.rank == 2
+    assert result.condition > 1e12
+    assert np.all(np.isfinite(result.cov))
+    assert np.isclose(result.params[0]*result.params[1], 2.0, rtol=0.001)
+
+
+def test_session_round_trip_reuses_fit_until_inputs_change(tmp_path):
+    """
+    A Saved Session's Fit is Restored With its Parameters, Covariance and
+        Model Values, and its Inputs' Hash Matches Again After Reloading the
+        Data (Even Once the Data File is Deleted), but Not Once the Data,
+        Equation, Guesses, Bounds or Tolerance Change
+    """
+    fileName = str(tmp_path/"data.csv")
+    np.savetxt(fileName, noisyData(lambda x: 2.0*np.exp(-x/3.0),
+                                   np.linspace(0.0, 10.0, 50)), delimiter=",")
+    data = GeneralLSFR.Dataset(loadData(fileName))
+    string, constants = "f1*exp(-x/f2)-y", {}
+    key = GeneralLSFR.modelKey(string, ["f1", "f2"], constants)
+    model = GeneralLSFR.compileEquation(string, ["f1", "f2"], constants)
+    result = GeneralLSFR.performFit(model, data, [1.0, 2.0])
+
+    inputs = GeneralLSFR.sessionHash(key, data, [1.0, 2.0], None, 1e-8)
+    sessionName = str(tmp_path/"session.json")
+    GeneralLSFR.saveSession(sessionName, {
+        "equation":string,
+        "data":GeneralLSFR.dataReference(fileName, ",", data),
+        "fit":{"modelKey":key, "inputs":inputs}}, result)
+
+    session, restored = GeneralLSFR.loadSession(sessionName)
+    assert np.array_equal(restored.params, result.params)
+    assert np.array_equal(restored.cov, result.cov)
+    assert np.array_equal(restored.values, result.values)
+    for field in GeneralLSFR.sessionFields:
+        assert getattr(restored, field) == getattr(result, field)
+
+    reloaded = GeneralLSFR.sessionDataset(session["data"])
+    assert GeneralLSFR.sessionHash(session["fit"]["modelKey"], reloaded,
+                                   [1.0, 2.0], None, 1e-8) == inputs
+    for changed in [
+            (GeneralLSFR.modelKey(string, ["f1", "f2"], {"k1":1.0}), data,
+             [1.0, 2.0], None, 1e-8),
+            (key, data, [1.0, 2.5], None, 1e-8),
+            (key, data, [1.0, 2.0], [(0.5, 5.0), (2.0, 2.0)], 1e-8),
+            (key, data, [1.0, 2.0], None, 1e-10)]:
+        assert GeneralLSFR.sessionHash(*changed) != inputs
+
+    os.remove(fileName)
+    fromCache = GeneralLSFR.sessionDataset(session["data"])
+    assert np.array_equal(fromCache.y, data.y)
+    assert GeneralLSFR.sessionHash(key, fromCache, [1.0, 2.0], None,
+                                   1e-8) == inputs
+
+    np.savetxt(fileName, np.column_stack((data.x, data.y+0.01, data.err)),
+               delimiter=",")
+    os.utime(fileName, (1000000000, 1000000000))   #Not in the Same Tick
+    changedData = GeneralLSFR.sessionDataset(session["data"])
+    assert GeneralLSFR.sessionHash(key, changedData, [1.0, 2.0], None,
+                                   1e-8) != inputs
+
+    #Model Values Saved With a Different Fit are Not Used
+    GeneralLSFR.saveSession(sessionName, session, restored)
+    result.params = result.params+1.0
+    GeneralLSFR.saveSession(str(tmp_path/"other.json"), session, result)
+    os.replace(str(tmp_path/"other.npz"), str(tmp_path/"session.npz"))
+    assert GeneralLSFR.loadSession(sessionName)[1].values is None